@@ -4,6 +4,8 @@ import json
 import asyncio
 import os
 from dotenv import load_dotenv
+from metrics import http_hook, record_json_write
+from catalog_diff import diff_catalogs, catalog_events
 import time
 from datetime import datetime
 
@@ -16,6 +18,7 @@ class GitHubSync:
         self.branch = os.getenv('GITHUB_BRANCH', 'main')
         self.file_path = 'API_JBChangeLogs.json'
         self.local_file = 'API_JBChangeLogs.json'
+        self.api_url = os.getenv('GITHUB_API_URL', 'https://api.github.com')
         self.headers = {
             'Authorization': f'token {self.token}',
             'Accept': 'application/vnd.github.v3+json'
@@ -24,14 +27,14 @@ class GitHubSync:
         
     def get_file_from_repo(self):
         """Récupère le fichier depuis le repo GitHub"""
-        url = f'https://api.github.com/repos/{self.repo}/contents/{self.file_path}'
+        url = f'{self.api_url}/repos/{self.repo}/contents/{self.file_path}'
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = requests.get(url, headers=self.headers, hooks=http_hook('github_contents'))
             response.raise_for_status()
             
             file_data = response.json()
-            content = requests.get(file_data['download_url']).text
+            content = requests.get(file_data['download_url'], hooks=http_hook('github_raw')).text
             
             return content, file_data['sha']
         except Exception as e:
@@ -52,12 +55,25 @@ class GitHubSync:
         try:
             with open(self.local_file, 'w', encoding='utf-8') as f:
                 f.write(content)
+            record_json_write(self.local_file, content)
             print(f"Fichier {self.local_file} mis à jour avec succès")
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde: {e}")
             return False
     
+    def publish_diff(self, old_data, content):
+        """Publie les items ajoutés / supprimés / modifiés par la nouvelle version du fichier"""
+        try:
+            new_data = json.loads(content)
+        except json.JSONDecodeError as e:
+            # Les consommateurs rechargeront tout en voyant le fichier changer
+            print(f"Nouvelle version illisible, pas de diff: {e}")
+            return None
+        diff = diff_catalogs(old_data, new_data)
+        catalog_events.publish(diff)
+        return diff
+
     def load_local_data(self):
         """Charge les données du fichier local"""
         try:
@@ -70,24 +86,25 @@ class GitHubSync:
         """Synchronisation initiale"""
         if self.check_local_file_empty():
             print("Fichier local vide, récupération depuis GitHub...")
-            content, sha = self.get_file_from_repo()
+            content, sha = await asyncio.to_thread(self.get_file_from_repo)
             if content:
-                self.save_to_local(content)
+                if self.save_to_local(content):
+                    self.publish_diff({}, content)
                 self.last_sha = sha
                 print("Synchronisation initiale terminée")
             else:
                 print("Échec de la synchronisation initiale")
         else:
             # Récupérer le SHA actuel pour les vérifications futures
-            _, sha = self.get_file_from_repo()
+            _, sha = await asyncio.to_thread(self.get_file_from_repo)
             self.last_sha = sha
     
     async def check_for_updates(self):
         """Vérifie les mises à jour du repo"""
-        url = f'https://api.github.com/repos/{self.repo}/contents/{self.file_path}'
+        url = f'{self.api_url}/repos/{self.repo}/contents/{self.file_path}'
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = await asyncio.to_thread(requests.get, url, headers=self.headers, hooks=http_hook('github_contents'))
             response.raise_for_status()
             
             file_data = response.json()
@@ -95,9 +112,12 @@ class GitHubSync:
             
             if current_sha != self.last_sha:
                 print("Changement détecté dans le repo, mise à jour...")
-                content = requests.get(file_data['download_url']).text
+                response = await asyncio.to_thread(requests.get, file_data['download_url'], hooks=http_hook('github_raw'))
+                content = response.text
+                old_data = self.load_local_data()
                 if self.save_to_local(content):
                     self.last_sha = current_sha
+                    self.publish_diff(old_data, content)
                     return True
             return False
         except Exception as e:
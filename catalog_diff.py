@@ -0,0 +1,81 @@
+from metrics import metrics
+
+diff_items = metrics.counter('catalog_diff_items_total', "Catalog items added, removed or changed by an update", ('kind',))
+diff_handler_errors = metrics.counter('catalog_diff_handler_errors_total', "Catalog diff handlers that raised", ('handler',))
+
+
+class CatalogDiff:
+    """Items added, removed and changed between two versions of API_JBChangeLogs.json"""
+
+    def __init__(self):
+        self.added = {}  # API name -> new data
+        self.removed = {}  # API name -> old data
+        self.changed = {}  # API name -> (old data, new data)
+
+    @property
+    def affected(self):
+        """Every API name touched by the update"""
+        return set(self.added) | set(self.removed) | set(self.changed)
+
+    @property
+    def structural(self):
+        """Whether items appeared or disappeared (names to index changed)"""
+        return bool(self.added or self.removed)
+
+    def changed_fields(self, api_name):
+        old, new = self.changed.get(api_name, ({}, {}))
+        return sorted(key for key in set(old) | set(new) if old.get(key) != new.get(key))
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"<CatalogDiff +{len(self.added)} -{len(self.removed)} ~{len(self.changed)}>"
+
+
+def diff_catalogs(old_data, new_data):
+    """Key-level diff in one pass over the new catalog, whatever is left of the old one was removed"""
+    diff = CatalogDiff()
+    remaining = set(old_data)
+    for api_name, new_item in new_data.items():
+        old_item = old_data.get(api_name)
+        if old_item is None:
+            diff.added[api_name] = new_item
+            continue
+        remaining.discard(api_name)
+        if old_item != new_item:
+            diff.changed[api_name] = (old_item, new_item)
+    for api_name in remaining:
+        diff.removed[api_name] = old_data[api_name]
+    return diff
+
+
+class CatalogEvents:
+    def __init__(self):
+        self.handlers = {}  # name -> callable(diff)
+
+    def subscribe(self, name, handler):
+        """Call handler(diff) after each catalog update, replacing any handler with the same name"""
+        self.handlers[name] = handler
+
+    def unsubscribe(self, name):
+        self.handlers.pop(name, None)
+
+    def publish(self, diff):
+        """Hand a diff to every subscriber, a failing subscriber doesn't stop the others"""
+        if not diff:
+            return
+        diff_items.inc(len(diff.added), kind='added')
+        diff_items.inc(len(diff.removed), kind='removed')
+        diff_items.inc(len(diff.changed), kind='changed')
+        print(f"Catalog update: {len(diff.added)} added, {len(diff.removed)} removed, {len(diff.changed)} changed")
+        for name, handler in list(self.handlers.items()):
+            try:
+                handler(diff)
+            except Exception as e:
+                diff_handler_errors.inc(handler=name)
+                print(f"Error in catalog diff handler {name}: {e}")
+
+
+# Instance globale
+catalog_events = CatalogEvents()
@@ -0,0 +1,443 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from aiohttp import web
+
+# Stand-in for the Roblox and GitHub APIs used by the bot.
+#
+# Roblox hosts are served under their subdomain name, so https://users.roblox.com/v1/...
+# becomes <base>/users/v1/... (set ROBLOX_API_BASE=<base>), and GitHub is served at the
+# root (set GITHUB_API_URL=<base>).
+
+ROBLOX_FAMILIES = {'users', 'groups', 'games', 'thumbnails', 'economy', 'catalog', 'friends'}
+
+
+class FakeApiState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1000)
+        self.users = {}  # user_id -> {'id', 'name', 'displayName'}
+        self.user_ids_by_name = {}  # lowercase username -> user_id
+        self.experiences = defaultdict(list)  # user_id -> [experience]
+        self.game_passes = defaultdict(list)  # universe_id -> [game pass]
+        self.group_members = defaultdict(list)  # group_id -> [(user_id, join_time)], oldest first
+        self.files = {}  # (repo, path) -> (content bytes, sha)
+        self.events = []  # (monotonic time, kind, key) of every scripted state transition
+
+    def _record(self, kind, key):
+        self.events.append((time.monotonic(), kind, key))
+
+    def add_user(self, name, with_experience=True):
+        """Create a Roblox user, returns (user_id, universe_id)"""
+        with self.lock:
+            user_id = next(self.ids)
+            self.users[user_id] = {'id': user_id, 'name': name, 'displayName': name}
+            self.user_ids_by_name[name.lower()] = user_id
+            universe_id = None
+            if with_experience:
+                universe_id = next(self.ids)
+                self.experiences[user_id].append({
+                    'id': universe_id,
+                    'name': f"{name}'s Place",
+                    'rootPlace': {'id': next(self.ids), 'type': 'Place'}
+                })
+            return user_id, universe_id
+
+    def create_game_pass(self, universe_id, name="Pass", price=None):
+        """Scripted transition: the seller created a game pass"""
+        with self.lock:
+            gamepass_id = next(self.ids)
+            self.game_passes[universe_id].append({
+                'id': gamepass_id,
+                'name': name,
+                'displayName': name,
+                'productId': None,
+                'price': price
+            })
+            self._record('game_pass_created', gamepass_id)
+            return gamepass_id
+
+    def set_game_pass_price(self, gamepass_id, price):
+        """Scripted transition: the seller set the price of a game pass"""
+        with self.lock:
+            for passes in self.game_passes.values():
+                for game_pass in passes:
+                    if game_pass['id'] == gamepass_id:
+                        game_pass['price'] = price
+                        self._record('price_set', gamepass_id)
+                        return True
+            return False
+
+    def join_group(self, user_id, group_id):
+        """Scripted transition: the user joined a group"""
+        with self.lock:
+            if all(member != user_id for member, _ in self.group_members[group_id]):
+                self.group_members[group_id].append((user_id, time.time()))
+                self._record('user_joined_group', user_id)
+
+    def set_file(self, repo, path, content):
+        """Create or replace a file of a fake GitHub repository"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        with self.lock:
+            sha = hashlib.sha1(content).hexdigest()
+            self.files[(repo, path)] = (content, sha)
+            self._record('file_changed', f"{repo}/{path}")
+            return sha
+
+
+class FakeApiServer:
+    def __init__(self, state=None, latency=0.0, jitter=0.0, error_429_rate=0.0,
+                 rate_limit_per_second=None, retry_after=1, seed=None):
+        self.state = state or FakeApiState()
+        self.latency = latency  # Base latency added to every response (seconds)
+        self.jitter = jitter  # Random extra latency, uniform in [0, jitter]
+        self.family_latency = {}  # family -> latency override
+        self.error_429_rate = error_429_rate  # Probability of answering 429 to any request
+        self.rate_limit_per_second = rate_limit_per_second  # Per-family limit, above which 429 is returned
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.request_times = defaultdict(deque)  # family -> recent request times (for the rate limit)
+        self.counters = defaultdict(int)  # (family, status) -> count
+        self.started_at = None
+        self.base_url = None
+        self.loop = None
+        self.thread = None
+        self.runner = None
+        self.app = self._create_app()
+
+    def _create_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        routes = [
+            # Roblox users
+            web.post('/users/v1/usernames/users', self.usernames),
+            web.get('/users/v1/users/authenticated', self.authenticated_user),
+            web.get('/users/v1/users/{user_id}', self.user_details),
+            # Roblox groups
+            web.get('/groups/v2/users/{user_id}/groups/roles', self.user_group_roles),
+            web.get('/groups/v1/groups/{group_id}/users', self.group_users),
+            # Roblox games
+            web.get('/games/v2/users/{user_id}/games', self.user_games),
+            web.get('/games/v1/games/{universe_id}/game-passes', self.game_passes),
+            # Roblox thumbnails
+            web.get('/thumbnails/v1/users/avatar-headshot', self.avatar_headshots),
+            # Roblox economy / catalog / friends
+            web.get('/economy/v1/users/{user_id}/currency', self.currency),
+            web.get('/economy/v2/assets/{asset_id}/details', self.asset_details),
+            web.post('/catalog/v1/catalog/items/details', self.catalog_details),
+            web.get('/friends/v1/users/{user_id}/friends/count', self.friends_count),
+            # GitHub
+            web.get('/repos/{owner}/{repo}/contents/{path:.+}', self.github_get_contents),
+            web.put('/repos/{owner}/{repo}/contents/{path:.+}', self.github_put_contents),
+            web.get('/raw/{owner}/{repo}/{path:.+}', self.github_raw),
+            # Control endpoints to script the server from another process
+            web.get('/_control/stats', self.control_stats),
+            web.post('/_control/users', self.control_add_user),
+            web.post('/_control/game-passes', self.control_create_game_pass),
+            web.post('/_control/game-passes/{gamepass_id}/price', self.control_set_price),
+            web.post('/_control/groups/{group_id}/members', self.control_join_group),
+        ]
+        app.add_routes(routes)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Start the server on the running event loop, returns its base URL"""
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        self.started_at = time.monotonic()
+        return self.base_url
+
+    async def stop(self):
+        """Stop the server"""
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def start_in_thread(self, host='127.0.0.1', port=0):
+        """Run the server on its own event loop thread, so blocking clients can't stall it"""
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.start(host, port))
+            ready.set()
+            self.loop.run_forever()
+            self.loop.run_until_complete(self.stop())
+            self.loop.close()
+
+        self.thread = threading.Thread(target=run, name="fake-api-server", daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self.base_url
+
+    def stop_thread(self):
+        """Stop a server started with start_in_thread"""
+        if self.loop and self.thread:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def schedule(self, delay, action, *args):
+        """Run a scripted state transition after a delay (thread safe)"""
+        timer = threading.Timer(delay, action, args)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _family(self, request):
+        first = request.path.strip('/').split('/', 1)[0]
+        if first in ROBLOX_FAMILIES:
+            return first
+        if first in ('repos', 'raw'):
+            return 'github'
+        return 'control'
+
+    def _is_rate_limited(self, family):
+        if not self.rate_limit_per_second:
+            return False
+        now = time.monotonic()
+        window = self.request_times[family]
+        while window and window[0] <= now - 1:
+            window.popleft()
+        if len(window) >= self.rate_limit_per_second:
+            return True
+        window.append(now)
+        return False
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        family = self._family(request)
+        if family == 'control':
+            return await handler(request)
+
+        delay = self.family_latency.get(family, self.latency)
+        if self.jitter:
+            delay += self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._is_rate_limited(family) or self.random.random() < self.error_429_rate:
+            response = web.json_response(
+                {'errors': [{'code': 0, 'message': 'Too many requests'}]},
+                status=429,
+                headers={'Retry-After': str(self.retry_after)}
+            )
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as e:
+                response = e
+
+        self.counters[(family, response.status)] += 1
+        return response
+
+    def get_stats(self):
+        """Request counters grouped by family and status"""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        families = defaultdict(lambda: {'total': 0, 'by_status': {}})
+        for (family, status), count in list(self.counters.items()):
+            families[family]['total'] += count
+            families[family]['by_status'][status] = count
+        return {'elapsed': elapsed, 'families': dict(families)}
+
+    async def usernames(self, request):
+        body = await request.json()
+        data = []
+        with self.state.lock:
+            for requested in body.get('usernames', []):
+                user_id = self.state.user_ids_by_name.get(str(requested).lower())
+                if user_id is not None:
+                    user = self.state.users[user_id]
+                    data.append({'requestedUsername': requested, 'hasVerifiedBadge': False, **user})
+        return web.json_response({'data': data})
+
+    async def authenticated_user(self, request):
+        return web.json_response({'id': 1, 'name': 'FakeBotAccount', 'displayName': 'FakeBotAccount'})
+
+    async def user_details(self, request):
+        user = self.state.users.get(int(request.match_info['user_id']))
+        if not user:
+            return web.json_response({'errors': [{'code': 3, 'message': 'The user id is invalid.'}]}, status=404)
+        return web.json_response({**user, 'description': '', 'isBanned': False, 'hasVerifiedBadge': False})
+
+    async def user_group_roles(self, request):
+        user_id = int(request.match_info['user_id'])
+        data = []
+        with self.state.lock:
+            for group_id, members in self.state.group_members.items():
+                if any(member == user_id for member, _ in members):
+                    data.append({
+                        'group': {'id': group_id, 'name': f"Group {group_id}", 'memberCount': len(members)},
+                        'role': {'id': 1, 'name': 'Member', 'rank': 1}
+                    })
+        return web.json_response({'data': data})
+
+    async def group_users(self, request):
+        group_id = int(request.match_info['group_id'])
+        limit = int(request.query.get('limit', 10))
+        offset = int(request.query.get('cursor') or 0)
+        with self.state.lock:
+            members = list(self.state.group_members.get(group_id, []))
+        if request.query.get('sortOrder') == 'Desc':
+            members.reverse()
+        page = members[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(members) else None
+        data = [{
+            'user': {'userId': user_id, 'username': self.state.users.get(user_id, {}).get('name', str(user_id))},
+            'role': {'id': 1, 'name': 'Member', 'rank': 1}
+        } for user_id, _ in page]
+        return web.json_response({'data': data, 'previousPageCursor': None, 'nextPageCursor': next_cursor})
+
+    async def user_games(self, request):
+        user_id = int(request.match_info['user_id'])
+        limit = int(request.query.get('limit', 50))
+        offset = int(request.query.get('cursor') or 0)
+        with self.state.lock:
+            experiences = list(self.state.experiences.get(user_id, []))
+        page = experiences[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(experiences) else None
+        return web.json_response({'data': page, 'previousPageCursor': None, 'nextPageCursor': next_cursor})
+
+    async def game_passes(self, request):
+        universe_id = int(request.match_info['universe_id'])
+        limit = int(request.query.get('limit', 100))
+        with self.state.lock:
+            passes = [dict(game_pass) for game_pass in self.state.game_passes.get(universe_id, [])]
+        if request.query.get('sortOrder') == 'Desc':
+            passes.reverse()
+        return web.json_response({'data': passes[:limit], 'previousPageCursor': None, 'nextPageCursor': None})
+
+    async def avatar_headshots(self, request):
+        user_ids = [int(value) for value in request.query.get('userIds', '').split(',') if value.strip()]
+        data = [{
+            'targetId': user_id,
+            'state': 'Completed',
+            'imageUrl': f"https://tr.rbxcdn.com/fake-headshot/{user_id}/420/420/AvatarHeadshot/Png"
+        } for user_id in user_ids if user_id in self.state.users]
+        return web.json_response({'data': data})
+
+    async def currency(self, request):
+        return web.json_response({'robux': 0})
+
+    async def asset_details(self, request):
+        return web.json_response({'errors': [{'code': 0, 'message': 'NotFound'}]}, status=404)
+
+    async def catalog_details(self, request):
+        return web.json_response({'data': []})
+
+    async def friends_count(self, request):
+        return web.json_response({'count': 0})
+
+    def _contents_payload(self, request, repo, path, content, sha):
+        return {
+            'name': path.rsplit('/', 1)[-1],
+            'path': path,
+            'sha': sha,
+            'size': len(content),
+            'type': 'file',
+            'encoding': 'base64',
+            'content': base64.b64encode(content).decode('utf-8'),
+            'download_url': f"{self.base_url}/raw/{repo}/{path}"
+        }
+
+    async def github_get_contents(self, request):
+        repo = f"{request.match_info['owner']}/{request.match_info['repo']}"
+        path = request.match_info['path']
+        entry = self.state.files.get((repo, path))
+        if entry is None:
+            return web.json_response({'message': 'Not Found'}, status=404)
+        content, sha = entry
+        return web.json_response(self._contents_payload(request, repo, path, content, sha))
+
+    async def github_put_contents(self, request):
+        repo = f"{request.match_info['owner']}/{request.match_info['repo']}"
+        path = request.match_info['path']
+        body = await request.json()
+        existing = self.state.files.get((repo, path))
+        if existing is not None and body.get('sha') != existing[1]:
+            return web.json_response({'message': 'sha does not match'}, status=409)
+        content = base64.b64decode(body.get('content', ''))
+        sha = self.state.set_file(repo, path, content)
+        return web.json_response({
+            'content': self._contents_payload(request, repo, path, content, sha),
+            'commit': {'sha': hashlib.sha1(f"{repo}/{path}/{sha}".encode()).hexdigest(), 'message': body.get('message')}
+        }, status=200 if existing else 201)
+
+    async def github_raw(self, request):
+        repo = f"{request.match_info['owner']}/{request.match_info['repo']}"
+        entry = self.state.files.get((repo, request.match_info['path']))
+        if entry is None:
+            return web.Response(status=404, text='404: Not Found')
+        return web.Response(body=entry[0], content_type='text/plain')
+
+    async def control_stats(self, request):
+        stats = self.get_stats()
+        stats['families'] = {
+            family: {'total': data['total'], 'by_status': {str(k): v for k, v in data['by_status'].items()}}
+            for family, data in stats['families'].items()
+        }
+        return web.json_response(stats)
+
+    async def control_add_user(self, request):
+        body = await request.json()
+        user_id, universe_id = self.state.add_user(body['name'], body.get('with_experience', True))
+        return web.json_response({'user_id': user_id, 'universe_id': universe_id})
+
+    async def control_create_game_pass(self, request):
+        body = await request.json()
+        gamepass_id = self.state.create_game_pass(int(body['universe_id']), body.get('name', 'Pass'), body.get('price'))
+        return web.json_response({'gamepass_id': gamepass_id})
+
+    async def control_set_price(self, request):
+        body = await request.json()
+        found = self.state.set_game_pass_price(int(request.match_info['gamepass_id']), int(body['price']))
+        return web.json_response({'updated': found}, status=200 if found else 404)
+
+    async def control_join_group(self, request):
+        body = await request.json()
+        self.state.join_group(int(body['user_id']), int(request.match_info['group_id']))
+        return web.json_response({'joined': True})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Roblox and GitHub APIs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help="Base response latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Random extra latency in seconds")
+    parser.add_argument('--error-429-rate', type=float, default=0.0, help="Probability of answering 429")
+    parser.add_argument('--rate-limit', type=int, default=None, help="Requests per second per family before 429")
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    server = FakeApiServer(
+        latency=args.latency, jitter=args.jitter, error_429_rate=args.error_429_rate,
+        rate_limit_per_second=args.rate_limit, retry_after=args.retry_after
+    )
+
+    async def run():
+        base_url = await server.start(args.host, args.port)
+        print(f"Fake API server running on {base_url}")
+        print(f"  ROBLOX_API_BASE={base_url}")
+        print(f"  GITHUB_API_URL={base_url}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 
 import os
+import asyncio
 import requests
 import base64
 from dotenv import load_dotenv
+from metrics import http_hook
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -12,6 +14,7 @@ class GitHubSync:
         self.github_token = os.getenv('GITHUB_TOKEN')
         self.repository = os.getenv('GITHUB_REPO2')
         self.branch = os.getenv('GITHUB_BRANCH', 'main')
+        self.api_url = os.getenv('GITHUB_API_URL', 'https://api.github.com')
 
     def _get_repo_info(self):
         """Extraire le nom du repo et du propriétaire"""
@@ -77,10 +80,10 @@ class GitHubSync:
 
             # Vérifier si le fichier existe déjà pour récupérer le SHA
             sha = None
-            api_url = f"https://api.github.com/repos/{owner}/{repo_name}/contents/{filename}"
+            api_url = f"{self.api_url}/repos/{owner}/{repo_name}/contents/{filename}"
 
             try:
-                response = requests.get(api_url, headers=headers)
+                response = await asyncio.to_thread(requests.get, api_url, headers=headers, hooks=http_hook('github_contents'))
                 if response.status_code == 200:
                     sha = response.json()["sha"]
             except:
@@ -97,7 +100,7 @@ class GitHubSync:
                 data["sha"] = sha  # Nécessaire pour mettre à jour un fichier existant
 
             # Envoyer le fichier vers GitHub
-            response = requests.put(api_url, headers=headers, json=data)
+            response = await asyncio.to_thread(requests.put, api_url, headers=headers, json=data, hooks=http_hook('github_contents'))
 
             return response.status_code in [200, 201]
 
@@ -114,7 +117,7 @@ class GitHubSync:
 
             headers = self._get_headers()
             repo = "pictures"
-            base_url = f"https://api.github.com/repos/TheBlueEL/{repo}"
+            base_url = f"{self.api_url}/repos/TheBlueEL/{repo}"
 
             # Lire le fichier image
             with open(file_path, 'rb') as f:
@@ -126,7 +129,7 @@ class GitHubSync:
             sha = None
             try:
                 url = f"{base_url}/contents/{filename}"
-                response = requests.get(url, headers=headers)
+                response = await asyncio.to_thread(requests.get, url, headers=headers, hooks=http_hook('github_contents'))
                 if response.status_code == 200:
                     sha = response.json()["sha"]
             except:
@@ -144,7 +147,7 @@ class GitHubSync:
 
             # Upload vers GitHub
             url = f"{base_url}/contents/{filename}"
-            response = requests.put(url, headers=headers, json=data)
+            response = await asyncio.to_thread(requests.put, url, headers=headers, json=data, hooks=http_hook('github_contents'))
 
             return response.status_code in [200, 201]
 
@@ -0,0 +1,254 @@
+import bisect
+import os
+import re
+from metrics import metrics
+
+# Discord shows at most 25 autocomplete choices
+MAX_SUGGESTIONS = 25
+
+# Cached prefix results, dropped when the catalog changes
+SUGGESTION_CACHE_SIZE = 2048
+
+# Lower = more wanted
+DEMAND_RANK = {
+    'High': 0, 'Medium': 1, 'Decent': 2, 'Low': 3, 'Very Low': 4,
+    'Close to none': 5, 'None': 6, 'Unknown': 7
+}
+
+CATALOG_FILES = ('API_JBChangeLogs.json', 'item_request.json')
+
+# Typo correction before fuzzy scoring (set TYPO_SEARCH=0 to disable)
+TYPO_SEARCH = os.getenv('TYPO_SEARCH', '1') != '0'
+
+index_rebuilds = metrics.counter('item_index_rebuilds_total', "Item name index rebuilds after a catalog change")
+typo_corrections = metrics.counter('item_typo_corrections_total', "Searches resolved to a catalog name by typo correction")
+autocomplete_latency = metrics.histogram('item_autocomplete_seconds', "Item name autocomplete latency",
+                                         buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01))
+
+
+def normalize(text):
+    """Lowercase with single spaces, the form every index key is stored in"""
+    return " ".join(text.lower().split())
+
+
+def split_api_name(api_name):
+    """'Torpedo (Vehicle)' -> ('Torpedo', 'Vehicle')"""
+    match = re.match(r'^(.*?)\s*\(([^)]*)\)$', api_name)
+    if match:
+        return match.group(1), match.group(2)
+    return api_name, None
+
+
+def parse_value(value):
+    """'48 000 000' (any kind of space) -> 48000000, 0 if unknown"""
+    digits = re.sub(r'\D', '', str(value or ''))
+    return int(digits) if digits else 0
+
+
+def edit_distance(a, b):
+    """Levenshtein distance (insertions, deletions and substitutions)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def typo_tolerance(text):
+    """Edits allowed for a search of this length, none on very short names"""
+    if len(text) < 4:
+        return 0
+    return 1 if len(text) < 8 else 2
+
+
+def _deletes(word, max_distance):
+    """word and every variant of it with up to max_distance characters deleted"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+class TypoIndex:
+    """Symmetric-delete index: keys within an edit distance of a word without comparing against every key"""
+
+    def __init__(self, words=(), max_distance=2):
+        self.max_distance = max_distance
+        self.deletes = {}  # variant with characters deleted -> keys it comes from
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        self.size += 1
+        for variant in _deletes(word, self.max_distance):
+            self.deletes.setdefault(variant, []).append(word)
+
+    def search(self, word, max_distance):
+        """[(distance, key)] of every key within max_distance of word, closest first"""
+        max_distance = min(max_distance, self.max_distance)
+        # Two words within k edits share a variant with at most k deletions on each side
+        candidates = set()
+        for variant in _deletes(word, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+        found = []
+        for key in candidates:
+            if abs(len(key) - len(word)) <= max_distance:
+                distance = edit_distance(word, key)
+                if distance <= max_distance:
+                    found.append((distance, key))
+        return sorted(found)
+
+
+def catalog_version(paths=CATALOG_FILES):
+    """Changes whenever one of the catalog files is rewritten"""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+class ItemNameIndex:
+    """Sorted name/alias keys of the catalog for prefix suggestions and exact lookups"""
+
+    def __init__(self):
+        self.version = None
+        self.keys = []  # Sorted normalized names and aliases
+        self.key_targets = []  # Target index of each key
+        self.targets = []  # {'api_name', 'label', 'value', 'rank'}
+        self.target_of = {}  # API name -> target index
+        self.exact = {}  # normalized clean name -> API names sharing it
+        self.cache = {}  # normalized prefix -> suggestions
+        self.typos = None  # TypoIndex of the normalized names and aliases, built on first use
+        self.typo_targets = {}  # key of the TypoIndex -> API names it stands for
+
+    def ensure(self, api_data, item_request_data, version=None):
+        """Rebuild the index if the catalog changed since the last build"""
+        version = catalog_version() if version is None else version
+        if version != self.version or not self.targets:
+            self.rebuild(api_data, item_request_data)
+            self.version = version
+        return self
+
+    @staticmethod
+    def _describe(api_name, item_data):
+        """Suggestion label and ranking of a catalog item, from its demand and value"""
+        demand = item_data.get('Demand', 'Unknown')
+        cash_value = parse_value(item_data.get('Cash Value'))
+        label = f"{api_name} · {demand}"
+        if cash_value:
+            label += f" · {cash_value / 1_000_000:g}M"
+        return {'label': label[:100], 'rank': (DEMAND_RANK.get(demand, len(DEMAND_RANK)), -cash_value, api_name)}
+
+    def apply_diff(self, diff, api_data, item_request_data):
+        """Follow a catalog update: value/demand changes are patched in place, new or removed names rebuild"""
+        if diff.structural or not self.targets:
+            self.rebuild(api_data, item_request_data)
+        else:
+            for api_name, (_, item_data) in diff.changed.items():
+                target = self.target_of.get(api_name)
+                if target is not None:
+                    self.targets[target].update(self._describe(api_name, item_data))
+            self.cache = {}
+        self.version = catalog_version()
+
+    def rebuild(self, api_data, item_request_data):
+        """Index every catalog item under its name, its typed name and its hyperchrome aliases"""
+        names_by_clean = {}
+        for api_name in api_data:
+            clean_name, _ = split_api_name(api_name)
+            names_by_clean.setdefault(normalize(clean_name), []).append(api_name)
+
+        targets = []
+        target_of = {}
+        pairs = []
+        for api_name, item_data in api_data.items():
+            clean_name, item_type = split_api_name(api_name)
+            clean_key = normalize(clean_name)
+            # A name shared by several types is completed with its type so it stays exact
+            shared = len(names_by_clean[clean_key]) > 1 and item_type
+            value = f"{clean_name} {item_type}" if shared else clean_name
+
+            target_of[api_name] = len(targets)
+            targets.append({'api_name': api_name, 'value': value, **self._describe(api_name, item_data)})
+            pairs.append((clean_key, target_of[api_name]))
+            if shared:
+                pairs.append((normalize(value), target_of[api_name]))
+
+        # Hyperchrome aliases ("Hyper Shift L5") point at their catalog entry
+        for official_name, aliases in item_request_data.get('hyper', {}).items():
+            api_name = next((name for name in (f"{official_name} 2023 (HyperChrome)", f"{official_name} (HyperChrome)")
+                             if name in target_of), None)
+            if api_name is None:
+                continue
+            for alias in [official_name] + list(aliases):
+                pairs.append((normalize(alias), target_of[api_name]))
+
+        pairs = sorted(set(pairs))
+        self.keys = [key for key, _ in pairs]
+        self.key_targets = [target for _, target in pairs]
+        self.targets = targets
+        self.target_of = target_of
+        self.exact = names_by_clean
+        self.cache = {}
+        self.typos = None
+        index_rebuilds.inc()
+
+    def suggest(self, prefix, limit=MAX_SUGGESTIONS):
+        """Catalog items with a name or alias starting with prefix, most wanted first"""
+        with autocomplete_latency.time():
+            key = normalize(prefix)
+            suggestions = self.cache.get(key)
+            if suggestions is None:
+                start = bisect.bisect_left(self.keys, key)
+                end = bisect.bisect_left(self.keys, key + '\uffff', start)
+                matched = set(self.key_targets[start:end])
+                ranked = sorted(matched, key=lambda target: (
+                    # An exactly typed name comes first
+                    normalize(self.targets[target]['value']) != key, self.targets[target]['rank']))
+                suggestions = [self.targets[target] for target in ranked[:MAX_SUGGESTIONS]]
+                if len(self.cache) >= SUGGESTION_CACHE_SIZE:
+                    self.cache.clear()
+                self.cache[key] = suggestions
+            return suggestions[:limit]
+
+    def has_prefix(self, key):
+        """Whether a name or alias starts with key (a partial name, not a typo)"""
+        start = bisect.bisect_left(self.keys, key)
+        return start < len(self.keys) and self.keys[start].startswith(key)
+
+    def correct_typo(self, clean_name):
+        """API names of the only catalog name or alias closest to clean_name within the typo tolerance, [] if none, tied or a prefix"""
+        key = normalize(clean_name)
+        tolerance = typo_tolerance(key)
+        if not tolerance or key in self.exact or self.has_prefix(key):
+            return []
+        if self.typos is None:
+            typo_targets = {}
+            for key_text, target in zip(self.keys, self.key_targets):
+                typo_targets.setdefault(key_text, []).append(self.targets[target]['api_name'])
+            self.typo_targets = typo_targets
+            self.typos = TypoIndex(typo_targets)
+        found = self.typos.search(key, tolerance)
+        if not found or (len(found) > 1 and found[1][0] == found[0][0]):
+            return []
+        typo_corrections.inc()
+        return self.typo_targets[found[0][1]]
+
+    def exact_matches(self, clean_name):
+        """API names whose name without type is exactly clean_name (case and spaces ignored)"""
+        return self.exact.get(normalize(clean_name), [])
+
+
+# Global instance shared by autocomplete and item matching
+item_name_index = ItemNameIndex()
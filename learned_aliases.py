@@ -0,0 +1,129 @@
+import json
+import os
+from collections import OrderedDict
+from dotenv import load_dotenv
+from metrics import metrics, record_json_write
+from item_index import normalize
+
+load_dotenv()
+
+# Spellings kept, least recently used dropped first
+LEARNED_ALIAS_MAX = int(os.getenv('LEARNED_ALIAS_MAX', '5000'))
+
+# Confirmations needed before a spelling resolves on its own (no type picker, no priority order)
+LEARNED_ALIAS_MIN_CONFIRMATIONS = int(os.getenv('LEARNED_ALIAS_MIN_CONFIRMATIONS', '3'))
+
+alias_lookups = metrics.counter('learned_alias_lookups_total', "Learned alias lookups by result", ('result',))
+
+
+class LearnedAliases:
+    """Spellings users confirmed: (input, type, year) -> {API name: confirmations} for a picked type,
+    (input, 'name') -> {item name: confirmations} when only the name was confirmed"""
+
+    def __init__(self, data_file='learned_aliases.json'):
+        self.data_file = data_file
+        self.aliases = OrderedDict()
+        self.load_data()
+
+    def load_data(self):
+        """Load learned aliases from JSON file"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                self.aliases = OrderedDict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.aliases = OrderedDict()
+
+    def save_data(self):
+        """Save learned aliases to JSON file"""
+        try:
+            text = json.dumps(self.aliases, indent=2, ensure_ascii=False)
+            with open(self.data_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            record_json_write(self.data_file, text)
+        except Exception as e:
+            print(f"Error saving learned aliases: {e}")
+
+    @staticmethod
+    def key(search_text, item_type, year=None):
+        return f"{normalize(search_text)}|{item_type or 'None'}|{year or ''}"
+
+    @staticmethod
+    def name_key(search_text):
+        return f"{normalize(search_text)}|name|"
+
+    def lookup(self, search_text, item_type, year, api_data):
+        """API name most confirmed for this spelling, None if unknown, tied or no longer in the catalog"""
+        return self._best(self.key(search_text, item_type, year), lambda api_name: api_name in api_data)
+
+    def lookup_name(self, search_text, exact):
+        """Item name most confirmed for this spelling, exact maps normalized names to their API names"""
+        return self._best(self.name_key(search_text), lambda name: normalize(name) in exact)
+
+    def _best(self, key, exists):
+        """Most confirmed target of a key once past the threshold, None if unknown or tied"""
+        targets = self.aliases.get(key)
+        if not targets:
+            alias_lookups.inc(result='miss')
+            return None
+
+        # Targets removed from the catalog since they were learned
+        stale = [target for target in targets if not exists(target)]
+        if stale:
+            for target in stale:
+                del targets[target]
+            if not targets:
+                del self.aliases[key]
+            self.save_data()
+            alias_lookups.inc(result='stale')
+            if not targets:
+                return None
+
+        ranked = sorted(targets.items(), key=lambda target: -target[1])
+        best_name, confirmations = ranked[0]
+        if confirmations < LEARNED_ALIAS_MIN_CONFIRMATIONS or (len(ranked) > 1 and ranked[1][1] == confirmations):
+            alias_lookups.inc(result='unsure')
+            return None
+
+        self.aliases.move_to_end(key)
+        alias_lookups.inc(result='hit')
+        return best_name
+
+    def confirm(self, search_text, item_type, year, api_name):
+        """Record that this spelling meant api_name (its type was picked by the user)"""
+        if not normalize(search_text):
+            return
+        self._add(self.key(search_text, item_type, year), api_name)
+
+    def confirm_name(self, search_text, item_name):
+        """Record that this spelling meant item_name, whatever type was chosen for it"""
+        if not normalize(search_text) or normalize(search_text) == normalize(item_name):
+            return
+        self._add(self.name_key(search_text), item_name)
+
+    def _add(self, key, target):
+        targets = self.aliases.setdefault(key, {})
+        targets[target] = targets.get(target, 0) + 1
+        self.aliases.move_to_end(key)
+        while len(self.aliases) > LEARNED_ALIAS_MAX:
+            self.aliases.popitem(last=False)
+        self.save_data()
+
+    def apply_catalog_diff(self, diff):
+        """Forget spellings pointing at items removed from the catalog"""
+        if not diff.removed:
+            return 0
+        forgotten = 0
+        for key in list(self.aliases):
+            targets = self.aliases[key]
+            for api_name in [name for name in targets if name in diff.removed]:
+                del targets[api_name]
+                forgotten += 1
+            if not targets:
+                del self.aliases[key]
+        if forgotten:
+            self.save_data()
+        return forgotten
+
+
+# Global instance consulted by item matching
+learned_aliases = LearnedAliases()
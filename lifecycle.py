@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import json
+from metrics import record_json_write
+from services import get_registry
+
+
+def command_tree_hash(tree):
+    """Hash of every registered application command, as sent to Discord on sync"""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()),
+                     key=lambda command: (command.get('type', 1), command['name']))
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class BotLifecycle:
+    def __init__(self, bot, data_file='bot_lifecycle.json'):
+        self.bot = bot
+        self.data_file = data_file
+        self.services = get_registry(bot)
+        self.started = set()  # Names of the subsystems already started
+        self.tasks = {}  # name -> background task started by the lifecycle
+        self.load_data()
+
+    def load_data(self):
+        """Load the last synced command tree hash"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.data = {'command_tree_hash': None}
+
+    def save_data(self):
+        """Save lifecycle data to JSON file"""
+        try:
+            text = json.dumps(self.data, indent=2, ensure_ascii=False)
+            with open(self.data_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            record_json_write(self.data_file, text)
+        except Exception as e:
+            print(f"Error saving lifecycle data: {e}")
+
+    def start_once(self, name, setup):
+        """Run a subsystem setup the first time only, its result is registered under the name"""
+        if name in self.started:
+            return self.services.get(name)
+        self.started.add(name)
+        service = setup()
+        if service is not None:
+            self.services.register(name, service)
+        print(f"{name} started")
+        return service
+
+    def run_in_background(self, name, coroutine_function):
+        """Start a background task once per process"""
+        task = self.tasks.get(name)
+        if task:
+            return task
+        task = asyncio.create_task(self._guard(name, coroutine_function))
+        self.tasks[name] = task
+        return task
+
+    async def _guard(self, name, coroutine_function):
+        try:
+            await coroutine_function()
+        except Exception as e:
+            print(f"Background task {name} failed: {e}")
+
+    async def sync_commands(self, force=False):
+        """Sync slash commands, only when the command tree changed since the last sync"""
+        tree_hash = command_tree_hash(self.bot.tree)
+        if not force and tree_hash == self.data.get('command_tree_hash'):
+            print("Command tree unchanged, skipping sync")
+            return None
+        try:
+            synced = await self.bot.tree.sync()
+        except Exception as e:
+            print(f"Failed to sync commands: {e}")
+            return None
+        self.data['command_tree_hash'] = tree_hash
+        self.save_data()
+        print(f"Synced {len(synced)} command(s)")
+        return synced
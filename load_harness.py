@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from fake_api_server import FakeApiServer
+
+# Drive N simulated selling tickets through the real monitoring code against the fake API
+# server, then report request rates and end-to-end detection latency.
+#
+#   python load_harness.py --tickets 50 --duration 120
+
+GROUP_ID = 34785441
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None, view=None):
+        self.id = next(channel.message_ids)
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.embeds = [embed] if embed else []
+        self.view = view
+        self.author = channel.bot_user
+
+    async def edit(self, content=None, embed=None, view=None, **kwargs):
+        self.channel.edits += 1
+        if embed is not None:
+            self.embed = embed
+            self.embeds = [embed]
+        if view is not None:
+            self.view = view
+        return self
+
+
+class FakeChannel:
+    """Records what the bot sends, with the time it was sent"""
+
+    def __init__(self, channel_id, bot_user, message_ids):
+        self.id = channel_id
+        self.bot_user = bot_user
+        self.message_ids = message_ids
+        self.messages = []
+        self.sent = []  # (monotonic time, embed title)
+        self.edits = 0
+        self.overwrites = {}
+
+    async def send(self, content=None, embed=None, view=None, **kwargs):
+        message = FakeMessage(self, content, embed, view)
+        self.messages.append(message)
+        self.sent.append((time.monotonic(), embed.title if embed else None))
+        return message
+
+    async def fetch_message(self, message_id):
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise LookupError(message_id)
+
+    def get_partial_message(self, message_id):
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise LookupError(message_id)
+
+    async def history(self, limit=100):
+        for message in reversed(self.messages[-limit:]):
+            yield message
+
+    async def edit(self, **kwargs):
+        return self
+
+    def first_sent_after(self, title_part, since):
+        for sent_at, title in self.sent:
+            if sent_at >= since and title and title_part in title:
+                return sent_at
+        return None
+
+
+async def run_github_check(server):
+    """Run one changelog update cycle and one file backup against the fake GitHub API"""
+    os.environ.update({
+        'GITHUB_API_URL': server.base_url,
+        'GITHUB_TOKEN': 'fake-token',
+        'GITHUB_REPO': 'fake/changelogs',
+        'GITHUB_REPO2': 'fake/backup'
+    })
+    from API_JBChangeLogs import GitHubSync as ChangelogSync
+    from github_sync import GitHubSync as BackupSync
+
+    state = server.state
+    state.set_file('fake/changelogs', 'API_JBChangeLogs.json', '{}')
+    changelog_sync = ChangelogSync()
+    await changelog_sync.initial_sync()
+
+    state.set_file('fake/changelogs', 'API_JBChangeLogs.json',
+                   '{"Torpedo (Vehicle)": {"Cash Value": "48 000 000", "Duped Value": "N/A", "Type": "Vehicle", "Demand": "Decent"}}')
+    updated = await changelog_sync.check_for_updates()
+    backed_up = await BackupSync().sync_all_files_to_github()
+    backup_files = sorted(path for repo, path in state.files if repo == 'fake/backup')
+
+    print(f"\nGitHub: changelog update detected={updated}, backup ok={backed_up}, backed up files={backup_files}")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_harness(args):
+    from trading_ticket_system import TradingTicketSystem
+    from roblox_OnJoinGroup import setup_group_monitor
+    import roblox_ratelimit
+    from roblox_ratelimit import rate_limiter
+    from polling_scheduler import polling_scheduler
+
+    server = FakeApiServer(
+        latency=args.latency, jitter=args.jitter, error_429_rate=args.error_429_rate,
+        rate_limit_per_second=args.server_rate_limit, retry_after=args.retry_after, seed=args.seed
+    )
+    # Point every Roblox client at the fake server
+    roblox_ratelimit.API_BASE_OVERRIDE = server.start_in_thread()
+    state = server.state
+
+    bot_user = SimpleNamespace(id=1, name="LoadHarness", avatar=None)
+    bot = SimpleNamespace(user=bot_user, get_user=lambda user_id: None, get_channel=lambda channel_id: None)
+    ticket_system = TradingTicketSystem(bot)
+    group_monitor = setup_group_monitor(bot)
+
+    rng = random.Random(args.seed)
+    message_ids = itertools.count(1)
+    tickets = []
+
+    for index in range(args.tickets):
+        username = f"Seller{index}"
+        user_id, universe_id = state.add_user(username)
+        channel = FakeChannel(100_000 + index, bot_user, message_ids)
+        user = SimpleNamespace(id=200_000 + index, name=f"discord{index}", display_name=f"discord{index}",
+                               mention=f"<@{200_000 + index}>", avatar=None)
+        items_list = [{'name': 'Torpedo', 'quantity': 1, 'status': 'Clean', 'value': 48_000_000, 'type': 'Vehicle'}]
+        total_robux = int(48 * ticket_system.calculate_robux_rate(48))
+        method = 'gamepass' if index < args.tickets * args.gamepass_ratio else 'group'
+        ticket = {
+            'method': method, 'channel': channel, 'user': user, 'username': username,
+            'roblox_id': user_id, 'universe_id': universe_id, 'expected_price': total_robux, 'events': {}
+        }
+        tickets.append(ticket)
+
+        if method == 'gamepass':
+            ticket_system.save_ticket_state(channel.id, user.id, {
+                'current_step': 'gamepass_monitoring',
+                'items_list': items_list,
+                'monitoring_data': {'username': username, 'experience_id': universe_id, 'expected_price': total_robux}
+            })
+            await ticket_system.start_gamepass_monitoring(channel, user, username, universe_id, items_list, total_robux)
+        else:
+            ticket_system.save_ticket_state(channel.id, user.id, {
+                'current_step': 'group_monitoring',
+                'items_list': items_list,
+                'monitoring_data': {'user_id': user_id, 'group_id': GROUP_ID, 'total_robux': total_robux,
+                                    'roblox_username': username}
+            })
+            await group_monitor.start_group_monitoring(channel, user, user_id, GROUP_ID, items_list, total_robux,
+                                                       username, ticket_system)
+
+    # Script the seller actions, leaving time at the end of the run for detection
+    horizon = max(1.0, args.duration * 0.6)
+    started_at = time.monotonic()
+    loop = asyncio.get_running_loop()
+
+    def interact(ticket):
+        # The seller posts in the ticket right after acting on Roblox
+        if args.interact:
+            loop.call_soon_threadsafe(ticket_system.on_ticket_activity, ticket['channel'].id, ticket['user'].id)
+
+    def create_pass(ticket):
+        ticket['events']['game_pass_created'] = time.monotonic()
+        ticket['gamepass_id'] = state.create_game_pass(ticket['universe_id'], f"{ticket['username']} Pass")
+        interact(ticket)
+
+    def set_price(ticket):
+        if 'gamepass_id' in ticket:
+            ticket['events']['price_set'] = time.monotonic()
+            state.set_game_pass_price(ticket['gamepass_id'], ticket['expected_price'])
+            interact(ticket)
+
+    def join_group(ticket):
+        ticket['events']['user_joined_group'] = time.monotonic()
+        state.join_group(ticket['roblox_id'], GROUP_ID)
+
+    for ticket in tickets:
+        if ticket['method'] == 'gamepass':
+            created = rng.uniform(0, horizon / 2)
+            server.schedule(created, create_pass, ticket)
+            server.schedule(created + rng.uniform(horizon / 4, horizon / 2), set_price, ticket)
+        else:
+            server.schedule(rng.uniform(0, horizon), join_group, ticket)
+
+    print(f"Running {args.tickets} tickets for {args.duration:.0f}s against {server.base_url}...")
+    await asyncio.sleep(args.duration)
+    elapsed = time.monotonic() - started_at
+
+    # Stop every monitor still running
+    scheduler_stats = polling_scheduler.get_stats()
+    watch_stats = ticket_system.get_watch_stats()
+    for key in list(polling_scheduler.jobs):
+        polling_scheduler.cancel(key)
+    for task in list(group_monitor.monitoring_tasks.values()):
+        task.cancel()
+    await asyncio.sleep(0.1)
+    server_stats = server.get_stats()
+
+    if args.github:
+        await run_github_check(server)
+    server.stop_thread()
+
+    detections = {'game_pass_created': [], 'price_set': [], 'user_joined_group': []}
+    missed = {kind: 0 for kind in detections}
+    markers = {
+        'game_pass_created': "GamePass Created",
+        'price_set': "Transaction Pending",
+        'user_joined_group': "Welcome to our Group",
+    }
+    for ticket in tickets:
+        for kind, happened_at in ticket['events'].items():
+            detected_at = ticket['channel'].first_sent_after(markers[kind], happened_at)
+            if detected_at is None:
+                missed[kind] += 1
+            else:
+                detections[kind].append(detected_at - happened_at)
+
+    gamepass_count = sum(1 for ticket in tickets if ticket['method'] == 'gamepass')
+    print(f"\nTickets: {args.tickets} ({gamepass_count} gamepass, {args.tickets - gamepass_count} group) over {elapsed:.1f}s")
+
+    print("\nRequests by endpoint family:")
+    total = 0
+    for family, data in sorted(server_stats['families'].items()):
+        total += data['total']
+        throttled = data['by_status'].get(429, 0)
+        print(f"  {family:<12} {data['total']:>7}  {data['total'] / elapsed:>7.2f} req/s  (429: {throttled})")
+    print(f"  {'TOTAL':<12} {total:>7}  {total / elapsed:>7.2f} req/s")
+
+    print("\nDetection latency (seconds):")
+    for kind, latencies in detections.items():
+        if not latencies and not missed[kind]:
+            continue
+        if latencies:
+            print(f"  {kind:<18} n={len(latencies):<4} mean={statistics.mean(latencies):6.2f} "
+                  f"p50={percentile(latencies, 0.5):6.2f} p95={percentile(latencies, 0.95):6.2f} "
+                  f"max={max(latencies):6.2f} missed={missed[kind]}")
+        else:
+            print(f"  {kind:<18} n=0    missed={missed[kind]}")
+
+    print("\nClient rate limiter:")
+    for family, stats in sorted(rate_limiter.get_stats().items()):
+        print(f"  {family:<12} rate={stats['rate']:.2f}/{stats['base_rate']:.2f} throttled={stats['throttled_count']}")
+
+    print(f"\nPolling scheduler: jobs left={scheduler_stats['jobs']} checks={scheduler_stats['checks_run']} "
+          f"queue depth={scheduler_stats['queue_depth']} lag avg={scheduler_stats['average_lag']:.3f}s "
+          f"max={scheduler_stats['max_lag']:.3f}s")
+
+    finished = watch_stats['finished']
+    idle_checks = [watch['checks'] for watch in watch_stats['active'].values()]
+    estimated = finished['average_detection_latency']
+    print(f"GamePass watches: finished={finished['watches']} checks/watch={finished['checks_per_watch']:.1f} "
+          f"estimated detection latency={estimated if estimated is None else round(estimated, 2)}s "
+          f"still waiting={len(idle_checks)} (checks: {sum(idle_checks)})")
+
+    detector_stats = group_monitor.detector.get_stats()
+    print(f"Group join detector: member pages={detector_stats['member_pages']} "
+          f"fallback checks={detector_stats['fallback_checks']} "
+          f"detected by listing={detector_stats['detected_by_listing']} "
+          f"by fallback={detector_stats['detected_by_fallback']}")
+
+    return {'server': server_stats, 'detections': detections, 'missed': missed, 'elapsed': elapsed,
+            'scheduler': scheduler_stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load harness for the ticket monitors against the fake API server")
+    parser.add_argument('--tickets', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=60.0, help="Run time in seconds")
+    parser.add_argument('--gamepass-ratio', type=float, default=0.5, help="Share of tickets using the GamePass method")
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-429-rate', type=float, default=0.0)
+    parser.add_argument('--server-rate-limit', type=int, default=None, help="Requests per second per family before 429")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--interact', action='store_true', help="Sellers post in their ticket after each Roblox action")
+    parser.add_argument('--github', action='store_true', help="Also exercise both GitHubSync classes")
+    args = parser.parse_args()
+
+    os.environ.setdefault('ROBLOX_COOKIE', 'fake-cookie')
+
+    # The ticket system writes its JSON state to the working directory, keep it out of the repo
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, repo_dir)
+    work_dir = tempfile.mkdtemp(prefix="load_harness_")
+    os.chdir(work_dir)
+
+    asyncio.run(run_harness(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@ import discord
 from discord.ext import commands
 import os
 from dotenv import load_dotenv
-import asyncio
 from API_JBChangeLogs import github_sync as api_github_sync
 from stockage_system import setup_stockage_system
 from github_sync import GitHubSync
 from trading_ticket_system import setup_trading_ticket_system
+from metrics import setup_metrics
+from lifecycle import BotLifecycle
 
 # Load environment variables
 load_dotenv()
@@ -14,38 +15,48 @@ load_dotenv()
 # Bot configuration
 TOKEN = os.getenv('TOKEN_DISCORD')
 
-# Bot setup
-intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+
+class BlackMarketBot(commands.Bot):
+    def __init__(self):
+        intents = discord.Intents.default()
+        intents.message_content = True
+        super().__init__(command_prefix='!', intents=intents)
+        self.lifecycle = BotLifecycle(self)
+
+    async def setup_hook(self):
+        """Start every subsystem once per process, reconnects don't come back here"""
+        lifecycle = self.lifecycle
+
+        # Configurer le système de stockage
+        lifecycle.start_once('stockage_system', lambda: setup_stockage_system(self))
+
+        # Configurer le système de tickets de trading
+        lifecycle.start_once('trading_ticket_system', lambda: setup_trading_ticket_system(self))
+
+        # Métriques (endpoint Prometheus local + commande /metrics)
+        lifecycle.start_once('metrics', lambda: setup_metrics(self))
+
+        # Démarrer la synchronisation GitHub
+        lifecycle.start_once('api_github_sync', lambda: api_github_sync)
+        lifecycle.run_in_background('api_github_monitoring', api_github_sync.start_monitoring)
+
+        # Sync slash commands, only if they changed since the last start
+        await lifecycle.sync_commands()
+
+        # Sauvegarde GitHub en arrière-plan
+        file_sync = lifecycle.start_once('github_backup', GitHubSync)
+        lifecycle.run_in_background('github_backup', file_sync.sync_all_files_to_github)
+
+
+bot = BlackMarketBot()
 
 @bot.event
 async def on_ready():
+    # Called again on every reconnect, everything is already running
     print(f'{bot.user} connected to Discord!')
-    
-    # Configurer le système de stockage
-    stockage_system = setup_stockage_system(bot)
-    print("Stockage System loaded!")
-    
-    # Configurer le système de tickets de trading
-    trading_ticket_system = setup_trading_ticket_system(bot)
-    print("Trading Ticket System loaded!")
-    
-    # Démarrer la synchronisation GitHub
-    asyncio.create_task(api_github_sync.start_monitoring())
-
-    # Sync slash commands
-    try:
-        synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} command(s)")
-    except Exception as e:
-        print(f"Failed to sync commands: {e}")
-
-    file_sync = GitHubSync()
-    await file_sync.sync_all_files_to_github()
-    
+
 if __name__ == "__main__":
     if TOKEN:
         bot.run(TOKEN)
     else:
-        print("Error: TOKEN_DISCORD not found in environment variables")
\ No newline at end of file
+        print("Error: TOKEN_DISCORD not found in environment variables")
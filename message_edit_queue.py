@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import deque
+from metrics import metrics
+
+# Discord allows about 5 message edits per 5 seconds in a channel
+EDIT_RATE = 1.0  # Edits per second per channel
+EDIT_BURST = 5
+
+edits_submitted = metrics.counter('discord_edits_submitted_total', "Message edits submitted to the edit queue")
+edits_superseded = metrics.counter('discord_edits_superseded_total', "Queued message edits dropped for a newer payload")
+
+
+def _consume_exception(future):
+    # Callers that don't await their edit must not trigger "exception was never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+class MessageEditQueue:
+    def __init__(self, rate=EDIT_RATE, burst=EDIT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.pending = {}  # message key -> {'send': coroutine function, 'futures': [...]}
+        # channel_id -> {'queue': deque of message keys, 'tokens', 'updated', 'worker'}, kept once idle so pacing carries over
+        self.channels = {}
+
+    def submit(self, key, channel_id, send, log_errors=True):
+        """Queue an edit of a message, a newer edit of the same message replaces it if not sent yet
+
+        Errors are set on the returned future, log_errors=False leaves reporting them to the caller awaiting it"""
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        edits_submitted.inc()
+
+        entry = self.pending.get(key)
+        if entry:
+            # Last write wins, the superseded payload is never sent
+            entry['send'] = send
+            entry['futures'].append(future)
+            entry['log_errors'] = entry['log_errors'] or log_errors
+            edits_superseded.inc()
+            return future
+
+        self.pending[key] = {'send': send, 'futures': [future], 'log_errors': log_errors}
+        channel = self.channels.get(channel_id)
+        if not channel:
+            channel = {'queue': deque(), 'tokens': float(self.burst), 'updated': time.monotonic(), 'worker': None}
+            self.channels[channel_id] = channel
+        channel['queue'].append(key)
+        if channel['worker'] is None or channel['worker'].done():
+            channel['worker'] = asyncio.create_task(self._drain(channel_id, channel))
+        return future
+
+    def edit(self, message, **kwargs):
+        """Queue message.edit(**kwargs), await the returned future to get the edited message or its error"""
+        return self.submit(message.id, message.channel.id, lambda: message.edit(**kwargs), log_errors=False)
+
+    async def _take_token(self, channel):
+        """Wait until the channel may receive another edit"""
+        while True:
+            now = time.monotonic()
+            channel['tokens'] = min(self.burst, channel['tokens'] + (now - channel['updated']) * self.rate)
+            channel['updated'] = now
+            if channel['tokens'] >= 1:
+                channel['tokens'] -= 1
+                return
+            await asyncio.sleep((1 - channel['tokens']) / self.rate)
+
+    async def _drain(self, channel_id, channel):
+        """Send the queued edits of a channel, paced by its token bucket"""
+        while channel['queue']:
+            await self._take_token(channel)
+            key = channel['queue'].popleft()
+            entry = self.pending.pop(key, None)
+            if not entry:
+                continue
+
+            # Edits submitted from now on are newer than this one and get queued again
+            try:
+                result = await entry['send']()
+            except Exception as e:
+                # Only log errors nobody is waiting on, callers of edit() handle theirs (e.g. NotFound)
+                if entry['log_errors']:
+                    print(f"Error editing message {key}: {e}")
+                for future in entry['futures']:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in entry['futures']:
+                    if not future.done():
+                        future.set_result(result)
+
+    def get_stats(self):
+        """Get edit queue statistics"""
+        return {
+            'pending': len(self.pending),
+            'busy_channels': sum(1 for channel in self.channels.values() if channel['queue']),
+            'submitted': edits_submitted.total(),
+            'superseded': edits_superseded.total()
+        }
+
+
+# Global instance shared by every message editor
+message_edit_queue = MessageEditQueue()
@@ -0,0 +1,297 @@
+import bisect
+import os
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Local Prometheus endpoint, set METRICS_PORT=0 to disable it
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        """Add to the counter of a label set"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def total(self):
+        return sum(self.values.values())
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.values.items())]
+
+    def summary(self):
+        """One line with the total and the biggest label sets"""
+        if not self.labelnames:
+            return f"{self.total():g}"
+        top = sorted(self.values.items(), key=lambda item: item[1], reverse=True)[:4]
+        details = ", ".join(f"{'/'.join(key)}={value:g}" for key, value in top)
+        return f"{self.total():g} ({details})" if details else "0"
+
+
+class Gauge:
+    type_name = 'gauge'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.function = None
+
+    def set(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        self.values[key] = value
+
+    def set_function(self, function):
+        """Read the value from a callable at scrape time"""
+        self.function = function
+
+    def _current(self):
+        if self.function:
+            try:
+                return {(): self.function()}
+            except Exception as e:
+                print(f"Error reading gauge {self.name}: {e}")
+                return {}
+        return self.values
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._current().items())]
+
+    def summary(self):
+        values = self._current()
+        if list(values) == [()]:
+            return f"{values[()]:g}"
+        return ", ".join(f"{'/'.join(key)}={value:g}" for key, value in sorted(values.items())) or "0"
+
+
+class Histogram:
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label key -> [bucket counts..., +Inf count], sum
+
+    def observe(self, value, **labels):
+        """Record one observation"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        if key not in self.series:
+            self.series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+        series = self.series[key]
+        series['counts'][bisect.bisect_left(self.buckets, value)] += 1
+        series['sum'] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self):
+        lines = []
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(float(bound))))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+    def quantile(self, fraction):
+        """Upper bucket bound holding the given fraction of every observation"""
+        counts = [sum(column) for column in zip(*(series['counts'] for series in self.series.values()))]
+        total = sum(counts)
+        if not total:
+            return None
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            if cumulative >= fraction * total:
+                return bound
+        return float('inf')
+
+    def summary(self):
+        count = sum(sum(series['counts']) for series in self.series.values())
+        if not count:
+            return "no data"
+        average = sum(series['sum'] for series in self.series.values()) / count
+        return f"n={count} avg={average * 1000:.1f}ms p50<={self.quantile(0.5) * 1000:g}ms p95<={self.quantile(0.95) * 1000:g}ms"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+
+    def _get_or_create(self, metric_class, name, help_text, labelnames, **kwargs):
+        if name not in self.metrics:
+            self.metrics[name] = metric_class(name, help_text, labelnames, **kwargs)
+        return self.metrics[name]
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """(name, one-line summary) of every metric"""
+        return [(name, metric.summary()) for name, metric in sorted(self.metrics.items())]
+
+
+# Global registry shared by every module
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter('http_requests_total', "Outgoing HTTP calls", ('endpoint', 'method', 'status'))
+http_latency = metrics.histogram('http_request_seconds', "Outgoing HTTP call latency", ('endpoint',))
+json_writes = metrics.counter('json_writes_total', "JSON data file writes", ('file',))
+json_write_bytes = metrics.counter('json_write_bytes_total', "Bytes written to JSON data files", ('file',))
+discord_requests = metrics.counter('discord_requests_total', "Discord API calls", ('method', 'route', 'status'))
+discord_edits = metrics.counter('discord_message_edits_total', "Discord message edits")
+
+
+def record_http(endpoint, method, status, seconds):
+    """Count an outgoing HTTP call and its latency"""
+    http_requests.inc(endpoint=endpoint, method=method, status=status)
+    http_latency.observe(seconds, endpoint=endpoint)
+
+
+def http_hook(endpoint):
+    """requests response hook recording the call under an endpoint name"""
+    def hook(response, *args, **kwargs):
+        record_http(endpoint, response.request.method, response.status_code, response.elapsed.total_seconds())
+    return {'response': hook}
+
+
+def record_json_write(filename, text):
+    """Count a JSON file write and its size"""
+    json_writes.inc(file=filename)
+    json_write_bytes.inc(len(text.encode('utf-8')), file=filename)
+
+
+def instrument_discord_http(bot):
+    """Count every Discord API call made by the bot, message edits included"""
+    if getattr(bot.http, '_metrics_instrumented', False):
+        return
+    original_request = bot.http.request
+
+    async def request(route, **kwargs):
+        status = 'error'
+        try:
+            result = await original_request(route, **kwargs)
+            status = 'ok'
+            return result
+        except Exception as e:
+            status = getattr(e, 'status', 'error')
+            raise
+        finally:
+            discord_requests.inc(method=route.method, route=route.path, status=status)
+            if route.method == 'PATCH' and '/messages/' in route.path:
+                discord_edits.inc()
+
+    bot.http.request = request
+    bot.http._metrics_instrumented = True
+
+
+async def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve /metrics in the Prometheus text format, returns the runner"""
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8')
+
+    app = web.Application()
+    app.add_routes([web.get('/metrics', handle_metrics)])
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"Metrics available on http://{host}:{port}/metrics")
+    return runner
+
+
+def setup_metrics(bot):
+    """Instrument the bot, start the metrics endpoint and add the /metrics command"""
+    import discord
+
+    instrument_discord_http(bot)
+
+    async def start_server():
+        try:
+            await start_metrics_server()
+        except Exception as e:
+            print(f"Failed to start metrics server: {e}")
+
+    if METRICS_PORT:
+        bot.loop.create_task(start_server())
+
+    @bot.tree.command(name="metrics", description="Show the bot metrics summary")
+    async def metrics_command(interaction: discord.Interaction):
+        """Admin command summarizing every metric"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("You don't have permission to use this command!", ephemeral=True)
+            return
+
+        lines = [f"{name}: {summary}" for name, summary in metrics.summary()]
+        description = "\n".join(lines)
+        if len(description) > 4000:
+            description = description[:4000] + "\n..."
+
+        embed = discord.Embed(
+            title="Bot Metrics",
+            description=f"```\n{description}\n```",
+            color=0x00ff88
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    return metrics
@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from dotenv import load_dotenv
+from metrics import metrics
+
+load_dotenv()
+
+# Number of checks allowed to run at the same time
+DEFAULT_WORKERS = int(os.getenv('POLLING_WORKERS', '8'))
+
+# Extra delay before retrying a check that raised
+DEFAULT_ERROR_DELAY = 10
+
+
+class WatchJob:
+    def __init__(self, key, check, interval, ticket=None, error_delay=DEFAULT_ERROR_DELAY):
+        self.key = key
+        self.check = check  # async callable, returns True when finished or the delay before the next check
+        self.interval = interval
+        self.ticket = ticket  # Channel ID of the ticket owning this job
+        self.error_delay = error_delay
+        self.next_due = 0.0
+        self.entry_id = None  # Identifies the live heap entry, older entries are skipped
+        self.running = False
+        self.cancelled = False
+        self.pending_delay = None  # Reschedule requested while the check was running
+        self.runs = 0
+        self.errors = 0
+
+
+class PollingScheduler:
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = workers
+        self.jobs = {}  # key -> WatchJob
+        self.heap = []  # (next_due, entry_id, job)
+        self.entry_ids = itertools.count()
+        self.queue = None
+        self.wakeup = None
+        self.tasks = []
+        self.checks_run = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def _ensure_started(self):
+        """Start the dispatcher and the worker pool on the running loop"""
+        if self.tasks and not all(task.done() for task in self.tasks):
+            return
+        self.queue = asyncio.Queue()
+        self.wakeup = asyncio.Event()
+        self.tasks = [asyncio.create_task(self._dispatch())]
+        for _ in range(self.workers):
+            self.tasks.append(asyncio.create_task(self._worker()))
+
+    def _push(self, job, delay):
+        """Put the job back in the heap, due after delay seconds"""
+        job.next_due = time.monotonic() + max(0.0, delay)
+        job.entry_id = next(self.entry_ids)
+        heapq.heappush(self.heap, (job.next_due, job.entry_id, job))
+        if self.wakeup:
+            self.wakeup.set()
+
+    def add(self, key, check, interval, delay=None, ticket=None, error_delay=DEFAULT_ERROR_DELAY):
+        """Add a watch job (replacing any job with the same key), first check after delay (default: interval)"""
+        self.cancel(key)
+        self._ensure_started()
+        job = WatchJob(key, check, interval, ticket, error_delay)
+        self.jobs[key] = job
+        self._push(job, interval if delay is None else delay)
+        return job
+
+    def cancel(self, key):
+        """Cancel a watch job"""
+        job = self.jobs.pop(key, None)
+        if job:
+            job.cancelled = True
+            job.entry_id = None
+        return job is not None
+
+    def cancel_ticket(self, ticket):
+        """Cancel every watch job of a ticket"""
+        keys = [key for key, job in self.jobs.items() if job.ticket == ticket]
+        for key in keys:
+            self.cancel(key)
+        return len(keys)
+
+    def reschedule(self, key, delay=0):
+        """Move the next check of a job to delay seconds from now"""
+        job = self.jobs.get(key)
+        if not job:
+            return False
+        if job.running:
+            job.pending_delay = delay
+        else:
+            self._push(job, delay)
+        return True
+
+    def reschedule_ticket(self, ticket, delay=0):
+        """Move the next check of every job of a ticket"""
+        keys = [key for key, job in self.jobs.items() if job.ticket == ticket]
+        for key in keys:
+            self.reschedule(key, delay)
+        return len(keys)
+
+    async def _dispatch(self):
+        """Pop due jobs off the heap and hand them to the workers"""
+        while True:
+            # Drop stale entries (cancelled or rescheduled jobs)
+            while self.heap and self.heap[0][2].entry_id != self.heap[0][1]:
+                heapq.heappop(self.heap)
+
+            if not self.heap:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            next_due, entry_id, job = self.heap[0]
+            now = time.monotonic()
+            if next_due > now:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self.heap)
+            job.entry_id = None
+            job.running = True
+
+            lag = now - next_due
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += lag
+            scheduler_lag.observe(lag)
+            self.queue.put_nowait(job)
+
+    async def _worker(self):
+        """Run checks from the queue, at most one per worker at a time"""
+        while True:
+            job = await self.queue.get()
+            delay = job.interval
+            try:
+                result = await job.check()
+                if result is True:
+                    if self.jobs.get(job.key) is job:
+                        del self.jobs[job.key]
+                    job.cancelled = True
+                elif result is not None and result is not False:
+                    delay = result
+            except Exception as e:
+                job.errors += 1
+                delay = job.interval + job.error_delay
+                print(f"Error in scheduled check {job.key}: {e}")
+            finally:
+                job.running = False
+                job.runs += 1
+                self.checks_run += 1
+                self.queue.task_done()
+
+            if not job.cancelled:
+                if job.pending_delay is not None:
+                    delay = min(delay, job.pending_delay)
+                    job.pending_delay = None
+                self._push(job, delay)
+
+    def get_stats(self):
+        """Queue depth, lag and job counts"""
+        due = sum(1 for next_due, entry_id, job in self.heap
+                  if job.entry_id == entry_id and next_due <= time.monotonic())
+        return {
+            'jobs': len(self.jobs),
+            'due': due,
+            'queue_depth': self.queue.qsize() if self.queue else 0,
+            'running': sum(1 for job in self.jobs.values() if job.running),
+            'workers': self.workers,
+            'checks_run': self.checks_run,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'average_lag': self.total_lag / self.checks_run if self.checks_run else 0.0
+        }
+
+
+# Global instance shared by every monitor
+polling_scheduler = PollingScheduler()
+
+scheduler_lag = metrics.histogram('polling_scheduler_lag_seconds', "Delay between a check being due and being dispatched")
+metrics.gauge('polling_scheduler_jobs', "Active watch jobs").set_function(lambda: len(polling_scheduler.jobs))
+metrics.gauge('polling_scheduler_queue_depth', "Due checks waiting for a worker").set_function(
+    lambda: polling_scheduler.queue.qsize() if polling_scheduler.queue else 0)
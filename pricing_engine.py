@@ -0,0 +1,75 @@
+import bisect
+import os
+from dotenv import load_dotenv
+from selling_list_cache import GroupedSellingList
+
+load_dotenv()
+
+# Robux paid per million of value, "from_millions:rate" tiers, configurable from .env
+DEFAULT_RATE_TIERS = "0:80,150:85,300:90"
+
+# Share of a GamePass sale kept by Roblox
+DEFAULT_ROBLOX_TAX = 0.30
+
+
+def parse_rate_tiers(text):
+    """Parse "0:80,150:85,300:90" into sorted (from_millions, rate) pairs"""
+    tiers = []
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        threshold, rate = part.split(':')
+        tiers.append((float(threshold), int(rate)))
+    tiers.sort()
+    if not tiers:
+        raise ValueError("No Robux rate tier configured")
+    return tiers
+
+
+class PriceQuote:
+    """Totals, tier and per-line Robux of one items list"""
+
+    def __init__(self, grouped, rate, tax):
+        self.digest = grouped.digest
+        self.total_value = grouped.total_value
+        self.total_millions = grouped.total_value / 1_000_000
+        self.rate = rate
+        self.total_robux = int(self.total_millions * rate)  # GamePass price, Roblox tax included
+        self.tax = tax  # Roblox tax share of total_robux
+        # (display name, quantity, robux) of every group
+        self.lines = [(key, group['quantity'], grouped.group_robux(key, rate))
+                      for key, group in grouped.groups.items()]
+
+
+class PricingEngine:
+    def __init__(self, tiers=None, tax=None):
+        try:
+            self.tiers = tiers or parse_rate_tiers(os.getenv('ROBUX_RATE_TIERS', DEFAULT_RATE_TIERS))
+        except ValueError as e:
+            print(f"Invalid ROBUX_RATE_TIERS, using the default tiers: {e}")
+            self.tiers = parse_rate_tiers(DEFAULT_RATE_TIERS)
+        self.thresholds = [threshold for threshold, _ in self.tiers]
+        if tax is None:
+            try:
+                tax = float(os.getenv('ROBLOX_TAX', DEFAULT_ROBLOX_TAX))
+            except ValueError as e:
+                print(f"Invalid ROBLOX_TAX, using the default tax: {e}")
+                tax = DEFAULT_ROBLOX_TAX
+        self.tax = tax
+        self.quotes_built = 0
+
+    def rate_for(self, total_millions):
+        """Robux rate of the tier holding this total value in millions"""
+        index = bisect.bisect_right(self.thresholds, total_millions) - 1
+        return self.tiers[max(index, 0)][1]
+
+    def quote(self, grouped):
+        """Price a grouped list, reusing the quote kept on it while its items don't change"""
+        if not isinstance(grouped, GroupedSellingList):
+            grouped = GroupedSellingList(grouped)
+        quote = grouped.quote
+        if quote is None or quote.digest != grouped.digest:
+            rate = self.rate_for(grouped.total_value / 1_000_000)
+            quote = grouped.quote = PriceQuote(grouped, rate, self.tax)
+            self.quotes_built += 1
+        return quote
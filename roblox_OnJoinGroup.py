@@ -2,12 +2,130 @@
 import asyncio
 import time
 from roblox_sync import RobloxClient
+from polling_scheduler import polling_scheduler
+from metrics import metrics
+
+# Group join detection settings
+GROUP_POLL_INTERVAL = 10  # Seconds between two reads of a group's newest members
+GROUP_FALLBACK_AFTER = 60  # Seconds before an unseen user gets an individual check
+GROUP_MEMBER_PAGES = 3  # Pages of newest members read at most per cycle
+GROUP_MEMBER_PAGE_SIZE = 100
+WATERMARK_SIZE = 10  # Newest members remembered to stop paging on the next cycle
+
+
+class GroupJoinDetector:
+    def __init__(self, client):
+        self.client = client
+        self.waiters = {}  # group_id -> {user_id: {'futures': [...], 'last_checked': monotonic}}
+        self.watermarks = {}  # group_id -> newest member IDs seen on the last cycle
+        self.stats = {
+            'member_pages': 0,
+            'fallback_checks': 0,
+            'detected_by_listing': 0,
+            'detected_by_fallback': 0
+        }
+
+    def wait_for_join(self, group_id, user_id):
+        """Get a future resolved once the user shows up in the group"""
+        future = asyncio.get_running_loop().create_future()
+        group = self.waiters.setdefault(group_id, {})
+        entry = group.setdefault(user_id, {'futures': [], 'last_checked': time.monotonic()})
+        entry['futures'].append(future)
+
+        # One poll job per group, whatever the number of tickets waiting on it
+        job_key = f"group_members_{group_id}"
+        if job_key not in polling_scheduler.jobs:
+            polling_scheduler.add(job_key, lambda: self._poll_group(group_id), interval=GROUP_POLL_INTERVAL)
+        return future
+
+    def _prune(self, group_id):
+        """Forget cancelled waiters, returns the users still awaited"""
+        group = self.waiters.get(group_id, {})
+        for user_id in list(group):
+            group[user_id]['futures'] = [future for future in group[user_id]['futures'] if not future.done()]
+            if not group[user_id]['futures']:
+                del group[user_id]
+        return group
+
+    def _resolve(self, group_id, user_id):
+        """Wake every waiter of a user"""
+        entry = self.waiters.get(group_id, {}).pop(user_id, None)
+        if entry:
+            for future in entry['futures']:
+                if not future.done():
+                    future.set_result(True)
+
+    async def _read_newest_members(self, group_id, awaited):
+        """Read the newest members until every awaited user is found or the last cycle's watermark is reached"""
+        found = set()
+        newest = None
+        watermark = self.watermarks.get(group_id)
+        cursor = None
+
+        for _ in range(GROUP_MEMBER_PAGES):
+            user_ids, cursor = await self.client.get_group_members(group_id, GROUP_MEMBER_PAGE_SIZE, cursor)
+            self.stats['member_pages'] += 1
+            if newest is None:
+                newest = set(user_ids[:WATERMARK_SIZE])
+
+            found.update(awaited.intersection(user_ids))
+            # Older members were already compared on a previous cycle
+            if found == awaited or not cursor or (watermark and watermark.intersection(user_ids)):
+                break
+
+        if newest is not None:
+            self.watermarks[group_id] = newest
+        return found
+
+    async def _poll_group(self, group_id):
+        """Diff the newest members of a group against the awaited users, returns True once nobody is waiting"""
+        group = self._prune(group_id)
+        if not group:
+            self.waiters.pop(group_id, None)
+            self.watermarks.pop(group_id, None)
+            return True
+
+        try:
+            found = await self._read_newest_members(group_id, set(group))
+        except Exception as e:
+            print(f"Erreur lors de la lecture des membres du groupe {group_id}: {e}")
+            found = set()
+
+        for user_id in found:
+            self.stats['detected_by_listing'] += 1
+            self._resolve(group_id, user_id)
+
+        # Users who joined before the listing window are only caught by an individual check
+        now = time.monotonic()
+        stale = [user_id for user_id, entry in group.items() if now - entry['last_checked'] >= GROUP_FALLBACK_AFTER]
+        if stale:
+            results = await asyncio.gather(*(self.client.is_user_in_group(user_id, group_id) for user_id in stale))
+            for user_id, is_member in zip(stale, results):
+                self.stats['fallback_checks'] += 1
+                if user_id not in group:
+                    continue
+                group[user_id]['last_checked'] = time.monotonic()
+                if is_member:
+                    self.stats['detected_by_fallback'] += 1
+                    self._resolve(group_id, user_id)
+
+        return False
+
+    def get_stats(self):
+        """Get group join detection statistics"""
+        return {
+            **self.stats,
+            'groups': len(self.waiters),
+            'awaited_users': sum(len(group) for group in self.waiters.values())
+        }
+
 
 class GroupJoinMonitor:
     def __init__(self, bot):
         self.bot = bot
         self.monitoring_tasks = {}
         self.client = RobloxClient()
+        self.detector = GroupJoinDetector(self.client)
 
     async def start_group_monitoring(self, channel, user, user_id, group_id, items_list, total_robux, roblox_username, ticket_system):
         """Start monitoring for group join"""
@@ -20,66 +138,41 @@ class GroupJoinMonitor:
         )
 
     async def _monitor_group_join(self, channel, user, user_id, group_id, items_list, total_robux, roblox_username, ticket_system):
-        """Monitor for user joining the group"""
+        """Wait for the detector to see the user join the group"""
         try:
-            while True:
-                await asyncio.sleep(10)  # Check every 10 seconds
-
-                if self.client.is_user_in_group(user_id, group_id):
-                    # User joined! Store join timestamp and show waiting period
-                    join_timestamp = int(time.time())
-                    end_timestamp = join_timestamp + (14 * 24 * 60 * 60)  # 14 days from join
-                    
-                    # Save join timestamp to ticket state
-                    ticket_system.save_ticket_state(channel.id, user.id, {
-                        'group_join_timestamp': join_timestamp,
-                        'group_cooldown_end': end_timestamp
-                    })
-
-                    waiting_embed = await ticket_system.create_waiting_period_embed(
-                        roblox_username, end_timestamp
-                    )
-
-                    # Import the view class
-                    from trading_ticket_system import WaitingPeriodView
-                    
-                    view = WaitingPeriodView(
-                        ticket_system, user, items_list, total_robux, roblox_username, user_id
-                    )
-
-                    await channel.send(embed=waiting_embed, view=view)
-                    break
+            await self.detector.wait_for_join(group_id, user_id)
 
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            print(f"Error monitoring group join: {e}")
+            # User joined! Store join timestamp and show waiting period
+            join_timestamp = int(time.time())
+            end_timestamp = join_timestamp + (14 * 24 * 60 * 60)  # 14 days from join
 
-    async def _setup_waiting_period(self, channel, user, items_list, total_robux, end_timestamp, ticket_system):
-        """Setup the 2-week waiting period"""
-        try:
-            current_time = int(time.time())
-            wait_time = end_timestamp - current_time
+            waiting_embed = await ticket_system.create_waiting_period_embed(
+                roblox_username, end_timestamp
+            )
 
-            # Wait for the specified duration
-            await asyncio.sleep(wait_time)
+            # Import the view class
+            from trading_ticket_system import WaitingPeriodView
 
-            # Send ready embed
-            ready_embed = await ticket_system.create_transaction_ready_embed(
-                items_list, total_robux
+            view = WaitingPeriodView(
+                ticket_system, user, items_list, total_robux, roblox_username, user_id, end_timestamp
             )
 
-            content = f"{user.mention} <@&1300798850788757564>"
-            await channel.send(content=content, embed=ready_embed)
+            message = await channel.send(embed=waiting_embed, view=view)
 
-            # Allow user to speak
-            overwrites = channel.overwrites
-            if user in overwrites:
-                overwrites[user].send_messages = True
-                await channel.edit(overwrites=overwrites)
+            # One state write, the end of the period is handled by the timer wheel
+            ticket_system.start_waiting_period(
+                channel, user, message, items_list, total_robux, roblox_username, user_id,
+                join_timestamp, end_timestamp
+            )
 
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            print(f"Error in waiting period setup: {e}")
+            print(f"Error monitoring group join: {e}")
+        finally:
+            task_key = f"{channel.id}_{user.id}"
+            if self.monitoring_tasks.get(task_key) is asyncio.current_task():
+                del self.monitoring_tasks[task_key]
 
     def cancel_monitoring(self, channel_id, user_id):
         """Cancel monitoring for a specific task"""
@@ -88,6 +181,11 @@ class GroupJoinMonitor:
             self.monitoring_tasks[task_key].cancel()
             del self.monitoring_tasks[task_key]
 
+    def cancel_ticket(self, channel_id):
+        """Cancel monitoring for every user of a ticket"""
+        for task_key in [key for key in self.monitoring_tasks if key.startswith(f"{channel_id}_")]:
+            self.monitoring_tasks.pop(task_key).cancel()
+
 # Global instance
 group_monitor = None
 
@@ -96,3 +194,6 @@ def setup_group_monitor(bot):
     global group_monitor
     group_monitor = GroupJoinMonitor(bot)
     return group_monitor
+
+metrics.gauge('group_join_awaited_users', "Users awaited by group join monitors").set_function(
+    lambda: group_monitor.detector.get_stats()['awaited_users'] if group_monitor else 0)
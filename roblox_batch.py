@@ -0,0 +1,82 @@
+import asyncio
+from roblox_ratelimit import PRIORITY_BACKGROUND
+
+DEFAULT_WINDOW = 0.005  # Seconds to wait for more keys before sending a batch
+DEFAULT_MAX_BATCH = 100
+
+
+class RequestCoalescer:
+    def __init__(self, name, fetch_batch, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        """fetch_batch(keys, priority) must return a dict of key -> value, missing keys resolve to None"""
+        self.name = name
+        self.fetch_batch = fetch_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = {}  # key -> future shared by every caller of that key
+        self.priority = PRIORITY_BACKGROUND
+        self.flush_handle = None
+        self.tasks = set()  # Batches in flight, referenced so the loop doesn't collect them
+        self.batches_sent = 0
+        self.keys_sent = 0
+
+    async def load(self, key, priority=PRIORITY_BACKGROUND):
+        """Queue a key for the next batch and wait for its value"""
+        future = self.pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending[key] = future
+
+        # The batch is sent with the most urgent priority of its callers
+        self.priority = min(self.priority, priority)
+
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+        # Shield so a cancelled caller doesn't cancel the result other callers wait on
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """Send every pending key as one batch"""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        if not self.pending:
+            return
+
+        batch = self.pending
+        priority = self.priority
+        self.pending = {}
+        self.priority = PRIORITY_BACKGROUND
+        task = asyncio.create_task(self._send(batch, priority))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, batch, priority):
+        """Run one batched request and fan the results out to the waiting callers"""
+        self.batches_sent += 1
+        self.keys_sent += len(batch)
+        try:
+            results = await self.fetch_batch(list(batch.keys()), priority)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark as retrieved, callers may all have been cancelled
+                    future.exception()
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def get_stats(self):
+        """Get batching statistics"""
+        return {
+            'pending': len(self.pending),
+            'batches_sent': self.batches_sent,
+            'keys_sent': self.keys_sent,
+            'average_batch_size': self.keys_sent / self.batches_sent if self.batches_sent else 0
+        }
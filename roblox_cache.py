@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+# Time to live (seconds) of each kind of cached Roblox data
+DEFAULT_TTLS = {
+    'user_id': 3600,              # username -> user ID
+    'user_details': 600,          # user ID -> name / displayName
+    'avatar': 300,                # user ID -> headshot URL
+    'primary_experience': 1800,   # user ID -> first public experience
+}
+
+# Time to live of "not found" results, kinds missing here are never negatively cached
+DEFAULT_NEGATIVE_TTLS = {
+    'user_id': 60,              # Unknown username
+    'avatar': 30,               # Thumbnail not generated yet
+    'primary_experience': 30,   # No public experience yet
+}
+
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class RobloxCache:
+    def __init__(self, ttls=None, negative_ttls=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.negative_ttls = dict(DEFAULT_NEGATIVE_TTLS)
+        if negative_ttls:
+            self.negative_ttls.update(negative_ttls)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (kind, key) -> (expires_at, value), least recently used first
+        self.in_flight = {}  # (kind, key) -> task shared by concurrent callers
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    async def get_or_fetch(self, kind, key, fetch):
+        """Return the cached value or run fetch() once for all concurrent callers"""
+        cache_key = (kind, key)
+        entry = self.entries.get(cache_key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self.entries.move_to_end(cache_key)
+                self.hits += 1
+                return value
+            del self.entries[cache_key]
+
+        task = self.in_flight.get(cache_key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self.in_flight[cache_key] = task
+            task.add_done_callback(lambda done: self._on_fetched(cache_key, done))
+
+        # Shield so a cancelled caller doesn't cancel the request other callers wait on
+        return await asyncio.shield(task)
+
+    def _on_fetched(self, cache_key, task):
+        """Store the result of a finished fetch"""
+        self.in_flight.pop(cache_key, None)
+        if task.cancelled() or task.exception() is not None:
+            # Errors are never cached
+            return
+        self.set(cache_key[0], cache_key[1], task.result())
+
+    def set(self, kind, key, value):
+        """Store a value with the TTL of its kind"""
+        if value is None:
+            ttl = self.negative_ttls.get(kind)
+            if ttl is None:
+                return
+        else:
+            ttl = self.ttls.get(kind, 60)
+
+        cache_key = (kind, key)
+        self.entries[cache_key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(cache_key)
+
+        # LRU eviction
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, kind, key):
+        """Remove a cached value"""
+        self.entries.pop((kind, key), None)
+
+    def clear(self):
+        """Remove every cached value"""
+        self.entries.clear()
+
+    def get_stats(self):
+        """Get cache statistics"""
+        return {
+            'entries': len(self.entries),
+            'in_flight': len(self.in_flight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared
+        }
+
+
+# Global instance shared by every Roblox client
+roblox_cache = RobloxCache()
@@ -2,6 +2,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from roblox_ratelimit import limited_request, PRIORITY_BACKGROUND
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -18,10 +19,16 @@ class GamePassLink:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
     
-    def get_user_experiences(self, user_id):
+    async def get_user_experiences(self, user_id, priority=PRIORITY_BACKGROUND):
         """Récupère les expériences d'un utilisateur"""
+        experiences = []
+        async for experience in self.iter_user_experiences(user_id, priority):
+            experiences.append(experience)
+        return experiences
+    
+    async def iter_user_experiences(self, user_id, priority=PRIORITY_BACKGROUND, page_size=50):
+        """Renvoie les expériences d'un utilisateur page par page, l'appelant peut s'arrêter au premier résultat"""
         try:
-            experiences = []
             cursor = ""
             
             while True:
@@ -29,18 +36,18 @@ class GamePassLink:
                 params = {
                     'accessFilter': 'Public',
                     'sortOrder': 'Asc',
-                    'limit': 50
+                    'limit': page_size
                 }
                 
                 if cursor:
                     params['cursor'] = cursor
                 
-                response = self.session.get(url, params=params)
+                response = await limited_request(self.session, 'games', 'GET', url, priority, params=params)
                 
                 if response.status_code == 200:
                     data = response.json()
-                    if data.get('data'):
-                        experiences.extend(data['data'])
+                    for experience in data.get('data') or []:
+                        yield experience
                     
                     if data.get('nextPageCursor'):
                         cursor = data['nextPageCursor']
@@ -49,17 +56,14 @@ class GamePassLink:
                 else:
                     print(f"Erreur API: {response.status_code}")
                     break
-            
-            return experiences
         except Exception as e:
             print(f"Erreur lors de la récupération des expériences: {e}")
-            return []
     
     def create_gamepass_link(self, experience_id):
         """Crée le lien pour créer un GamePass"""
         return f"https://create.roblox.com/dashboard/creations/experiences/{experience_id}/monetization/passes"
     
-    def get_game_passes(self, experience_id):
+    async def get_game_passes(self, experience_id, priority=PRIORITY_BACKGROUND):
         """Récupère tous les GamePass d'une expérience"""
         try:
             url = f'https://games.roblox.com/v1/games/{experience_id}/game-passes'
@@ -68,7 +72,7 @@ class GamePassLink:
                 'sortOrder': 'Desc'
             }
             
-            response = self.session.get(url, params=params)
+            response = await limited_request(self.session, 'games', 'GET', url, priority, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -80,7 +84,7 @@ class GamePassLink:
             print(f"Erreur lors de la récupération des GamePass: {e}")
             return []
     
-    def get_game_pass_details(self, gamepass_id):
+    async def get_game_pass_details(self, gamepass_id, priority=PRIORITY_BACKGROUND):
         """Récupère les détails d'un GamePass spécifique"""
         try:
             # Try the catalog API first
@@ -89,7 +93,7 @@ class GamePassLink:
                 'items': [{'itemType': 'GamePass', 'id': gamepass_id}]
             }
             
-            response = self.session.post(url, json=params)
+            response = await limited_request(self.session, 'catalog', 'POST', url, priority, json=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -99,7 +103,7 @@ class GamePassLink:
             # Fallback: try the marketplace API
             url = f'https://economy.roblox.com/v2/assets/{gamepass_id}/details'
             
-            response = self.session.get(url)
+            response = await limited_request(self.session, 'economy', 'GET', url, priority)
             
             if response.status_code == 200:
                 return response.json()
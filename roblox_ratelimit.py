@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import time
+import requests
+from dotenv import load_dotenv
+from metrics import record_http
+
+load_dotenv()
+
+# Priority lanes (lower value = served first)
+PRIORITY_INTERACTIVE = 0  # Modal / button lookups, a user is waiting on the answer
+PRIORITY_BACKGROUND = 1   # Monitoring polls
+
+# Requests per second and burst capacity for each Roblox endpoint family
+DEFAULT_RATES = {
+    'users': (3.0, 6),
+    'groups': (2.0, 4),
+    'games': (4.0, 8),
+    'thumbnails': (3.0, 6),
+    'economy': (1.0, 2),
+    'catalog': (1.0, 2),
+    'friends': (1.0, 2),
+}
+
+# Used when a 429 comes back without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+
+# Redirect every *.roblox.com API host to a stand-in server (see fake_api_server.py)
+API_BASE_OVERRIDE = os.getenv('ROBLOX_API_BASE')
+
+_sequence = itertools.count()
+
+
+class TokenBucket:
+    def __init__(self, name, rate, capacity):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiters = []  # heap of (priority, sequence, future)
+        self.dispatcher = None
+        self.throttled_count = 0
+
+    def _refill(self, now):
+        """Add the tokens earned since the last refill"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    async def acquire(self, priority=PRIORITY_BACKGROUND):
+        """Wait for a token, serving higher priority lanes first"""
+        now = time.monotonic()
+        self._refill(now)
+
+        # Fast path: nobody queued and a token is available
+        if not self.waiters and self.tokens >= 1 and now >= self.blocked_until:
+            self.tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(_sequence), future))
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        """Hand out tokens to queued waiters as they become available"""
+        while self.waiters:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            if self.tokens >= 1:
+                _, _, future = heapq.heappop(self.waiters)
+                if future.done():
+                    # Waiter was cancelled while queued
+                    continue
+                self.tokens -= 1
+                future.set_result(None)
+                continue
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_response(self, status_code, retry_after=None):
+        """Adapt the bucket rate from the status of a response"""
+        if status_code == 429:
+            now = time.monotonic()
+            delay = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+            self.blocked_until = max(self.blocked_until, now + delay)
+            self.tokens = 0.0
+            self.updated = now
+            # Multiplicative decrease, never below 10% of the configured rate
+            self.rate = max(self.base_rate * 0.1, self.rate / 2)
+            self.throttled_count += 1
+        elif status_code < 400 and self.rate < self.base_rate:
+            # Additive increase back towards the configured rate
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+    def get_stats(self):
+        """Get current bucket statistics"""
+        return {
+            'rate': self.rate,
+            'base_rate': self.base_rate,
+            'tokens': self.tokens,
+            'queued': len(self.waiters),
+            'blocked_for': max(0.0, self.blocked_until - time.monotonic()),
+            'throttled_count': self.throttled_count
+        }
+
+
+class RobloxRateLimiter:
+    def __init__(self, rates=None):
+        self.rates = dict(DEFAULT_RATES)
+        if rates:
+            self.rates.update(rates)
+        self.buckets = {}
+
+    def get_bucket(self, family):
+        """Get (or create) the token bucket of an endpoint family"""
+        if family not in self.buckets:
+            rate, capacity = self.rates.get(family, (1.0, 2))
+            self.buckets[family] = TokenBucket(family, rate, capacity)
+        return self.buckets[family]
+
+    async def acquire(self, family, priority=PRIORITY_BACKGROUND):
+        """Wait until a request to this endpoint family is allowed"""
+        await self.get_bucket(family).acquire(priority)
+
+    def feedback(self, family, response):
+        """Feed a response status and Retry-After header back into the bucket"""
+        retry_after = None
+        if response.status_code == 429:
+            header = response.headers.get('Retry-After')
+            try:
+                retry_after = float(header) if header is not None else None
+            except ValueError:
+                retry_after = None
+        self.get_bucket(family).on_response(response.status_code, retry_after)
+
+    def get_stats(self):
+        """Get statistics for every endpoint family"""
+        return {family: bucket.get_stats() for family, bucket in self.buckets.items()}
+
+
+def resolve_url(url):
+    """Rewrite https://<family>.roblox.com/... to <ROBLOX_API_BASE>/<family>/... when an override is set"""
+    if not API_BASE_OVERRIDE:
+        return url
+    match = re.match(r'^https://([a-z]+)\.roblox\.com(/.*)$', url)
+    if not match:
+        return url
+    return f"{API_BASE_OVERRIDE.rstrip('/')}/{match.group(1)}{match.group(2)}"
+
+
+async def limited_request(session, family, method, url, priority=PRIORITY_BACKGROUND, **kwargs):
+    """Send a request through the shared rate limiter without blocking the event loop"""
+    await rate_limiter.acquire(family, priority)
+    requester = session if session is not None else requests
+    started = time.perf_counter()
+    try:
+        response = await asyncio.to_thread(requester.request, method, resolve_url(url), **kwargs)
+    except Exception:
+        record_http(family, method, 'error', time.perf_counter() - started)
+        raise
+    record_http(family, method, response.status_code, time.perf_counter() - started)
+    rate_limiter.feedback(family, response)
+    return response
+
+
+# Global instance shared by every Roblox client
+rate_limiter = RobloxRateLimiter()
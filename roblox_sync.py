@@ -1,6 +1,10 @@
 import os
+import asyncio
 import requests
 from dotenv import load_dotenv
+from roblox_ratelimit import limited_request, PRIORITY_BACKGROUND
+from roblox_cache import roblox_cache
+from roblox_batch import RequestCoalescer
 
 # Load environment variables
 load_dotenv()
@@ -17,10 +21,10 @@ class RobloxClient:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
-    def get_user_info(self):
+    async def get_user_info(self, priority=PRIORITY_BACKGROUND):
         """Get authenticated user information"""
         try:
-            response = self.session.get('https://users.roblox.com/v1/users/authenticated')
+            response = await limited_request(self.session, 'users', 'GET', 'https://users.roblox.com/v1/users/authenticated', priority)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -30,86 +34,109 @@ class RobloxClient:
             print(f"Error: {e}")
             return None
 
-    def get_user_id_by_username(self, username):
+    async def get_user_id_by_username(self, username, priority=PRIORITY_BACKGROUND):
         """Get user ID by username"""
         try:
-            response = requests.post(
-                'https://users.roblox.com/v1/usernames/users',
-                json={'usernames': [username]},
-                headers={'Content-Type': 'application/json'}
+            # Usernames are case insensitive on Roblox
+            return await roblox_cache.get_or_fetch(
+                'user_id', username.lower(),
+                lambda: self._fetch_user_id_by_username(username, priority)
             )
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('data') and len(data['data']) > 0:
-                    return data['data'][0]['id']
-            return None
         except Exception as e:
             print(f"Error searching user: {e}")
             return None
 
-    def get_user_experiences(self, user_id):
+    async def _fetch_user_id_by_username(self, username, priority):
+        """Resolve a username, returns None if it doesn't exist and raises on API errors"""
+        # Lookups from every ticket are coalesced into one batched request
+        return await username_batcher.load(username.lower(), priority)
+
+    async def get_user_experiences(self, user_id, priority=PRIORITY_BACKGROUND):
         """Get all experiences created by a user"""
+        experiences = []
+        async for experience in self.iter_user_experiences(user_id, priority):
+            experiences.append(experience)
+        return experiences
+
+    async def iter_user_experiences(self, user_id, priority=PRIORITY_BACKGROUND, page_size=50):
+        """Yield the experiences created by a user, fetching one page at a time so callers can stop early"""
         try:
-            experiences = []
-            cursor = ""
+            async for experience in self._iter_experience_pages(user_id, priority, page_size):
+                yield experience
+        except Exception as e:
+            print(f"Error getting experiences: {e}")
 
-            while True:
-                url = f'https://games.roblox.com/v2/users/{user_id}/games'
-                params = {
-                    'accessFilter': 'Public',
-                    'sortOrder': 'Asc',
-                    'limit': 50
-                }
+    async def _iter_experience_pages(self, user_id, priority, page_size):
+        """Yield the experiences of a user page by page, raises on API errors"""
+        cursor = ""
 
-                if cursor:
-                    params['cursor'] = cursor
+        while True:
+            url = f'https://games.roblox.com/v2/users/{user_id}/games'
+            params = {
+                'accessFilter': 'Public',
+                'sortOrder': 'Asc',
+                'limit': page_size
+            }
 
-                response = self.session.get(url, params=params)
+            if cursor:
+                params['cursor'] = cursor
 
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                    except ValueError:
-                        print("Error: Invalid API response (not JSON)")
-                        break
-
-                    # Check if data exists and contains data
-                    if data and isinstance(data, dict):
-                        if data.get('data') and isinstance(data['data'], list):
-                            experiences.extend(data['data'])
-
-                        # Check if there are more pages
-                        if data.get('nextPageCursor'):
-                            cursor = data['nextPageCursor']
-                        else:
-                            break
-                    else:
-                        print("Unexpected data structure from API")
-                        break
-
-                elif response.status_code == 401:
-                    print("Authentication error - Invalid or expired cookie")
-                    break
-                elif response.status_code == 403:
-                    print("Access denied - Insufficient permissions")
-                    break
-                else:
-                    print(f"API Error: {response.status_code} - {response.text[:100]}")
-                    break
-
-            return experiences
+            response = await limited_request(self.session, 'games', 'GET', url, priority, params=params)
+
+            if response.status_code == 401:
+                raise PermissionError("Authentication error - Invalid or expired cookie")
+            elif response.status_code == 403:
+                raise PermissionError("Access denied - Insufficient permissions")
+            elif response.status_code != 200:
+                raise RuntimeError(f"API Error: {response.status_code} - {response.text[:100]}")
+
+            try:
+                data = response.json()
+            except ValueError:
+                raise ValueError("Invalid API response (not JSON)")
+
+            # Check if data exists and contains data
+            if not data or not isinstance(data, dict):
+                raise ValueError("Unexpected data structure from API")
+
+            if data.get('data') and isinstance(data['data'], list):
+                for experience in data['data']:
+                    yield experience
+
+            # Check if there are more pages
+            if data.get('nextPageCursor'):
+                cursor = data['nextPageCursor']
+            else:
+                break
+
+    async def get_primary_experience(self, user_id, priority=PRIORITY_BACKGROUND):
+        """Get the first public experience of a user, the one used for GamePass creation"""
+        try:
+            return await roblox_cache.get_or_fetch(
+                'primary_experience', user_id,
+                lambda: self._fetch_primary_experience(user_id, priority)
+            )
         except Exception as e:
-            print(f"Error getting experiences: {e}")
-            return []
+            print(f"Error getting primary experience: {e}")
+            return None
+
+    async def _fetch_primary_experience(self, user_id, priority):
+        """Fetch only the first page of experiences and stop at the first one"""
+        pages = self._iter_experience_pages(user_id, priority, page_size=10)
+        try:
+            async for experience in pages:
+                return experience
+            return None
+        finally:
+            await pages.aclose()
 
-    def get_robux_balance(self):
+    async def get_robux_balance(self, priority=PRIORITY_BACKGROUND):
         """Get Robux balance"""
         try:
-            user_info = self.get_user_info()
+            user_info = await self.get_user_info(priority)
             if user_info and 'id' in user_info:
                 user_id = user_info['id']
-                response = self.session.get(f'https://economy.roblox.com/v1/users/{user_id}/currency')
+                response = await limited_request(self.session, 'economy', 'GET', f'https://economy.roblox.com/v1/users/{user_id}/currency', priority)
                 if response.status_code == 200:
                     return response.json().get('robux', 0)
             return None
@@ -117,13 +144,13 @@ class RobloxClient:
             print(f"Error getting balance: {e}")
             return None
 
-    def get_friends_count(self):
+    async def get_friends_count(self, priority=PRIORITY_BACKGROUND):
         """Get friends count"""
         try:
-            user_info = self.get_user_info()
+            user_info = await self.get_user_info(priority)
             if user_info and 'id' in user_info:
                 user_id = user_info['id']
-                response = self.session.get(f'https://friends.roblox.com/v1/users/{user_id}/friends/count')
+                response = await limited_request(self.session, 'friends', 'GET', f'https://friends.roblox.com/v1/users/{user_id}/friends/count', priority)
                 if response.status_code == 200:
                     return response.json().get('count', 0)
             return None
@@ -131,31 +158,15 @@ class RobloxClient:
             print(f"Error getting friends count: {e}")
             return None
 
-    def get_user_avatar(self, user_id):
+    async def get_user_avatar(self, user_id, priority=PRIORITY_BACKGROUND):
         """Get user avatar URL"""
         try:
-            # Get avatar thumbnail with proper headers
-            url = f"https://thumbnails.roblox.com/v1/users/avatar-headshot"
-            params = {
-                'userIds': str(user_id),
-                'size': '420x420',
-                'format': 'Png',
-                'isCircular': 'false'
-            }
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
-
-            data = response.json()
-            if data.get('data') and len(data['data']) > 0:
-                image_url = data['data'][0].get('imageUrl')
-                # Ensure the URL is valid and accessible
-                if image_url and image_url.startswith('https://'):
-                    return image_url
+            image_url = await roblox_cache.get_or_fetch(
+                'avatar', user_id,
+                lambda: self._fetch_user_avatar(user_id, priority)
+            )
+            if image_url:
+                return image_url
 
             # Fallback to default Roblox avatar if no custom avatar
             return f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=420&height=420&format=png"
@@ -165,12 +176,17 @@ class RobloxClient:
             # Return fallback URL on error
             return f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=420&height=420&format=png"
 
-    def is_user_in_group(self, user_id, group_id):
+    async def _fetch_user_avatar(self, user_id, priority):
+        """Fetch the headshot URL of a user, returns None if there is no usable thumbnail"""
+        # Lookups from every ticket are coalesced into one batched request
+        return await avatar_batcher.load(int(user_id), priority)
+
+    async def is_user_in_group(self, user_id, group_id, priority=PRIORITY_BACKGROUND):
         """Check if user is in a specific group"""
         try:
             url = f"https://groups.roblox.com/v2/users/{user_id}/groups/roles"
 
-            response = requests.get(url)
+            response = await limited_request(None, 'groups', 'GET', url, priority)
             response.raise_for_status()
 
             data = response.json()
@@ -186,35 +202,114 @@ class RobloxClient:
             print(f"Erreur lors de la vérification du groupe: {e}")
             return False
 
-    def get_user_details(self, user_id):
-        """Get detailed user information"""
-        try:
-            url = f"https://users.roblox.com/v1/users/{user_id}"
+    async def get_group_members(self, group_id, limit=100, cursor=None, priority=PRIORITY_BACKGROUND):
+        """Get one page of group members, newest first, returns (user IDs, next page cursor) and raises on API errors"""
+        url = f"https://groups.roblox.com/v1/groups/{group_id}/users"
+        params = {
+            'limit': limit,
+            'sortOrder': 'Desc'
+        }
 
-            response = requests.get(url)
-            response.raise_for_status()
+        if cursor:
+            params['cursor'] = cursor
+
+        response = await limited_request(None, 'groups', 'GET', url, priority, params=params)
+        response.raise_for_status()
+
+        data = response.json()
+        user_ids = [member['user']['userId'] for member in data.get('data', [])
+                    if member.get('user', {}).get('userId')]
+        return user_ids, data.get('nextPageCursor')
 
-            return response.json()
+    async def get_user_details(self, user_id, priority=PRIORITY_BACKGROUND):
+        """Get detailed user information"""
+        try:
+            return await roblox_cache.get_or_fetch(
+                'user_details', user_id,
+                lambda: self._fetch_user_details(user_id, priority)
+            )
 
         except Exception as e:
             print(f"Erreur lors de la récupération des détails utilisateur: {e}")
             return {}
 
+    async def _fetch_user_details(self, user_id, priority):
+        """Fetch detailed user information, raises on API errors"""
+        url = f"https://users.roblox.com/v1/users/{user_id}"
+
+        response = await limited_request(None, 'users', 'GET', url, priority)
+        response.raise_for_status()
+
+        return response.json()
+
+
+async def fetch_user_ids_batch(usernames, priority=PRIORITY_BACKGROUND):
+    """Resolve several usernames in one request, returns a dict of lowercase username -> user ID"""
+    response = await limited_request(
+        None, 'users', 'POST',
+        'https://users.roblox.com/v1/usernames/users',
+        priority,
+        json={'usernames': usernames, 'excludeBannedUsers': False},
+        headers={'Content-Type': 'application/json'}
+    )
+    response.raise_for_status()
+
+    user_ids = {}
+    for user in response.json().get('data', []):
+        requested = user.get('requestedUsername') or user.get('name')
+        if requested and user.get('id'):
+            user_ids[requested.lower()] = user['id']
+    return user_ids
+
+
+async def fetch_user_avatars_batch(user_ids, priority=PRIORITY_BACKGROUND):
+    """Fetch the headshots of several users in one request, returns a dict of user ID -> image URL"""
+    url = "https://thumbnails.roblox.com/v1/users/avatar-headshot"
+    params = {
+        'userIds': ",".join(str(user_id) for user_id in user_ids),
+        'size': '420x420',
+        'format': 'Png',
+        'isCircular': 'false'
+    }
+
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+
+    response = await limited_request(None, 'thumbnails', 'GET', url, priority, params=params, headers=headers)
+    response.raise_for_status()
+
+    avatars = {}
+    for thumbnail in response.json().get('data', []):
+        image_url = thumbnail.get('imageUrl')
+        # Ensure the URL is valid and accessible
+        if thumbnail.get('targetId') and image_url and image_url.startswith('https://'):
+            avatars[thumbnail['targetId']] = image_url
+    return avatars
+
+
+# Batching window in milliseconds, configurable from .env
+BATCH_WINDOW = float(os.getenv('ROBLOX_BATCH_WINDOW_MS', '5')) / 1000
+
+# Global coalescers shared by every RobloxClient
+username_batcher = RequestCoalescer('usernames', fetch_user_ids_batch, window=BATCH_WINDOW)
+avatar_batcher = RequestCoalescer('avatars', fetch_user_avatars_batch, window=BATCH_WINDOW)
+
 
-def main():
+async def main():
     try:
         # Create Roblox client instance
         client = RobloxClient()
 
         # Get user information
-        user_info = client.get_user_info()
+        user_info = await client.get_user_info()
 
         if user_info:
             print("✅ Connected to Roblox!")
             print(f"👤 Username: {user_info.get('name', 'Unknown')}")
 
             # Get Robux balance
-            robux = client.get_robux_balance()
+            robux = await client.get_robux_balance()
             if robux is not None:
                 print(f"💰 Robux Balance: {robux}")
 
@@ -228,4 +323,4 @@ def main():
         print(f"❌ Unexpected error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
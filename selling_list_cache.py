@@ -0,0 +1,150 @@
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from metrics import metrics
+
+# Rendered selling lists kept in memory, least recently used dropped first
+RENDER_CACHE_SIZE = 256
+
+_MASK = (1 << 64) - 1
+_ORDER_PRIME = 1099511628211
+
+render_hits = metrics.counter('selling_list_render_hits_total', "Selling list embeds served from the render cache")
+render_misses = metrics.counter('selling_list_render_misses_total', "Selling list embeds rendered from their groups")
+
+
+def group_key(item):
+    """Display name of an item row - don't show (HyperChrome) for hyperchromes, always show status"""
+    if item['type'] == 'HyperChrome':
+        return f"{item['name']} ({item['status']})"
+    return f"{item['name']} ({item['type']}) ({item['status']})"
+
+
+@lru_cache(maxsize=4096)
+def _stable_hash(*parts):
+    """64-bit hash that stays the same between restarts (unlike hash() on str)"""
+    data = "\x1f".join(str(part) for part in parts).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+class GroupedSellingList:
+    """Items of a selling list grouped by display name, updated one item at a time"""
+
+    def __init__(self, items_list=None):
+        self.items_list = items_list  # List the groups were built from
+        self.groups = {}  # display name -> {'quantity', 'total_value'}, in order of first appearance
+        self.entries = 0  # Entries of items_list covered by the groups
+        self.total_value = 0
+        self.items_hash = 0  # Sum of item hashes weighted by quantity, order independent
+        self.order_hash = 0  # Rolling hash of the group order
+        self.robux = {}  # display name -> Robux price at robux_rate
+        self.robux_rate = None
+        self.quote = None  # Latest PriceQuote of these groups
+        for item in items_list or []:
+            self.add(item)
+
+    def matches(self, items_list):
+        """Whether the groups still describe this list (same list object, same number of entries)"""
+        return self.items_list is items_list and self.entries == len(items_list)
+
+    def _change(self, item, quantity):
+        key = group_key(item)
+        value = item['value'] * quantity
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {'quantity': 0, 'total_value': 0}
+            self.order_hash = (self.order_hash * _ORDER_PRIME + _stable_hash(key)) & _MASK
+
+        group['quantity'] += quantity
+        group['total_value'] += value
+        self.total_value += value
+        item_hash = _stable_hash(item['name'], item['type'], item['status'], item['value'])
+        self.items_hash = (self.items_hash + item_hash * quantity) & _MASK
+        self.robux.pop(key, None)
+
+        if group['quantity'] <= 0:
+            del self.groups[key]
+            self._rehash_order()
+
+    def _rehash_order(self):
+        # Groups were removed or reordered, the rolling hash has to start over
+        self.order_hash = 0
+        for key in self.groups:
+            self.order_hash = (self.order_hash * _ORDER_PRIME + _stable_hash(key)) & _MASK
+
+    def add(self, item):
+        """Account for an entry appended to the list"""
+        self._change(item, item['quantity'])
+        self.entries += 1
+
+    def remove(self, item, quantity, dropped=False):
+        """Account for quantity taken off an existing entry, dropped if the entry was popped from the list"""
+        self._change(item, -quantity)
+        if not dropped:
+            return
+        self.entries -= 1
+
+        key = group_key(item)
+        if key in self.groups and self.items_list is not None:
+            # The group now first appears at a later entry, follow the list order again
+            order = {}
+            for entry in self.items_list:
+                order.setdefault(group_key(entry), len(order))
+            self.groups = dict(sorted(self.groups.items(), key=lambda group: order.get(group[0], len(order))))
+            self._rehash_order()
+
+    @property
+    def digest(self):
+        return (self.items_hash, self.order_hash)
+
+    def group_robux(self, key, rate):
+        """Robux price of a group at a rate, only changed groups are priced again"""
+        if rate != self.robux_rate:
+            self.robux.clear()
+            self.robux_rate = rate
+        robux = self.robux.get(key)
+        if robux is None:
+            robux = self.robux[key] = int(self.groups[key]['total_value'] / 1_000_000 * rate)
+        return robux
+
+
+class SellingListRenderCache:
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (digest, rate) -> (items, quantities, prices) column texts
+
+    def columns(self, quote):
+        """Item, quantity and price column texts of a priced list, total row included"""
+        cache_key = (quote.digest, quote.rate)
+        columns = self.entries.get(cache_key)
+        if columns is not None:
+            self.entries.move_to_end(cache_key)
+            render_hits.inc()
+            return columns
+
+        render_misses.inc()
+        items_column = []
+        quantities_column = []
+        prices_column = []
+        for key, quantity, robux in quote.lines:
+            items_column.append(key)
+            quantities_column.append(str(quantity))
+            prices_column.append(f"{robux:,} <:RobuxLOGO:1410727587134701639>")
+
+        items_column.append("**TOTAL**")
+        quantities_column.append("---")
+        prices_column.append(f"**{quote.total_robux:,} <:RobuxLOGO:1410727587134701639> (Incl. Tax)**")
+
+        columns = ("\n".join(items_column), "\n".join(quantities_column), "\n".join(prices_column))
+        self.entries[cache_key] = columns
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return columns
+
+    def get_stats(self):
+        """Get render cache statistics"""
+        return {
+            'entries': len(self.entries),
+            'hits': render_hits.total(),
+            'misses': render_misses.total()
+        }
@@ -4,6 +4,11 @@ import json
 import asyncio
 from datetime import datetime
 import re
+from message_edit_queue import message_edit_queue
+from learned_aliases import learned_aliases
+
+# Items accepted in one bulk paste
+MAX_BULK_ITEMS = 25
 
 class SellingTicketSystem:
     def __init__(self, bot, trading_system):
@@ -45,7 +50,8 @@ class SellingTicketSystem:
         # Send ticket settings embed
         settings_embed = await self.create_ticket_settings_embed()
         settings_view = TicketSettingsView(self.trading_system, user_id)
-        await interaction.followup.send(embed=settings_embed, view=settings_view)
+        settings_message = await interaction.followup.send(embed=settings_embed, view=settings_view, wait=True)
+        self.trading_system.set_control_message_id(interaction.channel.id, 'settings', settings_message.id)
 
         # Notify support team
         support_roles = self.trading_system.get_support_roles(interaction.guild)
@@ -75,6 +81,16 @@ class SellingFormView(discord.ui.View):
         add_button.callback = self.handle_add_item
         self.add_item(add_button)
 
+        # Paste a whole list at once
+        bulk_button = discord.ui.Button(
+            label='Bulk Add',
+            style=discord.ButtonStyle.success,
+            emoji='<:CreateLOGO:1390385790726570130>',
+            custom_id='selling_bulk_add_persistent'
+        )
+        bulk_button.callback = self.handle_bulk_add
+        self.add_item(bulk_button)
+
         # Show Remove Item button only if there are items
         if self.items_list:
             remove_button = discord.ui.Button(
@@ -128,6 +144,24 @@ class SellingFormView(discord.ui.View):
         modal = ItemModal(self, "add")
         await interaction.response.send_modal(modal)
 
+    async def handle_bulk_add(self, interaction: discord.Interaction):
+        # Get user_id from ticket state since we can't store it in custom_id
+        state = self.ticket_system.get_ticket_state(interaction.channel.id)
+        if not state:
+            await interaction.response.send_message("This ticket is no longer valid!", ephemeral=True)
+            return
+
+        # Check if user is the ticket creator
+        if interaction.user.id != state.get('user_id'):
+            await interaction.response.send_message("Only the ticket creator can use this button!", ephemeral=True)
+            return
+
+        # Update items_list from state before opening modal
+        self.items_list = state.get('items_list', [])
+
+        modal = BulkItemModal(self)
+        await interaction.response.send_modal(modal)
+
     async def handle_remove_item(self, interaction: discord.Interaction):
         # Get user_id from ticket state since we can't store it in custom_id
         state = self.ticket_system.get_ticket_state(interaction.channel.id)
@@ -169,7 +203,7 @@ class SellingFormView(discord.ui.View):
         })
 
         # Go to payment method selection
-        payment_embed = await self.ticket_system.create_payment_method_embed(interaction.user, items_list)
+        payment_embed = await self.ticket_system.create_payment_method_embed(interaction.user, items_list, interaction.channel.id)
         view = PaymentMethodView(self.ticket_system, user_id, items_list)
         await interaction.response.edit_message(embed=payment_embed, view=view)
 
@@ -200,6 +234,110 @@ class SellingFormView(discord.ui.View):
         view = TicketOptionsView(self.ticket_system, user_id)
         await interaction.response.edit_message(embed=options_embed, view=view)
 
+def resolve_selling_item(ticket_system, item_input, status, quantity):
+    """Match, validate and price one item of a selling list, returns (item_entry, spelling, error)"""
+    # Use the neutral item matching system from ticket_system
+    best_match, error_message = ticket_system.find_best_item_match(item_input)
+
+    if not best_match:
+        return None, None, ("<:ErrorLOGO:1387810170155040888> Item Not Found", error_message)
+
+    item_name, item_data = best_match[0], best_match[1]
+    parsed_item = ticket_system.parse_item_with_hyperchrome(item_input)
+
+    # Determine clean item name
+    if parsed_item.get('is_hyperchrome', False):
+        clean_item_name = parsed_item['name']
+    else:
+        clean_item_name = item_name.split('(')[0].strip()
+
+    # Validate item requirements
+    is_valid, validation_error = ticket_system.validate_item_requirements(
+        item_name, item_data, clean_item_name
+    )
+
+    if not is_valid:
+        return None, None, ("<:ErrorLOGO:1387810170155040888> Item Rejected", validation_error)
+
+    # Handle hyperchrome data setup
+    if parsed_item.get('is_hyperchrome', False):
+        # Get the actual API data for the detected hyperchrome
+        stockage_system = ticket_system.get_stockage_system()
+        api_name = parsed_item.get('api_name')
+        if api_name and api_name in stockage_system.api_data:
+            item_data = stockage_system.api_data[api_name]
+            item_name = api_name  # Use the full API name for internal processing
+        clean_item_name = parsed_item['name']  # But use the clean name for display
+    else:
+        clean_item_name = item_name.split('(')[0].strip()
+
+        # Get item type from the full name
+        import re
+        type_match = re.search(r'\(([^)]*)\)', item_name)
+        final_item_type = type_match.group(1) if type_match else "Unknown"
+
+    # Get value based on status (case insensitive comparison)
+    if status.lower() == "clean":
+        value_key = 'Cash Value'
+    else:  # dupe
+        value_key = 'Duped Value'
+
+    value_str = item_data.get(value_key, 'N/A')
+
+    if value_str == 'N/A' or not value_str or value_str == "N/A":
+        # For hyperchromes, show the clean name in error message
+        display_name_for_error = clean_item_name if parsed_item.get('is_hyperchrome', False) else item_name
+        return None, None, ("Value Not Available", f"No {status} value available for '{display_name_for_error}'!")
+
+    # Check if item is worth less than 2.5M
+    try:
+        if isinstance(value_str, str):
+            # Remove all types of spaces (normal, Unicode, etc.) and commas
+            import re
+            clean_value_str = re.sub(r'[\s,\u00A0\u2000-\u200B\u202F\u205F\u3000]+', '', value_str)
+            if clean_value_str.lower() in ['n/a', 'unknown', '']:
+                value = 0
+            else:
+                value = int(clean_value_str)
+        elif isinstance(value_str, (int, float)):
+            value = int(value_str)
+        else:
+            raise ValueError(f"Unsupported value type: {type(value_str)}")
+    except (ValueError, TypeError) as e:
+        return None, None, ("Invalid Value", f"Invalid {status} value for '{item_name}': {value_str}")
+
+    if value < 2_500_000:
+        return None, None, ("Item Information", "This item cannot be added because it is worth less than 2.5M or it is obtainable.")
+
+    # Determine the correct name and type for the item entry
+    if parsed_item.get('is_hyperchrome', False):
+        # For hyperchromes, use the clean name (without (HyperChrome) and without year)
+        clean_name = parsed_item['name']
+        # Remove year from display name (e.g., "HyperShift 2023" → "HyperShift")
+        import re
+        clean_name = re.sub(r'\s+\d{4}$', '', clean_name).strip()
+        final_item_type = "HyperChrome"
+    else:
+        # For regular items, clean the name and extract type
+        import re
+        clean_name = re.sub(r'\s*\([^)]*\)$', '', item_name).strip()
+
+        # Get item type from the full name
+        type_match = re.search(r'\(([^)]*)\)', item_name)
+        final_item_type = type_match.group(1) if type_match else "Unknown"
+
+    item_entry = {
+        'name': clean_name,
+        'quantity': quantity,
+        'status': status.capitalize(),
+        'value': value,
+        'type': final_item_type
+    }
+
+    # Spelling the item was searched under, hyperchrome aliases are already exact
+    spelling = None if parsed_item.get('is_hyperchrome', False) else parsed_item['name']
+    return item_entry, spelling, None
+
 class ItemModal(discord.ui.Modal):
     def __init__(self, parent_view, action):
         self.parent_view = parent_view
@@ -276,142 +414,34 @@ class ItemModal(discord.ui.Modal):
             await interaction.followup.send(embed=error_embed, ephemeral=True)
             return
 
-        # Use the neutral item matching system from ticket_system
-        best_match, error_message = self.parent_view.ticket_system.find_best_item_match(self.item_name.value.strip())
-
-        if not best_match:
-            error_embed = await self.parent_view.ticket_system.create_error_embed(
-                "<:ErrorLOGO:1387810170155040888> Item Not Found",
-                error_message
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
-            return
-
-        item_name, item_data = best_match[0], best_match[1]
-        parsed_item = self.parent_view.ticket_system.parse_item_with_hyperchrome(self.item_name.value.strip())
-
-        # Determine clean item name
-        if parsed_item.get('is_hyperchrome', False):
-            clean_item_name = parsed_item['name']
-        else:
-            clean_item_name = item_name.split('(')[0].strip()
-
-        # Validate item requirements
-        is_valid, validation_error = self.parent_view.ticket_system.validate_item_requirements(
-            item_name, item_data, clean_item_name
+        # Match, validate and price the item
+        item_entry, spelling, error = resolve_selling_item(
+            self.parent_view.ticket_system, self.item_name.value.strip(), status, quantity
         )
-
-        if not is_valid:
-            error_embed = await self.parent_view.ticket_system.create_error_embed(
-                "<:ErrorLOGO:1387810170155040888> Item Rejected",
-                validation_error
-            )
+        if error:
+            error_embed = await self.parent_view.ticket_system.create_error_embed(*error)
             await interaction.followup.send(embed=error_embed, ephemeral=True)
             return
 
-        # Handle hyperchrome data setup
-        if parsed_item.get('is_hyperchrome', False):
-            # Get the actual API data for the detected hyperchrome
-            from stockage_system import StockageSystem
-            stockage_system = StockageSystem()
-            api_name = parsed_item.get('api_name')
-            if api_name and api_name in stockage_system.api_data:
-                item_data = stockage_system.api_data[api_name]
-                item_name = api_name  # Use the full API name for internal processing
-            clean_item_name = parsed_item['name']  # But use the clean name for display
-        else:
-            clean_item_name = item_name.split('(')[0].strip()
-
-            # Get item type from the full name
-            import re
-            type_match = re.search(r'\(([^)]*)\)', item_name)
-            final_item_type = type_match.group(1) if type_match else "Unknown"
-
-        # Get value based on status (case insensitive comparison)
-        if status.lower() == "clean":
-            value_key = 'Cash Value'
-        else:  # dupe
-            value_key = 'Duped Value'
-
-        value_str = item_data.get(value_key, 'N/A')
-
-        if value_str == 'N/A' or not value_str or value_str == "N/A":
-            # For hyperchromes, show the clean name in error message
-            display_name_for_error = clean_item_name if parsed_item.get('is_hyperchrome', False) else item_name
-            error_embed = await self.parent_view.ticket_system.create_error_embed(
-                "Value Not Available",
-                f"No {status} value available for '{display_name_for_error}'!"
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
-            return
-
-        # Check if item is worth less than 2.5M
-        try:
-            if isinstance(value_str, str):
-                # Remove all types of spaces (normal, Unicode, etc.) and commas
-                import re
-                clean_value_str = re.sub(r'[\s,\u00A0\u2000-\u200B\u202F\u205F\u3000]+', '', value_str)
-                if clean_value_str.lower() in ['n/a', 'unknown', '']:
-                    value = 0
-                else:
-                    value = int(clean_value_str)
-            elif isinstance(value_str, (int, float)):
-                value = int(value_str)
-            else:
-                raise ValueError(f"Unsupported value type: {type(value_str)}")
-        except (ValueError, TypeError) as e:
-            error_embed = await self.parent_view.ticket_system.create_error_embed(
-                "Invalid Value",
-                f"Invalid {status} value for '{item_name}': {value_str}"
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
-            return
-
-        if value < 2_500_000:
-            error_embed = await self.parent_view.ticket_system.create_error_embed(
-                "Item Information",
-                "This item cannot be added because it is worth less than 2.5M or it is obtainable."
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
-            return
-
-        # Determine the correct name and type for the item entry
-        if parsed_item.get('is_hyperchrome', False):
-            # For hyperchromes, use the clean name (without (HyperChrome) and without year)
-            clean_name = parsed_item['name']
-            # Remove year from display name (e.g., "HyperShift 2023" → "HyperShift")
-            import re
-            clean_name = re.sub(r'\s+\d{4}$', '', clean_name).strip()
-            final_item_type = "HyperChrome"
-        else:
-            # For regular items, clean the name and extract type
-            import re
-            clean_name = re.sub(r'\s*\([^)]*\)$', '', item_name).strip()
-
-            # Get item type from the full name
-            type_match = re.search(r'\(([^)]*)\)', item_name)
-            final_item_type = type_match.group(1) if type_match else "Unknown"
-
-        item_entry = {
-            'name': clean_name,
-            'quantity': quantity,
-            'status': status.capitalize(),
-            'value': value,
-            'type': final_item_type
-        }
+        # Groups of the list follow each change so the embed doesn't regroup the whole list
+        grouped = self.parent_view.ticket_system.get_selling_groups(interaction.channel.id, self.parent_view.items_list)
 
         if self.action == "add":
             self.parent_view.items_list.append(item_entry)
+            grouped.add(item_entry)
             action_text = "added to"
+            # Remember which item this spelling meant, the type was picked by priority so only the name is learned
+            if spelling:
+                learned_aliases.confirm_name(spelling, item_entry['name'])
         else:  # remove
             # Check if item is in exceptions list (protected items)
             exceptions = self.parent_view.ticket_system.data.get('exceptions', [])
-            full_item_name = f"{clean_name} ({final_item_type})"
+            full_item_name = f"{item_entry['name']} ({item_entry['type']})"
 
             if full_item_name in exceptions:
                 error_embed = await self.parent_view.ticket_system.create_error_embed(
                     "<:ErrorLOGO:1387810170155040888> Protected Item",
-                    f"The **{clean_name}** is a protected item and cannot be removed from your list!"
+                    f"The **{item_entry['name']}** is a protected item and cannot be removed from your list!"
                 )
                 await interaction.followup.send(embed=error_embed, ephemeral=True)
                 return
@@ -423,10 +453,12 @@ class ItemModal(discord.ui.Modal):
                     existing_item['type'] == item_entry['type']):
                     if existing_item['quantity'] > quantity:
                         existing_item['quantity'] -= quantity
+                        grouped.remove(existing_item, quantity)
                         removed = True
                         break
                     elif existing_item['quantity'] == quantity:
                         self.parent_view.items_list.pop(i)
+                        grouped.remove(existing_item, quantity, dropped=True)
                         removed = True
                         break
                     else:
@@ -458,10 +490,16 @@ class ItemModal(discord.ui.Modal):
         # Update the embed
         new_embed = await self.parent_view.ticket_system.create_selling_list_embed(
             interaction.user,
-            self.parent_view.items_list
+            self.parent_view.items_list,
+            interaction.channel.id
         )
 
-        await interaction.edit_original_response(embed=new_embed, view=self.parent_view)
+        # Rapid adds/removes on the same list only send the latest embed
+        message_key = interaction.message.id if interaction.message else interaction.id
+        message_edit_queue.submit(
+            message_key, interaction.channel.id,
+            lambda: interaction.edit_original_response(embed=new_embed, view=self.parent_view)
+        )
 
         success_embed = await self.parent_view.ticket_system.create_error_embed(
             "<:SucessLOGO:1387810153864368218> Item Added",
@@ -470,6 +508,115 @@ class ItemModal(discord.ui.Modal):
         success_embed.color = 0x00ff00  # Green color for success
         await interaction.followup.send(embed=success_embed, ephemeral=True)
 
+def parse_bulk_items(stockage_system, text):
+    """Split a pasted list like /add_stock does: [(raw text, item name, quantity, status)]"""
+    parsed = []
+    for line in text.splitlines():
+        for raw_item in stockage_system.extract_separators(line):
+            quantity, remaining_text = stockage_system.extract_quantity(raw_item)
+            status, remaining_text = stockage_system.extract_status(remaining_text)
+            item_name = " ".join(remaining_text.split())
+            if item_name:
+                parsed.append((raw_item, item_name, quantity, status.lower()))
+    return parsed
+
+class BulkItemModal(discord.ui.Modal):
+    def __init__(self, parent_view):
+        self.parent_view = parent_view
+        super().__init__(title="Bulk Add Items")
+
+        self.items = discord.ui.TextInput(
+            label="Items",
+            style=discord.TextStyle.paragraph,
+            placeholder="torpedo x2, hyper shift dupe, brulee",
+            required=True,
+            max_length=2000
+        )
+        self.add_item(self.items)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            await interaction.response.defer()
+        except discord.NotFound:
+            # Interaction has expired
+            try:
+                await interaction.followup.send("Interaction expired. Please try again.", ephemeral=True)
+            except:
+                pass
+            return
+        except Exception as e:
+            print(f"Error deferring modal interaction: {e}")
+            return
+
+        ticket_system = self.parent_view.ticket_system
+        lines = parse_bulk_items(ticket_system.get_stockage_system(), self.items.value)
+
+        if not lines:
+            error_embed = await ticket_system.create_error_embed(
+                "<:ErrorLOGO:1387810170155040888> Item Not Found",
+                "No items found in your list!"
+            )
+            await interaction.followup.send(embed=error_embed, ephemeral=True)
+            return
+
+        if len(lines) > MAX_BULK_ITEMS:
+            error_embed = await ticket_system.create_error_embed(
+                "Too Many Items",
+                f"You can add up to {MAX_BULK_ITEMS} items at once, your list has {len(lines)}!"
+            )
+            await interaction.followup.send(embed=error_embed, ephemeral=True)
+            return
+
+        # Match and validate every line before touching the list
+        added = []
+        errors = []
+        for raw_item, item_input, quantity, status in lines:
+            item_entry, spelling, error = resolve_selling_item(ticket_system, item_input, status, quantity)
+            if error:
+                errors.append(f"❌ {raw_item}: {error[1]}")
+            else:
+                added.append(item_entry)
+                if spelling:
+                    learned_aliases.confirm_name(spelling, item_entry['name'])
+
+        if added:
+            grouped = ticket_system.get_selling_groups(interaction.channel.id, self.parent_view.items_list)
+            for item_entry in added:
+                self.parent_view.items_list.append(item_entry)
+                grouped.add(item_entry)
+
+            # One state write and one embed update for the whole list
+            ticket_system.save_ticket_state(interaction.channel.id, self.parent_view.user_id, {
+                'items_list': self.parent_view.items_list
+            })
+            self.parent_view.update_buttons()
+
+            new_embed = await ticket_system.create_selling_list_embed(
+                interaction.user,
+                self.parent_view.items_list,
+                interaction.channel.id
+            )
+            message_key = interaction.message.id if interaction.message else interaction.id
+            message_edit_queue.submit(
+                message_key, interaction.channel.id,
+                lambda: interaction.edit_original_response(embed=new_embed, view=self.parent_view)
+            )
+
+        summary_lines = [f"✅ X{item_entry['quantity']} {item_entry['name']} ({item_entry['status']})"
+                         for item_entry in added] + errors
+        summary = "\n".join(summary_lines)
+        if len(summary) > 4000:
+            summary = summary[:4000].rsplit("\n", 1)[0] + "\n..."
+
+        summary_embed = await ticket_system.create_error_embed(
+            f"<:SucessLOGO:1387810153864368218> {len(added)}/{len(lines)} Items Added" if added
+            else "<:ErrorLOGO:1387810170155040888> No Items Added",
+            summary
+        )
+        if added:
+            summary_embed.color = 0x00ff00  # Green color for success
+        await interaction.followup.send(embed=summary_embed, ephemeral=True)
+
 class PaymentMethodView(discord.ui.View):
     def __init__(self, ticket_system, user_id, items_list, disable_back=False):
         super().__init__(timeout=None)
@@ -584,7 +731,7 @@ class PaymentMethodView(discord.ui.View):
         })
 
         # Go back to selling form
-        selling_embed = await self.ticket_system.create_selling_list_embed(interaction.user, items_list)
+        selling_embed = await self.ticket_system.create_selling_list_embed(interaction.user, items_list, interaction.channel.id)
         view = SellingFormView(self.ticket_system, user_id, items_list)
         view.update_buttons()
         await interaction.response.edit_message(embed=selling_embed, view=view)
@@ -613,7 +760,7 @@ class InformationView(discord.ui.View):
             'items_list': items_list
         })
 
-        payment_embed = await self.ticket_system.create_payment_method_embed(interaction.user, items_list)
+        payment_embed = await self.ticket_system.create_payment_method_embed(interaction.user, items_list, interaction.channel.id)
         view = PaymentMethodView(self.ticket_system, user_id, items_list, disable_back=False)
         await interaction.response.edit_message(embed=payment_embed, view=view)
 
@@ -641,12 +788,13 @@ class UsernameModal(discord.ui.Modal):
         try:
             # Import and use RobloxClient
             from roblox_sync import RobloxClient
+            from roblox_ratelimit import PRIORITY_INTERACTIVE
 
             # Create client instance
             client = RobloxClient()
 
             # Get user ID by username
-            user_id = client.get_user_id_by_username(username)
+            user_id = await client.get_user_id_by_username(username, priority=PRIORITY_INTERACTIVE)
 
             if not user_id:
                 error_embed = await self.ticket_system.create_error_embed(
@@ -657,8 +805,8 @@ class UsernameModal(discord.ui.Modal):
                 return
 
             # Get user details including avatar
-            user_details = client.get_user_details(user_id)
-            avatar_url = client.get_user_avatar(user_id)
+            user_details = await client.get_user_details(user_id, priority=PRIORITY_INTERACTIVE)
+            avatar_url = await client.get_user_avatar(user_id, priority=PRIORITY_INTERACTIVE)
 
             roblox_user_data = {
                 'id': user_id,
@@ -747,14 +895,15 @@ class AccountConfirmationView(discord.ui.View):
         """Handle GamePass method confirmation"""
         try:
             from roblox_sync import RobloxClient
+            from roblox_ratelimit import PRIORITY_INTERACTIVE
 
             client = RobloxClient()
             user_id = self.roblox_user_data['id']
 
-            # Get user experiences
-            experiences = client.get_user_experiences(user_id)
+            # Get the first experience only, no need to page through all of them
+            first_experience = await client.get_primary_experience(user_id, priority=PRIORITY_INTERACTIVE)
 
-            if not experiences:
+            if not first_experience:
                 error_embed = await self.ticket_system.create_error_embed(
                     "No Experiences Found",
                     f"No public experiences found for this user!"
@@ -763,7 +912,6 @@ class AccountConfirmationView(discord.ui.View):
                 return
 
             # Get the first experience ID
-            first_experience = experiences[0]
             universe_id = first_experience.get('id')
 
             if not universe_id:
@@ -778,10 +926,7 @@ class AccountConfirmationView(discord.ui.View):
             gamepass_url = f"https://create.roblox.com/dashboard/creations/experiences/{universe_id}/monetization/passes"
 
             # Calculate expected price without tax
-            total_value = sum(item['value'] * item['quantity'] for item in self.items_list)
-            total_millions = total_value / 1_000_000
-            robux_rate = self.ticket_system.calculate_robux_rate(total_millions)
-            expected_price = int(total_millions * robux_rate)
+            expected_price = self.ticket_system.get_quote(self.items_list, interaction.channel.id).total_robux
 
             # Create result embed
             result_embed = await self.ticket_system.create_gamepass_result_embed(
@@ -790,7 +935,7 @@ class AccountConfirmationView(discord.ui.View):
             )
 
             # Update original message with disabled back button
-            payment_embed = await self.ticket_system.create_payment_method_embed(interaction.user, self.items_list)
+            payment_embed = await self.ticket_system.create_payment_method_embed(interaction.user, self.items_list, interaction.channel.id)
             disabled_view = PaymentMethodView(self.ticket_system, self.user_id, self.items_list, disable_back=True)
 
             await interaction.edit_original_response(embed=payment_embed, view=disabled_view)
@@ -829,19 +974,17 @@ class AccountConfirmationView(discord.ui.View):
         try:
             from roblox_sync import RobloxClient
             from roblox_OnJoinGroup import group_monitor
+            from roblox_ratelimit import PRIORITY_INTERACTIVE
 
             client = RobloxClient()
             user_id = self.roblox_user_data['id']
             group_id = 34785441
 
             # Check if user is in group
-            is_in_group = client.is_user_in_group(user_id, group_id)
+            is_in_group = await client.is_user_in_group(user_id, group_id, priority=PRIORITY_INTERACTIVE)
 
             # Calculate total robux
-            total_value = sum(item['value'] * item['quantity'] for item in self.items_list)
-            total_millions = total_value / 1_000_000
-            robux_rate = self.ticket_system.calculate_robux_rate(total_millions)
-            total_robux = int(total_millions * robux_rate)
+            total_robux = self.ticket_system.get_quote(self.items_list, interaction.channel.id).total_robux
 
             # Disable buttons on current embed (confirmation embed)
             disabled_view = discord.ui.View()
@@ -876,7 +1019,7 @@ class AccountConfirmationView(discord.ui.View):
                 # User already in group - direct transaction
                 transaction_embed = await self.ticket_system.create_group_transaction_embed(
                     interaction.user, self.items_list, total_robux,
-                    self.roblox_user_data['name'], user_id
+                    self.roblox_user_data['name'], user_id, interaction.channel.id
                 )
 
                 view = GroupTransactionView(
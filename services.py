@@ -0,0 +1,56 @@
+class TicketContext:
+    """Ticket system, state and creator of a ticket channel"""
+
+    def __init__(self, ticket_system, channel_id):
+        self.ticket_system = ticket_system
+        self.channel_id = channel_id
+
+    @property
+    def state(self):
+        return self.ticket_system.get_ticket_state(self.channel_id)
+
+    @property
+    def user_id(self):
+        state = self.state
+        return state.get('user_id') if state else None
+
+    async def creator(self):
+        """Discord user who opened the ticket"""
+        return await self.ticket_system.get_ticket_creator(self.channel_id)
+
+
+class ServiceRegistry:
+    def __init__(self):
+        self.services = {}  # name -> subsystem instance
+        self.tickets = {}  # channel_id -> ticket system owning the channel
+
+    def register(self, name, service):
+        """Register a subsystem under a name, replacing any previous one"""
+        self.services[name] = service
+        return service
+
+    def get(self, name, default=None):
+        return self.services.get(name, default)
+
+    def index_ticket(self, channel_id, ticket_system):
+        """Record which ticket system owns a channel"""
+        self.tickets[int(channel_id)] = ticket_system
+
+    def unindex_ticket(self, channel_id):
+        self.tickets.pop(int(channel_id), None)
+
+    def ticket_context(self, channel_id):
+        """Ticket context of a channel, None if the channel isn't a ticket"""
+        ticket_system = self.tickets.get(int(channel_id))
+        if ticket_system is None:
+            return None
+        return TicketContext(ticket_system, int(channel_id))
+
+
+def get_registry(bot):
+    """Service registry attached to the bot, created on first use"""
+    registry = getattr(bot, 'services', None)
+    if registry is None:
+        registry = ServiceRegistry()
+        bot.services = registry
+    return registry
@@ -0,0 +1,149 @@
+import os
+from item_index import parse_value, DEMAND_RANK
+from metrics import metrics
+
+STOCK_FILE = 'stockage_data.json'
+
+# Tranches de valeur (borne basse, libellé)
+VALUE_BANDS = [
+    (0, '< 5M'),
+    (5_000_000, '5M - 25M'),
+    (25_000_000, '25M - 100M'),
+    (100_000_000, '100M+')
+]
+
+SORT_KEYS = {
+    'value': lambda row: (-row['value'], row['name']),
+    'quantity': lambda row: (-row['quantity'], row['name']),
+    'total': lambda row: (-row['value'] * row['quantity'], row['name']),
+    'demand': lambda row: (DEMAND_RANK.get(row['demand'], len(DEMAND_RANK)), -row['value'], row['name']),
+    'name': lambda row: row['name'].lower()
+}
+
+# Résultats de requêtes gardés jusqu'à la prochaine modification du stock
+QUERY_CACHE_SIZE = 256
+
+# Lignes par page de /stock
+PAGE_SIZE = 15
+
+stock_queries = metrics.counter('stock_queries_total', "/stock queries by cache result", ('cache',))
+
+
+def value_band(value):
+    """Libellé de la tranche de valeur"""
+    label = VALUE_BANDS[0][1]
+    for lower_bound, band_label in VALUE_BANDS:
+        if value >= lower_bound:
+            label = band_label
+    return label
+
+
+def entry_value(stock_data):
+    """Valeur unitaire d'une entrée du stock selon son statut"""
+    status = stock_data.get('status', 'Clean')
+    return parse_value(stock_data.get('Duped Value' if status == 'Dupe' else 'Cash Value'))
+
+
+def stock_version(path=STOCK_FILE):
+    """Change à chaque écriture du fichier de stock"""
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class StockIndex:
+    """Index secondaires du stock (type, statut, demande, tranche de valeur) et ordres de tri"""
+
+    def __init__(self):
+        self.version = None
+        self.rows = []
+        self.indexes = {'type': {}, 'status': {}, 'demand': {}, 'band': {}}  # champ -> valeur -> set de lignes
+        self.orders = {}  # tri -> liste des lignes triées
+        self.cache = {}  # (filtres, tri) -> lignes du résultat
+
+    def ensure(self, load_stock):
+        """Reconstruit les index si le stock a changé depuis la dernière construction"""
+        version = stock_version()
+        if version != self.version or version is None:
+            self.rebuild(load_stock())
+            self.version = version
+        return self
+
+    def rebuild(self, stockage_data):
+        """Construit les lignes, les index et les ordres de tri en une passe"""
+        rows = []
+        indexes = {field: {} for field in self.indexes}
+        for stock_key, stock_data in stockage_data.items():
+            status = stock_data.get('status', 'Clean')
+            value = entry_value(stock_data)
+            row = {
+                'key': stock_key,
+                'name': stock_key,
+                'type': stock_data.get('Type', 'Unknown'),
+                'status': status,
+                'demand': stock_data.get('Demand', 'Unknown'),
+                'value': value,
+                'quantity': stock_data.get('quantity', 0)
+            }
+            row_id = len(rows)
+            rows.append(row)
+            for field, key in (('type', row['type']), ('status', status), ('demand', row['demand']), ('band', value_band(value))):
+                indexes[field].setdefault(key.lower(), set()).add(row_id)
+
+        self.rows = rows
+        self.indexes = indexes
+        self.orders = {sort: sorted(range(len(rows)), key=lambda row_id, key=key: key(rows[row_id]))
+                       for sort, key in SORT_KEYS.items()}
+        self.cache = {}
+
+    def values(self, field):
+        """Valeurs présentes dans un index (pour les choix de la commande)"""
+        return sorted(self.indexes.get(field, {}))
+
+    def query(self, sort='value', **filters):
+        """Lignes correspondant aux filtres (type, status, demand, band) dans l'ordre du tri, avec leurs totaux"""
+        filters = {field: value.lower() for field, value in filters.items() if value}
+        cache_key = (tuple(sorted(filters.items())), sort)
+        result = self.cache.get(cache_key)
+        if result is not None:
+            stock_queries.inc(cache='hit')
+            return result
+        stock_queries.inc(cache='miss')
+
+        order = self.orders.get(sort, self.orders.get('value', []))
+        if not filters:
+            selected = order
+        else:
+            # Intersection en partant du plus petit index
+            sets = sorted((self.indexes[field].get(value, set()) for field, value in filters.items()), key=len)
+            matching = set(sets[0]).intersection(*sets[1:])
+            if len(matching) * 8 < len(order):
+                # Peu de résultats : les trier directement
+                sort_key = SORT_KEYS.get(sort, SORT_KEYS['value'])
+                selected = sorted(matching, key=lambda row_id: sort_key(self.rows[row_id]))
+            else:
+                selected = [row_id for row_id in order if row_id in matching]
+
+        rows = [self.rows[row_id] for row_id in selected]
+        result = {
+            'rows': rows,
+            'quantity': sum(row['quantity'] for row in rows),
+            'total_value': sum(row['value'] * row['quantity'] for row in rows)
+        }
+        if len(self.cache) >= QUERY_CACHE_SIZE:
+            self.cache.clear()
+        self.cache[cache_key] = result
+        return result
+
+    def page(self, page, page_size=PAGE_SIZE, sort='value', **filters):
+        """Lignes d'une page du résultat, numéro de page borné et nombre de pages"""
+        result = self.query(sort, **filters)
+        page_count = max(1, -(-len(result['rows']) // page_size))
+        page = min(max(page, 0), page_count - 1)
+        return result['rows'][page * page_size:(page + 1) * page_size], page, page_count, result
+
+
+# Instance globale partagée par /stock
+stock_index = StockIndex()
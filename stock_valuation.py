@@ -0,0 +1,92 @@
+import os
+from dotenv import load_dotenv
+from metrics import metrics
+from stock_index import entry_value
+
+load_dotenv()
+
+# Intervalle de comparaison avec un recalcul complet (secondes)
+VALUATION_CHECK_INTERVAL = int(os.getenv('STOCK_VALUATION_CHECK_INTERVAL', '600'))
+
+valuation_drifts = metrics.counter('stock_valuation_drift_total', "Valuation aggregates corrected by a full recomputation")
+
+
+def entry_contribution(stock_data):
+    """(type, demande, statut, quantité, valeur totale) d'une entrée du stock"""
+    quantity = stock_data.get('quantity', 0)
+    return (
+        stock_data.get('Type', 'Unknown'),
+        stock_data.get('Demand', 'Unknown'),
+        stock_data.get('status', 'Clean'),
+        quantity,
+        entry_value(stock_data) * quantity
+    )
+
+
+class StockValuation:
+    """Totaux du stock (valeur clean/dupe, quantités par type et par demande) tenus à jour entrée par entrée"""
+
+    def __init__(self):
+        self.entries = 0
+        self.quantity = 0
+        self.clean_value = 0
+        self.duped_value = 0
+        self.by_type = {}  # type -> {'quantity', 'value'}
+        self.by_demand = {}  # demande -> quantité
+
+    @classmethod
+    def from_stock(cls, stockage_data):
+        """Recalcul complet depuis les données de stockage"""
+        valuation = cls()
+        for stock_data in stockage_data.values():
+            valuation._apply(stock_data, 1)
+        return valuation
+
+    def _apply(self, stock_data, sign):
+        item_type, demand, status, quantity, value = entry_contribution(stock_data)
+        self.entries += sign
+        self.quantity += sign * quantity
+        if status == 'Dupe':
+            self.duped_value += sign * value
+        else:
+            self.clean_value += sign * value
+
+        type_totals = self.by_type.setdefault(item_type, {'quantity': 0, 'value': 0})
+        type_totals['quantity'] += sign * quantity
+        type_totals['value'] += sign * value
+        if not type_totals['quantity'] and not type_totals['value']:
+            del self.by_type[item_type]
+
+        self.by_demand[demand] = self.by_demand.get(demand, 0) + sign * quantity
+        if not self.by_demand[demand]:
+            del self.by_demand[demand]
+
+    def update(self, before, after):
+        """Remplace la contribution d'une entrée (None si elle n'existait pas / n'existe plus)"""
+        if before is not None:
+            self._apply(before, -1)
+        if after is not None:
+            self._apply(after, 1)
+
+    def snapshot(self):
+        """Totaux actuels"""
+        return {
+            'entries': self.entries,
+            'quantity': self.quantity,
+            'clean_value': self.clean_value,
+            'duped_value': self.duped_value,
+            'total_value': self.clean_value + self.duped_value,
+            'by_type': {item_type: dict(totals) for item_type, totals in self.by_type.items()},
+            'by_demand': dict(self.by_demand)
+        }
+
+    def check_drift(self, stockage_data):
+        """Compare avec un recalcul complet et le reprend en cas d'écart, retourne les champs qui différaient"""
+        expected = StockValuation.from_stock(stockage_data)
+        current, fresh = self.snapshot(), expected.snapshot()
+        drifted = [field for field in fresh if current[field] != fresh[field]]
+        if drifted:
+            valuation_drifts.inc()
+            print(f"Stock valuation drift corrected: {', '.join(drifted)}")
+            self.__dict__.update(expected.__dict__)
+        return drifted
@@ -7,15 +7,30 @@ from difflib import SequenceMatcher
 from datetime import datetime
 import asyncio
 import os
+from metrics import metrics, record_json_write
+from message_edit_queue import message_edit_queue
+from services import get_registry
+from item_index import item_name_index, DEMAND_RANK, TYPO_SEARCH, catalog_version, split_api_name
+from stock_index import stock_index, stock_version, VALUE_BANDS, SORT_KEYS
+from stock_valuation import StockValuation, VALUATION_CHECK_INTERVAL
+from polling_scheduler import polling_scheduler
+from catalog_diff import catalog_events
+from learned_aliases import learned_aliases
+
+# Durée de find_best_match
+match_latency = metrics.histogram('stockage_match_seconds', "Item name matching latency")
 
 class StockageSystem:
     def __init__(self):
         self.api_data = {}
         self.item_request_data = {}
+        self.last_stockage_write = None  # (texte, version du fichier) de la dernière sauvegarde
         self.load_data()
+        self.valuation = StockValuation.from_stock(self.load_stockage_data())
 
     def load_data(self):
         """Charge les données depuis les fichiers JSON"""
+        self.catalog_version = catalog_version()
         try:
             with open('API_JBChangeLogs.json', 'r', encoding='utf-8') as f:
                 content = f.read().strip()
@@ -47,31 +62,50 @@ class StockageSystem:
     def save_stockage_data(self, data):
         """Sauvegarde les données de stockage"""
         try:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+            # Rien n'a changé : ne pas réécrire (la version du fichier invalide les index de /stock)
+            if self.last_stockage_write == (text, stock_version()):
+                return True
             with open('stockage_data.json', 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(text)
+            record_json_write('stockage_data.json', text)
+            self.last_stockage_write = (text, stock_version())
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde du stockage: {e}")
             return False
 
-    def update_stockage_values(self):
-        """Met à jour les valeurs du stockage depuis l'API"""
+    def update_stockage_values(self, api_names=None):
+        """Met à jour les valeurs du stockage depuis l'API (seulement les entrées liées à api_names si donné)"""
         stockage_data = self.load_stockage_data()
+        revalued = []  # (avant, après) des entrées modifiées
+
+        # Noms de base pouvant correspondre aux items modifiés
+        targets = None
+        if api_names is not None:
+            targets = set(api_names) | {re.sub(r'\s*\([^)]*\)', '', api_name) for api_name in api_names}
 
         for stock_key, stock_data in stockage_data.items():
             # Extraire le nom original de l'item (sans statut)
             base_name = re.sub(r'\s*\([^)]*\)$', '', stock_key)
+            if targets is not None and base_name not in targets:
+                continue
 
             # Chercher dans l'API
             for api_name, api_data in self.api_data.items():
                 if api_name == base_name or re.sub(r'\s*\([^)]*\)', '', api_name) == base_name:
+                    before = dict(stock_data)
                     # Mettre à jour toutes les données sauf la quantité
                     for key, value in api_data.items():
                         if key != 'quantity':
                             stock_data[key] = value
+                    if stock_data != before:
+                        revalued.append((before, stock_data))
                     break
 
-        self.save_stockage_data(stockage_data)
+        if self.save_stockage_data(stockage_data):
+            for before, after in revalued:
+                self.valuation.update(before, after)
 
     def add_item_to_stock(self, item_name, item_data, status, quantity=1):
         """Ajoute un item au stock"""
@@ -79,6 +113,7 @@ class StockageSystem:
 
         # Créer une clé unique basée sur le nom et le statut
         stock_key = f"{item_name} ({status})" if status != "Clean" else item_name
+        before = dict(stockage_data[stock_key]) if stock_key in stockage_data else None
 
         if stock_key in stockage_data:
             # Augmenter la quantité si l'item existe déjà
@@ -90,9 +125,30 @@ class StockageSystem:
             new_item['status'] = status
             stockage_data[stock_key] = new_item
 
-        self.save_stockage_data(stockage_data)
+        if self.save_stockage_data(stockage_data):
+            self.valuation.update(before, stockage_data[stock_key])
         return True
 
+    def apply_catalog_diff(self, diff):
+        """Suit une mise à jour du catalogue sans tout recharger : seuls les items touchés sont revus"""
+        for api_name in diff.removed:
+            self.api_data.pop(api_name, None)
+        self.api_data.update(diff.added)
+        for api_name, (_, item_data) in diff.changed.items():
+            self.api_data[api_name] = item_data
+
+        item_name_index.apply_diff(diff, self.api_data, self.item_request_data)
+        self.update_stockage_values(diff.affected)
+        self.catalog_version = catalog_version()
+
+    def get_valuation(self):
+        """Valeur actuelle du stock (clean/dupe, par type et par demande)"""
+        return self.valuation.snapshot()
+
+    def check_valuation_drift(self):
+        """Compare les totaux tenus à jour avec un recalcul complet du stock"""
+        return self.valuation.check_drift(self.load_stockage_data())
+
     def extract_separators(self, text):
         """Extrait les items en utilisant les séparateurs +, ,, and"""
         # Pattern pour détecter les séparateurs avec espaces
@@ -289,6 +345,11 @@ class StockageSystem:
 
     def find_best_match(self, search_text, item_type, year=None):
         """Trouve le meilleur match pour un item avec algorithme de scoring amélioré"""
+        with match_latency.time():
+            return self._find_best_match(search_text, item_type, year)
+
+    def _find_best_match(self, search_text, item_type, year=None):
+        """Recherche du meilleur match, chronométrée par find_best_match"""
         candidates = []
         
         # D'abord vérifier si c'est un hyperchrome via les aliases
@@ -319,6 +380,36 @@ class StockageSystem:
         if hyperchrome_match and (item_type == "None" or item_type == "Hyperchrome"):
             return hyperchrome_match, [hyperchrome_match]
 
+        # Orthographe déjà confirmée par un utilisateur : pas de choix du type ni d'ordre de priorité
+        learned_name = learned_aliases.lookup(search_text, item_type, year, self.api_data)
+        if learned_name:
+            return (learned_name, self.api_data[learned_name], 1.0, learned_name), []
+
+        # Nom exact (ex. choisi dans l'autocomplétion) : pas besoin du scoring
+        if item_type != "Hyperchrome":
+            index = item_name_index.ensure(self.api_data, self.item_request_data)
+            # Orthographe confirmée pour un nom seulement : le type se choisit comme pour ce nom
+            learned_clean_name = learned_aliases.lookup_name(search_text, index.exact)
+            if learned_clean_name:
+                search_text = learned_clean_name
+            if TYPO_SEARCH:
+                # Faute de frappe sur un seul nom ou alias du catalogue : chercher ce nom
+                corrected = index.correct_typo(search_text)
+                if item_type != "None":
+                    corrected = [name for name in corrected if name.endswith(f"({item_type})")]
+                if len(corrected) == 1 and corrected[0] in self.api_data:
+                    # Alias ou nom complété par son type : l'item est connu
+                    item_name = corrected[0]
+                    return (item_name, self.api_data[item_name], 1.0, item_name), []
+                if corrected:
+                    search_text = split_api_name(corrected[0])[0]
+            exact_names = index.exact_matches(search_text)
+            if item_type != "None":
+                exact_names = [name for name in exact_names if name.endswith(f"({item_type})")]
+            if len(exact_names) == 1 and exact_names[0] in self.api_data:
+                item_name = exact_names[0]
+                return (item_name, self.api_data[item_name], 1.0, item_name), []
+
         # Collecter tous les candidats possibles de l'API
         for item_name, item_data in self.api_data.items():
             candidates.append((item_name, item_data, item_name))
@@ -563,6 +654,7 @@ class StockageSystem:
 def setup_stockage_system(bot):
     """Configure le système de stockage avec le bot"""
     stockage_system = StockageSystem()
+    get_registry(bot).register('stockage_system', stockage_system)
 
     @bot.tree.command(name="add_stock", description="Ajouter des items au stock")
     @app_commands.describe(items="Liste d'items à ajouter (séparés par +, ,, ou and)")
@@ -591,18 +683,175 @@ def setup_stockage_system(bot):
         else:
             await interaction.followup.send(embed=embed)
 
+    @add_stock.autocomplete('items')
+    async def add_stock_autocomplete(interaction: discord.Interaction, current: str):
+        """Complète le dernier item de la liste avec les noms du catalogue"""
+        # Garder les items déjà tapés, compléter seulement le dernier
+        parts = re.split(r'(\s*\+\s*|\s*,\s*|\s+and\s+)', current, flags=re.IGNORECASE)
+        head, fragment = "".join(parts[:-1]), parts[-1]
+
+        index = item_name_index.ensure(stockage_system.api_data, stockage_system.item_request_data)
+        choices = []
+        for suggestion in index.suggest(fragment):
+            value = head + suggestion['value']
+            if len(value) <= 100:
+                choices.append(app_commands.Choice(name=suggestion['label'], value=value))
+        return choices
+
+    @bot.tree.command(name="stock", description="Parcourir le stock")
+    @app_commands.describe(
+        type="Type d'item (Vehicle, Rim, ...)",
+        status="Statut des items",
+        demand="Demande des items",
+        band="Tranche de valeur",
+        sort="Ordre d'affichage"
+    )
+    @app_commands.choices(
+        status=[app_commands.Choice(name=status, value=status) for status in ("Clean", "Dupe")],
+        band=[app_commands.Choice(name=label, value=label) for _, label in VALUE_BANDS],
+        sort=[app_commands.Choice(name=sort.capitalize(), value=sort) for sort in SORT_KEYS]
+    )
+    async def stock(interaction: discord.Interaction, type: str = None, status: str = None,
+                    demand: str = None, band: str = None, sort: str = 'value'):
+        """Commande pour afficher le stock filtré et trié, page par page"""
+        filters = {'type': type, 'status': status, 'demand': demand, 'band': band}
+        view = StockPageView(stockage_system, interaction.user.id, sort, filters)
+        await interaction.response.send_message(embed=view.create_embed(), view=view, ephemeral=True)
+
+    @stock.autocomplete('type')
+    async def stock_type_autocomplete(interaction: discord.Interaction, current: str):
+        return stock_filter_choices(stockage_system, 'type', current)
+
+    @stock.autocomplete('demand')
+    async def stock_demand_autocomplete(interaction: discord.Interaction, current: str):
+        return stock_filter_choices(stockage_system, 'demand', current)
+
+    @bot.tree.command(name="stock_value", description="Valeur actuelle du stock")
+    async def stock_value(interaction: discord.Interaction):
+        """Commande admin pour afficher la valeur du stock par statut, type et demande"""
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("You don't have permission to use this command!", ephemeral=True)
+            return
+
+        valuation = stockage_system.get_valuation()
+
+        def format_value(value):
+            return f"{value:,}".replace(',', ' ')
+
+        embed = discord.Embed(
+            title=f"Stock Value ({valuation['entries']} entries · {valuation['quantity']} items)",
+            color=0x00ff00,
+            timestamp=datetime.now()
+        )
+        embed.description = "\n".join([
+            f"├ Clean: {format_value(valuation['clean_value'])}",
+            f"├ Duped: {format_value(valuation['duped_value'])}",
+            f"└ Total: {format_value(valuation['total_value'])}"
+        ])
+        by_type = sorted(valuation['by_type'].items(), key=lambda item: -item[1]['value'])
+        embed.add_field(
+            name="By Type",
+            value="\n".join(f"{item_type}: {totals['quantity']}x · {format_value(totals['value'])}"
+                            for item_type, totals in by_type)[:1024] or "Empty",
+            inline=False
+        )
+        by_demand = sorted(valuation['by_demand'].items(), key=lambda item: DEMAND_RANK.get(item[0], len(DEMAND_RANK)))
+        embed.add_field(
+            name="By Demand",
+            value="\n".join(f"{demand}: {quantity}x" for demand, quantity in by_demand)[:1024] or "Empty",
+            inline=False
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # Vérification périodique des totaux contre un recalcul complet
+    async def check_valuation():
+        stockage_system.check_valuation_drift()
+
+    polling_scheduler.add('stock_valuation_drift', check_valuation, interval=VALUATION_CHECK_INTERVAL)
+    metrics.gauge('stock_value_clean', "Clean value of the stock").set_function(lambda: stockage_system.valuation.clean_value)
+    metrics.gauge('stock_value_duped', "Duped value of the stock").set_function(lambda: stockage_system.valuation.duped_value)
+
     # Démarrer la mise à jour automatique des valeurs
+    # Les mises à jour GitHub arrivent sous forme de diff
+    catalog_events.subscribe('stockage_system', stockage_system.apply_catalog_diff)
+    catalog_events.subscribe('learned_aliases', learned_aliases.apply_catalog_diff)
+
     async def update_stockage_loop():
+        stockage_system.update_stockage_values()  # Valeurs à jour au démarrage
         while True:
             await asyncio.sleep(1)  # Actualiser toutes les secondes
-            stockage_system.load_data()
-            stockage_system.update_stockage_values()
+            # Tout recharger seulement si le catalogue a changé sans passer par un diff
+            if catalog_version() != stockage_system.catalog_version:
+                stockage_system.load_data()
+                stockage_system.update_stockage_values()
 
     # Lancer la boucle de mise à jour
     asyncio.create_task(update_stockage_loop())
 
     return stockage_system
 
+def stock_filter_choices(stockage_system, field, current):
+    """Valeurs présentes dans le stock pour un filtre de /stock"""
+    index = stock_index.ensure(stockage_system.load_stockage_data)
+    current = current.lower()
+    return [app_commands.Choice(name=value.title(), value=value)
+            for value in index.values(field) if current in value][:25]
+
+class StockPageView(discord.ui.View):
+    def __init__(self, stockage_system, user_id, sort, filters):
+        super().__init__(timeout=300)
+        self.stockage_system = stockage_system
+        self.user_id = user_id
+        self.sort = sort
+        self.filters = filters
+        self.page = 0
+
+    def create_embed(self):
+        """Crée l'embed de la page courante (résultats gardés en cache jusqu'au prochain changement du stock)"""
+        index = stock_index.ensure(self.stockage_system.load_stockage_data)
+        rows, self.page, page_count, result = index.page(self.page, sort=self.sort, **self.filters)
+
+        active_filters = [f"{field}: {value}" for field, value in self.filters.items() if value]
+        embed = discord.Embed(
+            title=f"Stock ({len(result['rows'])} entries · {result['quantity']} items)",
+            color=0x00ff00,
+            timestamp=datetime.now()
+        )
+
+        description_lines = []
+        if active_filters:
+            description_lines.append(f"Filters: {' · '.join(active_filters)}")
+            description_lines.append("")
+        for row in rows:
+            value = f"{row['value']:,}".replace(',', ' ') if row['value'] else "Unknown"
+            description_lines.append(f"**{row['quantity']}x** {row['name']}")
+            description_lines.append(f"└ Value: {value} · Demand: {row['demand']}")
+
+        embed.description = "\n".join(description_lines) if rows else "No items in stock."
+        total_value = f"{result['total_value']:,}".replace(',', ' ')
+        embed.set_footer(text=f"Page {self.page + 1}/{page_count} · Total value: {total_value} · Sort: {self.sort}")
+
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= page_count - 1
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        # Seul l'auteur de la commande peut changer de page
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("❌ Only the command author can use these buttons.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        await interaction.response.edit_message(embed=self.create_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.create_embed(), view=self)
+
 class MultipleItemView(discord.ui.View):
     def __init__(self, multiple_items, all_results, stockage_system, add_to_stock=False):
         super().__init__(timeout=300)
@@ -656,6 +905,8 @@ class ItemSelect(discord.ui.Select):
             # Mettre à jour le résultat
             for i, result in enumerate(self.parent_view.all_results):
                 if result['multiple'] and result['search_text'] == self.item_data['search_text']:
+                    # Retenir le choix pour cette orthographe
+                    learned_aliases.confirm(result['search_text'], result['type'], result['year'], selected_item[0])
                     updated_result = {
                         'search_text': result['search_text'],
                         'type': selected_type,
@@ -694,10 +945,16 @@ class ItemSelect(discord.ui.Select):
 
             # Vérifier s'il reste des menus déroulants
             remaining_selects = [item for item in self.parent_view.children if isinstance(item, ItemSelect)]
-            
+
+            # Sélections rapides : seul le dernier embed est envoyé
+            await interaction.response.defer()
             if remaining_selects:
                 # Il reste des menus, garder la vue avec les menus restants
-                await interaction.response.edit_message(embed=new_embed, view=self.parent_view)
+                view = self.parent_view
             else:
                 # Plus de menus, supprimer la vue
-                await interaction.response.edit_message(embed=new_embed, view=None)
\ No newline at end of file
+                view = None
+            message_edit_queue.submit(
+                interaction.message.id, interaction.channel.id,
+                lambda: interaction.edit_original_response(embed=new_embed, view=view)
+            )
\ No newline at end of file
@@ -0,0 +1,122 @@
+import pytest
+import stockage_system
+import trading_ticket_system
+from item_index import ItemNameIndex, item_name_index, catalog_version
+from learned_aliases import LearnedAliases, LEARNED_ALIAS_MIN_CONFIRMATIONS
+
+# Small catalog where partial names are within a typo of another item
+CATALOG_NAMES = [
+    "Goliath (Vehicle)", "Gold (Body Color)",
+    "Arachnid (Vehicle)", "Arachnid (Rim)", "Arch (Spoiler)",
+    "Bandit (Vehicle)", "Sand (Texture)",
+    "Camper (Vehicle)", "Camo (Texture)",
+    "Winter Camo (Texture)", "Winner (Horn)",
+    "Revolver (Rim)", "Revox (Vehicle)",
+    "Spider Leg (Rim)", "Spike (Rim)",
+    "Volcano (Texture)", "Volt (Vehicle)",
+    "Meep Meep (Horn)", "Jeep (Vehicle)",
+    "Brulee (Vehicle)", "Torpedo (Vehicle)"
+]
+
+# Partial names and the item they must resolve to
+PREFIX_INPUTS = [
+    ("goli", "Goliath (Vehicle)"),
+    ("band", "Bandit (Vehicle)"),
+    ("camp", "Camper (Vehicle)"),
+    ("winter", "Winter Camo (Texture)"),
+    ("revol", "Revolver (Rim)"),
+    ("spide", "Spider Leg (Rim)"),
+    ("volc", "Volcano (Texture)"),
+    ("meep", "Meep Meep (Horn)")
+]
+
+
+def make_catalog():
+    return {name: {"Cash Value": "10 000 000", "Duped Value": "5 000 000", "Demand": "Decent",
+                   "Type": name.rsplit("(", 1)[1].rstrip(")")}
+            for name in CATALOG_NAMES}
+
+
+@pytest.fixture
+def stockage(tmp_path, monkeypatch):
+    """StockageSystem over the test catalog, without reading the bot's data files"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(stockage_system, 'TYPO_SEARCH', True)
+    monkeypatch.setattr(stockage_system, 'learned_aliases', LearnedAliases(str(tmp_path / 'learned_aliases.json')))
+    system = stockage_system.StockageSystem()
+    system.api_data = make_catalog()
+    system.item_request_data = {'priority_order': {'Vehicle': 1, 'Rim': 2}}
+    item_name_index.rebuild(system.api_data, system.item_request_data)
+    item_name_index.version = catalog_version()
+    return system
+
+
+@pytest.mark.parametrize("prefix", [prefix for prefix, _ in PREFIX_INPUTS] + ["arach"])
+def test_prefix_is_not_corrected(prefix):
+    index = ItemNameIndex()
+    index.rebuild(make_catalog(), {})
+    assert index.correct_typo(prefix) == []
+
+
+def test_typo_is_corrected():
+    index = ItemNameIndex()
+    index.rebuild(make_catalog(), {})
+    assert index.correct_typo("brulle") == ["Brulee (Vehicle)"]
+    assert index.correct_typo("torpdo") == ["Torpedo (Vehicle)"]
+
+
+@pytest.mark.parametrize("prefix, expected", PREFIX_INPUTS)
+def test_prefix_matches_its_item(stockage, prefix, expected):
+    best_match, _ = stockage.find_best_match(prefix, "None")
+    assert best_match[0] == expected
+
+
+def test_prefix_of_shared_name_keeps_type_choice(stockage):
+    best_match, duplicates = stockage.find_best_match("arach", "None")
+    assert best_match[0].startswith("Arachnid")
+    assert sorted(name for name, _ in duplicates) == ["Arachnid (Rim)", "Arachnid (Vehicle)"]
+
+
+def test_typo_in_alias_is_corrected():
+    index = ItemNameIndex()
+    catalog = make_catalog()
+    catalog["HyperShift 2023 (HyperChrome)"] = {"Cash Value": "50 000 000", "Type": "HyperChrome"}
+    index.rebuild(catalog, {'hyper': {'HyperShift 2023': ['Hyper Shift Level 5']}})
+    assert index.correct_typo("hyper shift levle 5") == ["HyperShift 2023 (HyperChrome)"]
+    assert index.correct_typo("arachnid vehicel") == ["Arachnid (Vehicle)"]
+
+
+def test_typo_in_typed_name_keeps_its_type(stockage):
+    best_match, duplicates = stockage.find_best_match("arachnid vehicel", "None")
+    assert best_match[0] == "Arachnid (Vehicle)"
+    assert duplicates == []
+
+
+def selling_match(stockage, item_input):
+    """Item picked by the selling ticket for item_input, priority order included"""
+    ticket_system = trading_ticket_system.TradingTicketSystem.__new__(trading_ticket_system.TradingTicketSystem)
+    ticket_system.services = {'stockage_system': stockage}
+    best_match, _ = ticket_system.find_best_item_match(item_input)
+    return best_match[0]
+
+
+def test_learned_type_skips_picker_and_priority(stockage):
+    assert len(stockage.find_best_match("arachnd", "None")[1]) == 2
+    assert selling_match(stockage, "arachnd") == "Arachnid (Vehicle)"
+
+    for _ in range(LEARNED_ALIAS_MIN_CONFIRMATIONS):
+        stockage_system.learned_aliases.confirm("arachnd", "None", None, "Arachnid (Rim)")
+
+    best_match, duplicates = stockage.find_best_match("arachnd", "None")
+    assert best_match[0] == "Arachnid (Rim)"
+    assert duplicates == []
+    assert selling_match(stockage, "arachnd") == "Arachnid (Rim)"
+
+
+def test_learned_name_resolves_spelling(stockage):
+    for _ in range(LEARNED_ALIAS_MIN_CONFIRMATIONS - 1):
+        stockage_system.learned_aliases.confirm_name("thief car", "Bandit")
+    assert stockage.find_best_match("thief car", "None")[0][0] != "Bandit (Vehicle)"
+
+    stockage_system.learned_aliases.confirm_name("thief car", "Bandit")
+    assert stockage.find_best_match("thief car", "None")[0][0] == "Bandit (Vehicle)"
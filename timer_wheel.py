@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+from metrics import metrics, record_json_write
+
+# (slot width in seconds, slot count) of each wheel level: seconds, minutes, hours, days
+WHEEL_LEVELS = [(1, 60), (60, 60), (3600, 24), (86400, 32)]
+
+
+class TimerWheel:
+    def __init__(self, data_file='timer_wheel_data.json'):
+        self.data_file = data_file
+        self.timers = {}  # timer_id -> {'deadline', 'kind', 'payload'}
+        self.handlers = {}  # kind -> async handler(timer_id, payload)
+        self.slots = [[set() for _ in range(count)] for _, count in WHEEL_LEVELS]
+        self.current = int(time.time())
+        self.task = None
+        self.tasks = set()  # Handlers running, referenced so the loop doesn't collect them
+        self.fired_count = 0
+        self.load_data()
+
+    def load_data(self):
+        """Load persisted timers and put them back on the wheel"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                self.timers = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.timers = {}
+
+        for timer_id in self.timers:
+            self._insert(timer_id)
+
+    def save_data(self):
+        """Save timers to JSON file"""
+        try:
+            text = json.dumps(self.timers, indent=2, ensure_ascii=False)
+            with open(self.data_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            record_json_write(self.data_file, text)
+        except Exception as e:
+            print(f"Error saving timer wheel data: {e}")
+
+    def _insert(self, timer_id, earliest=None):
+        """Put a timer in the slot of the lowest level that covers its deadline"""
+        # Overdue timers (e.g. expired while the bot was down) fire on the next tick
+        earliest = self.current + 1 if earliest is None else earliest
+        deadline = max(int(self.timers[timer_id]['deadline']), earliest)
+        for level, (width, count) in enumerate(WHEEL_LEVELS):
+            if deadline // width - self.current // width < count or level == len(WHEEL_LEVELS) - 1:
+                self.slots[level][(deadline // width) % count].add(timer_id)
+                return
+
+    def register(self, kind, handler):
+        """Register the coroutine called when a timer of this kind fires"""
+        self.handlers[kind] = handler
+
+    def schedule(self, timer_id, deadline, kind, payload=None):
+        """Schedule (or replace) a timer firing at the deadline, a Unix timestamp"""
+        self.cancel(timer_id, save=False)
+        self.timers[timer_id] = {'deadline': int(deadline), 'kind': kind, 'payload': payload or {}}
+        self._insert(timer_id)
+        self.save_data()
+
+    def cancel(self, timer_id, save=True):
+        """Cancel a timer"""
+        if timer_id not in self.timers:
+            return False
+        del self.timers[timer_id]
+        for level in self.slots:
+            for slot in level:
+                slot.discard(timer_id)
+        if save:
+            self.save_data()
+        return True
+
+    def start(self):
+        """Start ticking on the running loop"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Advance the wheel one second at a time, catching up if the loop fell behind"""
+        while True:
+            await asyncio.sleep(max(0.0, self.current + 1 - time.time()))
+            while self.current < int(time.time()):
+                self.current += 1
+                self._tick(self.current)
+
+    def _tick(self, now):
+        """Cascade the higher levels due at this second, then fire the expired timers"""
+        for level in range(len(WHEEL_LEVELS) - 1, 0, -1):
+            width, count = WHEEL_LEVELS[level]
+            if now % width == 0:
+                slot = self.slots[level][(now // width) % count]
+                cascading = list(slot)
+                slot.clear()
+                for timer_id in cascading:
+                    # Lower levels are processed right after, a timer due now still fires this tick
+                    self._insert(timer_id, earliest=now)
+
+        slot = self.slots[0][now % WHEEL_LEVELS[0][1]]
+        due = [timer_id for timer_id in slot if self.timers[timer_id]['deadline'] <= now]
+        slot.difference_update(due)
+        if not due:
+            return
+
+        for timer_id in due:
+            timer = self.timers.pop(timer_id)
+            self.fired_count += 1
+            handler = self.handlers.get(timer['kind'])
+            if handler:
+                task = asyncio.create_task(self._fire(handler, timer_id, timer['payload']))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+            else:
+                print(f"No handler for timer {timer_id} ({timer['kind']})")
+        self.save_data()
+
+    async def _fire(self, handler, timer_id, payload):
+        try:
+            await handler(timer_id, payload)
+        except Exception as e:
+            print(f"Error firing timer {timer_id}: {e}")
+
+    def get_stats(self):
+        """Get timer wheel statistics"""
+        return {
+            'timers': len(self.timers),
+            'fired': self.fired_count,
+            'next_deadline': min((timer['deadline'] for timer in self.timers.values()), default=None)
+        }
+
+
+# Global instance holding every long-lived deadline
+timer_wheel = TimerWheel()
+
+metrics.gauge('timer_wheel_timers', "Pending long-lived deadlines").set_function(lambda: len(timer_wheel.timers))
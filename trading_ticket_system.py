@@ -3,13 +3,49 @@ from discord.ext import commands
 from discord import app_commands
 import json
 import asyncio
+import time
 from datetime import datetime
+from polling_scheduler import polling_scheduler
+from timer_wheel import timer_wheel
+from metrics import metrics, record_json_write
+from message_edit_queue import message_edit_queue
+from selling_list_cache import GroupedSellingList, SellingListRenderCache
+from pricing_engine import PricingEngine
+from services import get_registry
+from item_index import split_api_name, parse_value
+from catalog_diff import catalog_events
+
+# GamePass watch polling: fast after a change, slowing down while nothing happens
+GAMEPASS_POLL_FAST = 3
+GAMEPASS_POLL_CEILING = 60
+GAMEPASS_POLL_DECAY = 1.5
+
+# Tickets restored at the same time after a restart
+RESTORE_CONCURRENCY = 8
+
+# Control message roles stored under older state keys
+LEGACY_MESSAGE_ID_KEYS = {'control': 'control_message_id', 'waiting_period': 'waiting_message_id'}
+
+# Message holding the view of a ticket step, 'control' for every other step
+STEP_MESSAGE_ROLES = {'waiting_period': 'waiting_period'}
+
+# Recent messages searched when a control message ID is missing
+CONTROL_MESSAGE_SCAN_LIMIT = 20
+
+restore_duration = metrics.gauge('ticket_restore_seconds', "Duration of the last ticket view restore")
+restore_results = metrics.counter('ticket_restores_total', "Ticket view restores by result", ('result',))
+control_message_scans = metrics.counter('control_message_scans_total', "History scans for a control message without a usable ID", ('role', 'result'))
 
 class TradingTicketSystem:
     def __init__(self, bot):
         self.bot = bot
         self.data_file = 'trading_ticket_data.json'
-        self.monitoring_tasks = {}  # Store monitoring tasks
+        self.gamepass_watches = {}  # channel_id -> GamePass watch state
+        self.finished_watch_stats = {'watches': 0, 'checks': 0, 'detections': 0, 'detection_latency': 0.0}
+        self.selling_groups = {}  # channel_id -> GroupedSellingList of the ticket items
+        self.refresh_tasks = set()  # Selling list refreshes after a catalog update
+        self.selling_render_cache = SellingListRenderCache()
+        self.pricing = PricingEngine()
         self.channel_types = {
             'default': '𝐓𝐢𝐜𝐤𝐞𝐭',
             'selling': '𝐒𝐞𝐥𝐥',
@@ -38,6 +74,8 @@ class TradingTicketSystem:
             ".": ".",
             "_": "_"
         }
+        self.services = get_registry(bot)
+        self.services.register('trading_ticket_system', self)
         self.load_data()
 
     def load_data(self):
@@ -59,11 +97,16 @@ class TradingTicketSystem:
             self.data["ticket_states"] = {}
             self.save_data()
 
+        for channel_key in self.data["ticket_states"]:
+            self.services.index_ticket(channel_key, self)
+
     def save_data(self):
         """Save trading ticket data to JSON file"""
         try:
+            text = json.dumps(self.data, indent=2, ensure_ascii=False)
             with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+                f.write(text)
+            record_json_write(self.data_file, text)
         except Exception as e:
             print(f"Error saving trading ticket data: {e}")
 
@@ -115,7 +158,122 @@ class TradingTicketSystem:
             embed.set_thumbnail(url=self.bot.user.avatar.url)
         return embed
 
-    async def create_selling_list_embed(self, user, items_list):
+    def get_selling_groups(self, channel_id, items_list):
+        """Grouped items of a ticket, rebuilt only if they no longer describe items_list"""
+        grouped = self.selling_groups.get(channel_id) if channel_id is not None else None
+        if grouped is None or not grouped.matches(items_list):
+            grouped = GroupedSellingList(items_list)
+            if channel_id is not None:
+                self.selling_groups[channel_id] = grouped
+        return grouped
+
+    def get_quote(self, items_list, channel_id=None):
+        """Price an items list once, the quote stays cached on the ticket until its items change"""
+        return self.pricing.quote(self.get_selling_groups(channel_id, items_list))
+
+    def apply_catalog_diff(self, diff):
+        """Reprice the items of lists still being edited, lists past the selling step keep their agreed prices"""
+        new_items = {}
+        updates = list(diff.added.items()) + [(api_name, new) for api_name, (_, new) in diff.changed.items()]
+        for api_name, item_data in updates:
+            name, item_type = split_api_name(api_name)
+            # Hyperchrome rows don't keep their year, an update can't tell which one they are
+            if item_type and item_type != 'HyperChrome':
+                new_items[(name, item_type)] = item_data
+        if not new_items:
+            return 0
+
+        repriced = []
+        for channel_key, state in self.data['ticket_states'].items():
+            if state.get('current_step') != 'selling':
+                continue
+            changed = False
+            kept_items = []
+            for item in state.get('items_list') or []:
+                item_data = new_items.get((item.get('name'), item.get('type')))
+                if item_data is None:
+                    kept_items.append(item)
+                    continue
+                # Same floor as validate_item_requirements, items that fell below it can't be sold anymore
+                if parse_value(item_data.get('Cash Value')) < 2500000:
+                    print(f"Catalog update dropped {item.get('name')} ({item.get('type')}) below 2.5M from ticket {channel_key}")
+                    changed = True
+                    continue
+                value = parse_value(item_data.get('Cash Value' if item.get('status') == 'Clean' else 'Duped Value'))
+                if value and value != item.get('value'):
+                    item['value'] = value
+                    changed = True
+                kept_items.append(item)
+            if changed:
+                state['items_list'] = kept_items
+                # Groups and quote of the ticket are rebuilt on the next render
+                self.selling_groups.pop(int(channel_key), None)
+                repriced.append(int(channel_key))
+
+        if repriced:
+            self.save_data()
+            print(f"Catalog update repriced {len(repriced)} open selling list(s)")
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop (offline run), the lists are rendered again when their views are restored
+                loop = None
+            if loop:
+                for channel_id in repriced:
+                    task = loop.create_task(self.refresh_selling_list(channel_id))
+                    self.refresh_tasks.add(task)
+                    task.add_done_callback(self.refresh_tasks.discard)
+        return len(repriced)
+
+    async def refresh_selling_list(self, channel_id):
+        """Show the repriced list on the ticket's selling form"""
+        try:
+            channel = self.bot.get_channel(channel_id)
+            state = self.get_ticket_state(channel_id)
+            if channel is None or not state or state.get('current_step') != 'selling':
+                return
+            result = await self.restore_ticket_view(channel, state.get('user_id'))
+            if result:
+                embed, view = result
+                await self.edit_control_message(channel, 'control', embed=embed, view=view)
+        except discord.NotFound:
+            pass
+        except Exception as e:
+            print(f"Error refreshing selling list of {channel_id}: {e}")
+
+    def _format_quote_columns(self, quote):
+        """Item and price lines of a quote for the staff embeds, long names wrapped"""
+        items_text = []
+        prices_text = []
+
+        for item_name, quantity, robux_price in quote.lines:
+            # Format item name with quantity prefix
+            if quantity == 1:
+                full_item_text = f"• 1x {item_name}"
+            else:
+                full_item_text = f"• {quantity}x {item_name}"
+
+            # Limit to maximum 43 characters per line, breaking at 35 characters
+            if len(full_item_text) > 35:
+                # Find a good breaking point
+                break_point = 35
+                for i in range(35, min(43, len(full_item_text))):
+                    if full_item_text[i] in [' ', '(', ')', '-']:
+                        break_point = i
+                        break
+
+                line1 = full_item_text[:break_point]
+                line2 = full_item_text[break_point:break_point+43].strip()
+                formatted_item = f"{line1}\n{line2}" if line2 else line1
+            else:
+                formatted_item = full_item_text
+
+            items_text.append(formatted_item)
+            prices_text.append(f"{robux_price:,} <:RobuxLOGO:1410727587134701639>")
+
+        return items_text, prices_text
+
+    async def create_selling_list_embed(self, user, items_list, channel_id=None):
         """Create the selling list embed with items"""
         embed = discord.Embed(
             title="<:SellingLOGO:1410730163607437344> Selling Ticket",
@@ -125,66 +283,26 @@ class TradingTicketSystem:
         if not items_list:
             embed.description = "Please select which items you wish to sell."
         else:
-            # Group items by name and type, keeping status for calculations
-            grouped_items = {}
-            total_value = 0
-
-            for item in items_list:
-                # Format item name - don't show (HyperChrome) for hyperchromes, always show status
-                if item['type'] == 'HyperChrome':
-                    key = f"{item['name']} ({item['status']})"
-                else:
-                    key = f"{item['name']} ({item['type']}) ({item['status']})"
-
-                if key not in grouped_items:
-                    grouped_items[key] = {'quantity': 0, 'total_value': 0}
-
-                grouped_items[key]['quantity'] += item['quantity']
-                grouped_items[key]['total_value'] += item['value'] * item['quantity']
-                total_value += item['value'] * item['quantity']
-
-            # Calculate Robux rate based on total value in millions
-            total_millions = total_value / 1_000_000
-            robux_rate = self.calculate_robux_rate(total_millions)
-
-            # Create column headers
-            items_column = []
-            quantities_column = []
-            prices_column = []
-
-            # Add each item to the columns
-            for item_name, data in grouped_items.items():
-                quantity = data['quantity']
-                value_millions = data['total_value'] / 1_000_000
-                robux_price = int(value_millions * robux_rate)
-
-                items_column.append(item_name)
-                quantities_column.append(str(quantity))
-                prices_column.append(f"{robux_price:,} <:RobuxLOGO:1410727587134701639>")
-
-            # Add total row
-            total_robux = int(total_millions * robux_rate)
-
-            items_column.append("**TOTAL**")
-            quantities_column.append("---")
-            prices_column.append(f"**{total_robux:,} <:RobuxLOGO:1410727587134701639> (Incl. Tax)**")
+            # Groups are kept per ticket and updated one item at a time, the columns come from the render cache
+            quote = self.get_quote(items_list, channel_id)
+            items_column, quantities_column, prices_column = self.selling_render_cache.columns(quote)
 
             # Create the three fields as columns
             embed.add_field(
                 name="<:ItemLOGO:1410730965277474977> Item",
-                value="\n".join(items_column),
+                value=items_column,
                 inline=True
             )
 
             embed.add_field(
                 name="<:QuantityLOGO:1410730638851444756> Quantity",
-                value="\n".join(quantities_column),
+                value=quantities_column,
                 inline=True
             )
 
             embed.add_field(
                 name="<:RobuxLOGO:1410727587134701639> Price",
-                value="\n".join(prices_column),
+                value=prices_column,
                 inline=True
             )
 
@@ -193,45 +311,20 @@ class TradingTicketSystem:
             embed.set_thumbnail(url=self.bot.user.avatar.url)
         return embed
 
-    async def create_payment_method_embed(self, user, items_list):
+    async def create_payment_method_embed(self, user, items_list, channel_id=None):
         """Create the payment method selection embed"""
         embed = discord.Embed(
             title="<:SellingLOGO:1410730163607437344> Selling Ticket",
             color=0x00D61C
         )
 
-        # Calculate total value and robux
-        total_value = sum(item['value'] * item['quantity'] for item in items_list)
-        total_millions = total_value / 1_000_000
-        robux_rate = self.calculate_robux_rate(total_millions)
-        total_robux = int(total_millions * robux_rate)
-
-        # Calculate tax (30%)
-        total_with_tax = int(total_robux * 0.70)
+        quote = self.get_quote(items_list, channel_id)
+        total_robux = quote.total_robux
 
         # Create description with items summary
         description_lines = ["You wish to sell all these items:\n"]
 
-        # Group items for display
-        grouped_items = {}
-        for item in items_list:
-            # Format item name - don't show (HyperChrome) for hyperchromes, always show status
-            if item['type'] == 'HyperChrome':
-                key = f"{item['name']} ({item['status']})"
-            else:
-                key = f"{item['name']} ({item['type']}) ({item['status']})"
-
-            if key not in grouped_items:
-                grouped_items[key] = {'quantity': 0, 'total_value': 0}
-
-            grouped_items[key]['quantity'] += item['quantity']
-            grouped_items[key]['total_value'] += item['value'] * item['quantity']
-
-        for item_name, data in grouped_items.items():
-            quantity = data['quantity']
-            value_millions = data['total_value'] / 1_000_000
-            robux_price = int(value_millions * robux_rate)
-
+        for item_name, quantity, robux_price in quote.lines:
             if quantity == 1:
                 description_lines.append(f"• 1x {item_name} {robux_price:,} <:RobuxLOGO:1410727587134701639>")
             else:
@@ -313,7 +406,7 @@ class TradingTicketSystem:
         return embed
 
     async def create_waiting_period_embed(self, roblox_username, end_timestamp):
-        """Create embed for 2-week waiting period with persistent countdown"""
+        """Create embed for 2-week waiting period, the countdown is a Discord relative timestamp"""
         import time
 
         current_time = int(time.time())
@@ -327,13 +420,8 @@ class TradingTicketSystem:
                 color=0x00ff00
             )
         else:
-            # Calculate days, hours, minutes, seconds
-            days = time_remaining // 86400
-            hours = (time_remaining % 86400) // 3600
-            minutes = (time_remaining % 3600) // 60
-            seconds = time_remaining % 60
-
-            time_text = f"{days} days, {hours} hours, {minutes} minutes, {seconds} seconds"
+            # Discord renders relative timestamps live, the message never needs editing
+            time_text = f"<t:{end_timestamp}:R> (<t:{end_timestamp}:F>)"
 
             embed = discord.Embed(
                 title="<:GroupLOGO:1411125220873474179> Welcome to our Group!",
@@ -383,7 +471,7 @@ class TradingTicketSystem:
             embed.set_thumbnail(url=self.bot.user.avatar.url)
         return embed
 
-    async def create_group_transaction_embed(self, user, items_list, total_robux, roblox_username=None, user_id=None):
+    async def create_group_transaction_embed(self, user, items_list, total_robux, roblox_username=None, user_id=None, channel_id=None):
         """Create transaction embed for users already in group"""
         description_parts = [
             "Your request has been received, please wait for our teams to be available."
@@ -401,58 +489,8 @@ class TradingTicketSystem:
             color=0x37C700
         )
 
-        # Create items list for display
-        items_text = []
-        prices_text = []
-
-        # Group items for display
-        grouped_items = {}
-        for item in items_list:
-            # Format item name - don't show (HyperChrome) for hyperchromes, always show status
-            if item['type'] == 'HyperChrome':
-                key = f"{item['name']} ({item['status']})"
-            else:
-                key = f"{item['name']} ({item['type']}) ({item['status']})"
-
-            if key not in grouped_items:
-                grouped_items[key] = {'quantity': 0, 'robux_price': 0}
-
-            # Calculate individual robux price for this item
-            total_value = sum(i['value'] * i['quantity'] for i in items_list)
-            total_millions = total_value / 1_000_000
-            robux_rate = self.calculate_robux_rate(total_millions)
-            item_robux = int((item['value'] * item['quantity'] / 1_000_000) * robux_rate)
-
-            grouped_items[key]['quantity'] += item['quantity']
-            grouped_items[key]['robux_price'] += item_robux
-
-        for item_name, data in grouped_items.items():
-            quantity = data['quantity']
-            robux_price = data['robux_price']
-
-            # Format item name with quantity prefix
-            if quantity == 1:
-                full_item_text = f"• 1x {item_name}"
-            else:
-                full_item_text = f"• {quantity}x {item_name}"
-
-            # Limit to maximum 43 characters per line, breaking at 35 characters
-            if len(full_item_text) > 35:
-                # Find a good breaking point
-                break_point = 35
-                for i in range(35, min(43, len(full_item_text))):
-                    if full_item_text[i] in [' ', '(', ')', '-']:
-                        break_point = i
-                        break
-
-                line1 = full_item_text[:break_point]
-                line2 = full_item_text[break_point:break_point+43].strip()
-                formatted_item = f"{line1}\n{line2}" if line2 else line1
-            else:
-                formatted_item = full_item_text
-
-            items_text.append(formatted_item)
-            prices_text.append(f"{robux_price:,} <:RobuxLOGO:1410727587134701639>")
+        # Item lines come from the ticket quote
+        items_text, prices_text = self._format_quote_columns(self.get_quote(items_list, channel_id))
 
         # Add TOTAL
         items_text.append("**TOTAL**")
@@ -476,68 +514,17 @@ class TradingTicketSystem:
 
         return embed
 
-    async def create_sell_info_embed(self, items_list):
+    async def create_sell_info_embed(self, items_list, channel_id=None):
         """Create selling information embed"""
         embed = discord.Embed(
             title="Selling List",
             color=0x0099ff
         )
 
-        # Group items for display
-        grouped_items = {}
-        total_robux = 0
-
-        for item in items_list:
-            # Format item name - don't show (HyperChrome) for hyperchromes, always show status
-            if item['type'] == 'HyperChrome':
-                key = f"{item['name']} ({item['status']})"
-            else:
-                key = f"{item['name']} ({item['type']}) ({item['status']})"
-
-            if key not in grouped_items:
-                grouped_items[key] = {'quantity': 0, 'robux_price': 0}
-
-            # Calculate individual robux price for this item
-            total_value = sum(i['value'] * i['quantity'] for i in items_list)
-            total_millions = total_value / 1_000_000
-            robux_rate = self.calculate_robux_rate(total_millions)
-            item_robux = int((item['value'] * item['quantity'] / 1_000_000) * robux_rate)
-
-            grouped_items[key]['quantity'] += item['quantity']
-            grouped_items[key]['robux_price'] += item_robux
-            total_robux += item_robux
-
-        # Create items list for display
-        items_text = []
-        prices_text = []
-
-        for item_name, data in grouped_items.items():
-            quantity = data['quantity']
-            robux_price = data['robux_price']
-
-            # Format item name with quantity prefix
-            if quantity == 1:
-                full_item_text = f"• 1x {item_name}"
-            else:
-                full_item_text = f"• {quantity}x {item_name}"
-
-            # Limit to maximum 43 characters per line, breaking at 35 characters
-            if len(full_item_text) > 35:
-                # Find a good breaking point
-                break_point = 35
-                for i in range(35, min(43, len(full_item_text))):
-                    if full_item_text[i] in [' ', '(', ')', '-']:
-                        break_point = i
-                        break
-
-                line1 = full_item_text[:break_point]
-                line2 = full_item_text[break_point:break_point+43].strip()
-                formatted_item = f"{line1}\n{line2}" if line2 else line1
-            else:
-                formatted_item = full_item_text
-
-            items_text.append(formatted_item)
-            prices_text.append(f"{robux_price:,} <:RobuxLOGO:1410727587134701639>")
+        # Item lines and total come from the ticket quote
+        quote = self.get_quote(items_list, channel_id)
+        total_robux = quote.total_robux
+        items_text, prices_text = self._format_quote_columns(quote)
 
         # Add TOTAL
         items_text.append("**TOTAL**")
@@ -575,7 +562,7 @@ class TradingTicketSystem:
             embed.set_thumbnail(url=self.bot.user.avatar.url)
         return embed
 
-    async def create_transaction_pending_embed(self, seller_user, seller_username, gamepass_id, items_list, total_robux_pretax):
+    async def create_transaction_pending_embed(self, seller_user, seller_username, gamepass_id, items_list, total_robux_pretax, channel_id=None):
         """Create transaction pending embed for support team"""
         embed = discord.Embed(
             title="Transaction Pending",
@@ -583,58 +570,8 @@ class TradingTicketSystem:
             color=0xffaa00
         )
 
-        # Group items for display
-        grouped_items = {}
-        for item in items_list:
-            # Format item name - don't show (HyperChrome) for hyperchromes, always show status
-            if item['type'] == 'HyperChrome':
-                key = f"{item['name']} ({item['status']})"
-            else:
-                key = f"{item['name']} ({item['type']}) ({item['status']})"
-
-            if key not in grouped_items:
-                grouped_items[key] = {'quantity': 0, 'robux_price': 0}
-
-            # Calculate individual robux price for this item
-            total_value = sum(i['value'] * i['quantity'] for i in items_list)
-            total_millions = total_value / 1_000_000
-            robux_rate = self.calculate_robux_rate(total_millions)
-            item_robux = int((item['value'] * item['quantity'] / 1_000_000) * robux_rate)
-
-            grouped_items[key]['quantity'] += item['quantity']
-            grouped_items[key]['robux_price'] += item_robux
-
-        # Create items list for embed
-        items_text = []
-        prices_text = []
-
-        for item_name, data in grouped_items.items():
-            quantity = data['quantity']
-            robux_price = data['robux_price']
-
-            # Format item name with quantity prefix
-            if quantity == 1:
-                full_item_text = f"• 1x {item_name}"
-            else:
-                full_item_text = f"• {quantity}x {item_name}"
-
-            # Limit to maximum 43 characters per line, breaking at 35 characters
-            if len(full_item_text) > 35:
-                # Find a good breaking point
-                break_point = 35
-                for i in range(35, min(43, len(full_item_text))):
-                    if full_item_text[i] in [' ', '(', ')', '-']:
-                        break_point = i
-                        break
-
-                line1 = full_item_text[:break_point]
-                line2 = full_item_text[break_point:break_point+43].strip()
-                formatted_item = f"{line1}\n{line2}" if line2 else line1
-            else:
-                formatted_item = full_item_text
-
-            items_text.append(formatted_item)
-            prices_text.append(f"{robux_price:,} <:RobuxLOGO:1410727587134701639>")
+        # Item lines come from the ticket quote
+        items_text, prices_text = self._format_quote_columns(self.get_quote(items_list, channel_id))
 
         embed.add_field(
             name="Items",
@@ -658,7 +595,7 @@ class TradingTicketSystem:
         try:
             from roblox_sync import RobloxClient
             client = RobloxClient()
-            user_id = client.get_user_id_by_username(seller_username)
+            user_id = await client.get_user_id_by_username(seller_username)
             if user_id:
                 username_link = f"[**{seller_username}**](https://www.roblox.com/users/{user_id}/profile)"
             else:
@@ -710,13 +647,18 @@ class TradingTicketSystem:
 
     def parse_item_with_hyperchrome(self, item_input):
         """Parse item input to detect hyperchromes and types like /add_stock"""
-        try:
-            with open('item_request.json', 'r', encoding='utf-8') as f:
-                item_data = json.load(f)
-            with open('API_JBChangeLogs.json', 'r', encoding='utf-8') as f:
-                api_data = json.load(f)
-        except FileNotFoundError:
-            return {'name': item_input, 'type': 'None', 'is_hyperchrome': False}
+        # The running stockage system keeps the catalog up to date, no need to read the files again
+        stockage_system = self.services.get('stockage_system')
+        if stockage_system is not None:
+            item_data, api_data = stockage_system.item_request_data, stockage_system.api_data
+        else:
+            try:
+                with open('item_request.json', 'r', encoding='utf-8') as f:
+                    item_data = json.load(f)
+                with open('API_JBChangeLogs.json', 'r', encoding='utf-8') as f:
+                    api_data = json.load(f)
+            except FileNotFoundError:
+                return {'name': item_input, 'type': 'None', 'is_hyperchrome': False}
 
         # Check for hyperchrome patterns first
         hyper_data = item_data.get('hyper', {})
@@ -878,12 +820,19 @@ class TradingTicketSystem:
 
         return True, None
 
+    def get_stockage_system(self):
+        """Running stockage system, a fresh one if the bot didn't start it"""
+        stockage_system = self.services.get('stockage_system')
+        if stockage_system is None:
+            from stockage_system import StockageSystem
+            stockage_system = StockageSystem()
+        return stockage_system
+
     def find_best_item_match(self, item_input):
         """Find the best matching item using stockage system"""
         parsed_item = self.parse_item_with_hyperchrome(item_input)
 
-        from stockage_system import StockageSystem
-        stockage_system = StockageSystem()
+        stockage_system = self.get_stockage_system()
 
         # Find the item with specific type preference
         item_type = parsed_item.get('type', 'None')
@@ -947,12 +896,8 @@ class TradingTicketSystem:
 
     def calculate_robux_rate(self, total_millions):
         """Calculate Robux rate based on total value in millions"""
-        if total_millions < 150:
-            return 80  # 80 robux per million
-        elif total_millions < 300:
-            return 85  # 85 robux per million
-        else:
-            return 90  # 90 robux per million
+        # Tiers come from ROBUX_RATE_TIERS (default: 80 under 150M, 85 under 300M, 90 above)
+        return self.pricing.rate_for(total_millions)
 
     def convert_to_special_font(self, text):
         """Convert text to special Unicode font"""
@@ -976,6 +921,7 @@ class TradingTicketSystem:
         """Save ticket state for persistence"""
         channel_key = str(channel_id)
         if channel_key not in self.data['ticket_states']:
+            self.services.index_ticket(channel_id, self)
             self.data['ticket_states'][channel_key] = {
                 'user_id': user_id,
                 'channel_type': 'default',
@@ -1033,30 +979,118 @@ class TradingTicketSystem:
             print(f"Error fetching user {user_id}: {e}")
             return None
 
-    def remove_ticket_state(self, channel_id):
+    def remove_ticket_state(self, channel_id, save=True):
         """Remove ticket state when ticket is closed"""
+        # Stop any GamePass / group watch still polling for this ticket
+        polling_scheduler.cancel_ticket(channel_id)
+        timer_wheel.cancel(f"waiting_period_{channel_id}")
+        self.selling_groups.pop(channel_id, None)
+        self._finish_gamepass_watch(channel_id)
+        from roblox_OnJoinGroup import group_monitor
+        if group_monitor:
+            group_monitor.cancel_ticket(channel_id)
+
+        self.services.unindex_ticket(channel_id)
         channel_key = str(channel_id)
         if channel_key in self.data['ticket_states']:
             del self.data['ticket_states'][channel_key]
+            if save:
+                self.save_data()
+
+    def get_control_message_id(self, channel_id, role):
+        """Saved ID of a bot-owned control message of a ticket ('control', 'settings', 'waiting_period')"""
+        state = self.get_ticket_state(channel_id)
+        if not state:
+            return None
+        message_id = state.get('message_ids', {}).get(role)
+        if message_id is None:
+            # Tickets saved before message_ids existed
+            message_id = state.get(LEGACY_MESSAGE_ID_KEYS.get(role, ''))
+        return message_id
+
+    def set_control_message_id(self, channel_id, role, message_id, save=True):
+        """Remember the ID of a control message of a ticket"""
+        state = self.get_ticket_state(channel_id)
+        if state is None:
+            return
+        message_ids = state.setdefault('message_ids', {})
+        if message_id is None:
+            message_ids.pop(role, None)
+            state.pop(LEGACY_MESSAGE_ID_KEYS.get(role, ''), None)
+        else:
+            message_ids[role] = message_id
+        if save:
             self.save_data()
 
+    def _is_control_message(self, message, role):
+        """History scan fallback: whether a bot message plays this role"""
+        if message.author != self.bot.user or not message.embeds:
+            return False
+        title = message.embeds[0].title or ""
+        if role == 'settings':
+            return "Ticket Setting" in title
+        if role == 'waiting_period':
+            return "Welcome to our Group" in title or "Transaction Ready" in title
+        # The control message is the last bot embed that isn't the settings one
+        return "Ticket Setting" not in title
+
+    async def _scan_control_message(self, channel, role, save=True):
+        """Find a control message in the recent history, only used when its ID is missing or stale"""
+        async for message in channel.history(limit=CONTROL_MESSAGE_SCAN_LIMIT):
+            if self._is_control_message(message, role):
+                control_message_scans.inc(role=role, result='found')
+                self.set_control_message_id(channel.id, role, message.id, save=save)
+                return message
+        control_message_scans.inc(role=role, result='missing')
+        return None
+
+    async def fetch_control_message(self, channel, role):
+        """Fetch a control message of a ticket by role"""
+        message_id = self.get_control_message_id(channel.id, role)
+        if message_id:
+            try:
+                return await channel.fetch_message(message_id)
+            except discord.NotFound:
+                self.set_control_message_id(channel.id, role, None, save=False)
+        return await self._scan_control_message(channel, role)
+
+    async def edit_control_message(self, channel, role, save=True, **kwargs):
+        """Edit a control message of a ticket by role, one API call when its ID is known"""
+        message_id = self.get_control_message_id(channel.id, role)
+        if message_id:
+            try:
+                # A partial message edits without fetching the message first
+                return await message_edit_queue.edit(channel.get_partial_message(message_id), **kwargs)
+            except discord.NotFound:
+                self.set_control_message_id(channel.id, role, None, save=False)
+
+        message = await self._scan_control_message(channel, role, save=save)
+        if not message:
+            return None
+        return await message_edit_queue.edit(message, **kwargs)
+
+    async def disable_control_message(self, channel, role):
+        """Disable every button of a control message of a ticket"""
+        if role == 'settings':
+            # Persistent view, rebuilt without fetching the message
+            from selling_ticket_system import TicketSettingsView
+            view = TicketSettingsView(self, 0)  # dummy user_id
+            view.disable_buttons()
+            return await self.edit_control_message(channel, role, view=view)
+
+        message = await self.fetch_control_message(channel, role)
+        if not message:
+            return None
+        view = discord.ui.View.from_message(message, timeout=None)
+        for item in view.children:
+            if hasattr(item, 'disabled'):
+                item.disabled = True
+        return await message_edit_queue.edit(message, view=view)
+
     async def disable_ticket_settings_buttons(self, channel):
         """Disable ticket settings buttons when staff intervention is required"""
         try:
-            # Find the settings embed message in the channel
-            async for message in channel.history(limit=20):
-                if (message.author == self.bot.user and 
-                    message.embeds and 
-                    "Ticket Setting" in message.embeds[0].title):
-                    
-                    # Create disabled view
-                    from selling_ticket_system import TicketSettingsView
-                    disabled_view = TicketSettingsView(self, 0)  # dummy user_id
-                    disabled_view.disable_buttons()
-                    
-                    # Update the message with disabled buttons
-                    await message.edit(view=disabled_view)
-                    break
+            await self.disable_control_message(channel, 'settings')
         except Exception as e:
             print(f"Error disabling ticket settings buttons: {e}")
 
@@ -1094,12 +1128,12 @@ class TradingTicketSystem:
             view = SellingFormView(self, user_id, items_list)
             view.items_list = items_list  # Explicitly set the items_list
             view.update_buttons()
-            embed = await self.create_selling_list_embed(user, items_list)
+            embed = await self.create_selling_list_embed(user, items_list, channel.id)
             return embed, view
 
         elif current_step == 'payment_method':
             from selling_ticket_system import PaymentMethodView
-            embed = await self.create_payment_method_embed(user, items_list)
+            embed = await self.create_payment_method_embed(user, items_list, channel.id)
             view = PaymentMethodView(self, user_id, items_list)
             return embed, view
 
@@ -1121,11 +1155,11 @@ class TradingTicketSystem:
         elif current_step == 'gamepass_monitoring':
             monitoring_data = state.get('monitoring_data')
             if monitoring_data:
-                # Restore gamepass monitoring
+                # Restore gamepass monitoring from its saved watch state
                 await self.start_gamepass_monitoring(
                     channel, user, monitoring_data['username'],
                     monitoring_data['experience_id'], items_list,
-                    monitoring_data['expected_price']
+                    monitoring_data['expected_price'], resume=True
                 )
 
         elif current_step == 'group_monitoring':
@@ -1145,7 +1179,7 @@ class TradingTicketSystem:
             end_timestamp = state.get('end_timestamp')
             total_robux = state.get('total_robux')
             roblox_username = state.get('roblox_username')
-            user_id_roblox = state.get('user_id')
+            user_id_roblox = state.get('roblox_user_id', state.get('user_id'))
 
             if end_timestamp and total_robux and roblox_username:
                 import time
@@ -1154,18 +1188,132 @@ class TradingTicketSystem:
                 if current_time >= end_timestamp:
                     # Time has expired, show transaction ready
                     embed = await self.create_group_transaction_embed(
-                        user, items_list, total_robux, roblox_username, user_id_roblox
+                        user, items_list, total_robux, roblox_username, user_id_roblox, channel.id
                     )
                     view = GroupTransactionView(self, user, items_list, total_robux, roblox_username)
                     return embed, view
                 else:
-                    # Time still remaining, continue countdown
+                    # Time still remaining, make sure the deadline is on the timer wheel
+                    if f"waiting_period_{channel.id}" not in timer_wheel.timers:
+                        timer_wheel.schedule(f"waiting_period_{channel.id}", end_timestamp,
+                                             'waiting_period_end', {'channel_id': channel.id})
                     embed = await self.create_waiting_period_embed(roblox_username, end_timestamp)
                     view = WaitingPeriodView(self, user, items_list, total_robux, roblox_username, user_id_roblox, end_timestamp)
                     return embed, view
 
         return None
 
+    async def restore_all_ticket_views(self, concurrency=RESTORE_CONCURRENCY):
+        """Restore the views of every saved ticket through a bounded pool, returns the restore report"""
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(concurrency)
+        # Copy to avoid "dictionary changed size during iteration" errors
+        ticket_states = dict(self.data.get('ticket_states', {}))
+
+        async def restore(channel_id_str, state):
+            async with semaphore:
+                try:
+                    return channel_id_str, await self._restore_one_ticket_view(int(channel_id_str), state)
+                except Exception as e:
+                    print(f"Error restoring view for channel {channel_id_str}: {e}")
+                    return channel_id_str, 'failed'
+
+        results = await asyncio.gather(*(restore(key, state) for key, state in ticket_states.items()))
+
+        # Control message IDs found by the fallback and removed tickets are saved in one write
+        self.save_data()
+
+        report = {'tickets': len(results), 'duration': time.monotonic() - started, 'failures': []}
+        for channel_id_str, result in results:
+            restore_results.inc(result=result)
+            report[result] = report.get(result, 0) + 1
+            if result == 'failed':
+                report['failures'].append(channel_id_str)
+        restore_duration.set(report['duration'])
+
+        print(f"Restored {report.get('restored', 0)}/{report['tickets']} ticket view(s) in {report['duration']:.2f}s, "
+              f"{len(report['failures'])} failure(s), {report.get('removed', 0)} closed ticket(s) cleaned up")
+        if report['failures']:
+            print(f"Failed ticket restores: {', '.join(report['failures'])}")
+        return report
+
+    async def _restore_one_ticket_view(self, channel_id, state):
+        """Edit the controlling message of a ticket with its restored view"""
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            # Channel doesn't exist anymore, clean up state
+            self.remove_ticket_state(channel_id, save=False)
+            return 'removed'
+
+        result = await self.restore_ticket_view(channel, state.get('user_id'))
+        if not result:
+            return 'skipped'
+        embed, view = result
+
+        # IDs found by the history fallback are saved once every ticket is restored
+        role = STEP_MESSAGE_ROLES.get(state.get('current_step'), 'control')
+        try:
+            message = await self.edit_control_message(channel, role, save=False, embed=embed, view=view)
+        except discord.NotFound:
+            # Message was deleted between the scan and the edit
+            message = None
+        return 'restored' if message else 'failed'
+
+    def start_waiting_period(self, channel, user, message, items_list, total_robux, roblox_username, roblox_user_id, join_timestamp, end_timestamp):
+        """Save the waiting period once and put its deadline on the timer wheel"""
+        if message:
+            self.set_control_message_id(channel.id, 'waiting_period', message.id, save=False)
+        self.save_ticket_state(channel.id, user.id, {
+            'current_step': 'waiting_period',
+            'items_list': items_list,
+            'end_timestamp': end_timestamp,
+            'total_robux': total_robux,
+            'roblox_username': roblox_username,
+            'roblox_user_id': roblox_user_id,
+            'group_join_timestamp': join_timestamp,
+            'group_cooldown_end': end_timestamp
+        })
+        timer_wheel.schedule(f"waiting_period_{channel.id}", end_timestamp,
+                             'waiting_period_end', {'channel_id': channel.id})
+
+    async def _on_waiting_period_end(self, timer_id, payload):
+        """Timer wheel handler: turn the waiting period message into the group transaction"""
+        channel = self.bot.get_channel(payload['channel_id'])
+        state = self.get_ticket_state(payload['channel_id'])
+        if not state or state.get('current_step') != 'waiting_period':
+            return
+        if not channel:
+            try:
+                channel = await self.bot.fetch_channel(payload['channel_id'])
+            except discord.NotFound:
+                return
+            except Exception as e:
+                # Channel not reachable yet, try again shortly instead of losing the support ping
+                print(f"Error resolving waiting period channel {payload['channel_id']}: {e}")
+                timer_wheel.schedule(timer_id, time.time() + 60, 'waiting_period_end', payload)
+                return
+
+        user = await self.get_ticket_creator(channel.id)
+        if not user:
+            return
+
+        items_list = state.get('items_list', [])
+        total_robux = state.get('total_robux')
+        roblox_username = state.get('roblox_username')
+
+        transaction_embed = await self.create_group_transaction_embed(
+            user, items_list, total_robux, roblox_username, state.get('roblox_user_id', state.get('user_id')), channel.id
+        )
+        view = GroupTransactionView(self, user, items_list, total_robux, roblox_username)
+
+        message = await self.edit_control_message(channel, 'waiting_period', embed=transaction_embed, view=view)
+        if not message:
+            message = await channel.send(embed=transaction_embed, view=view)
+            self.set_control_message_id(channel.id, 'waiting_period', message.id)
+
+        # Ping the user and support
+        await channel.send(content=f"{user.mention} <@&1300798850788757564>")
+
     async def create_error_embed(self, title, description):
         """Create error embed for various error messages"""
         embed = discord.Embed(
@@ -1178,185 +1326,301 @@ class TradingTicketSystem:
             embed.set_thumbnail(url=self.bot.user.avatar.url)
         return embed
 
-    async def start_gamepass_monitoring(self, channel, user, username, experience_id, items_list, expected_price):
-        """Start monitoring for new GamePass creation"""
+    async def start_gamepass_monitoring(self, channel, user, username, experience_id, items_list, expected_price, resume=False):
+        """Start monitoring for new GamePass creation, or resume it from the saved watch state"""
         try:
-            from roblox_gamepasslink import GamePassLink
+            state = self.get_ticket_state(channel.id) or {}
+            saved_watch = state.get('gamepass_watch')
+            if resume and saved_watch and saved_watch.get('finished'):
+                # Transaction pending was already sent
+                return
+            if resume and saved_watch and saved_watch.get('experience_id') == experience_id:
+                # Passes created while the bot was down are still new compared to the saved baseline
+                initial_ids = saved_watch['initial_ids']
+                delay = max(0, saved_watch.get('next_due', 0) - time.time())
+            else:
+                from roblox_gamepasslink import GamePassLink
+
+                client = GamePassLink()
+
+                # Get initial GamePass list
+                initial_gamepasses = await client.get_game_passes(experience_id)
+                initial_ids = [gp.get('id') for gp in initial_gamepasses if gp.get('id')]
+                saved_watch = None
+                delay = None
+
+            watch = {
+                'channel': channel,
+                'user': user,
+                'username': username,
+                'experience_id': experience_id,
+                'items_list': items_list,
+                'expected_price': expected_price,
+                'initial_ids': initial_ids,
+                'gamepass_id': None,
+                'price_experience_id': None,
+                'last_notified_price': None,
+                'price_confirmed': False,
+                'finished': False,
+                'job_key': f"gamepass_{channel.id}_{user.id}",
+                'interval': GAMEPASS_POLL_FAST,
+                'last_check': time.monotonic(),
+                'checks': 0,
+                'detections': []  # Estimated detection latency of every change seen
+            }
+            if saved_watch:
+                # Detected pass, its experience and the last reported price need no new lookup
+                for field in ('gamepass_id', 'price_experience_id', 'last_notified_price', 'price_confirmed'):
+                    watch[field] = saved_watch.get(field, watch[field])
+                watch['interval'] = saved_watch.get('interval', GAMEPASS_POLL_FAST)
+
+            self._finish_gamepass_watch(channel.id)
+            self.gamepass_watches[channel.id] = watch
+            if not saved_watch:
+                self._save_gamepass_watch(watch, GAMEPASS_POLL_FAST)
+
+            # One scheduled job per ticket, polled fast right after the link was sent
+            polling_scheduler.add(
+                watch['job_key'],
+                lambda: self._check_gamepass_watch(watch),
+                interval=GAMEPASS_POLL_FAST,
+                delay=delay,
+                ticket=channel.id
+            )
 
-            client = GamePassLink()
+        except Exception as e:
+            print(f"Error starting GamePass monitoring: {e}")
 
-            # Get initial GamePass list
-            initial_gamepasses = client.get_game_passes(experience_id)
-            initial_ids = [gp.get('id') for gp in initial_gamepasses if gp.get('id')]
+    async def _check_gamepass_watch(self, watch):
+        """Run one check of a GamePass watch, returns True once the transaction is pending or the delay before the next check"""
+        now = time.monotonic()
+        watch['check_gap'] = now - watch['last_check']
+        watch['last_check'] = now
+        watch['checks'] += 1
 
-            # Create monitoring task
-            task_key = f"{channel.id}_{user.id}"
-            if task_key in self.monitoring_tasks:
-                self.monitoring_tasks[task_key].cancel()
+        if watch['gamepass_id'] is None:
+            result = await self._check_gamepass_creation(watch)
+        else:
+            result = await self._check_gamepass_price(watch)
+
+        if result is True:
+            self._finish_gamepass_watch(watch['channel'].id)
+            return True
+        if result:
+            return result
+
+        # Nothing to act on, slow down towards the ceiling
+        delay = watch['interval']
+        watch['interval'] = min(GAMEPASS_POLL_CEILING, watch['interval'] * GAMEPASS_POLL_DECAY)
+        return delay
+
+    def _note_gamepass_change(self, watch, next_check=GAMEPASS_POLL_FAST):
+        """Record a detected change, go back to fast polling and save the watch state"""
+        # The change happened somewhere since the previous check
+        watch['detections'].append(watch['check_gap'] / 2)
+        watch['interval'] = GAMEPASS_POLL_FAST
+        self._save_gamepass_watch(watch, next_check)
+
+    def _save_gamepass_watch(self, watch, next_check):
+        """Persist what a watch needs to resume after a restart, only called on transitions"""
+        self.save_ticket_state(watch['channel'].id, watch['user'].id, {
+            'gamepass_watch': {
+                'experience_id': watch['experience_id'],
+                'initial_ids': watch['initial_ids'],
+                'gamepass_id': watch['gamepass_id'],
+                'price_experience_id': watch['price_experience_id'],
+                'last_notified_price': watch['last_notified_price'],
+                'price_confirmed': watch['price_confirmed'],
+                'finished': watch['finished'],
+                'interval': watch['interval'],
+                'next_due': time.time() + next_check
+            }
+        })
 
-            # Start monitoring task
-            self.monitoring_tasks[task_key] = asyncio.create_task(
-                self._monitor_gamepass_creation(
-                    channel, user, username, experience_id, items_list, expected_price, initial_ids
-                )
-            )
+    def on_ticket_activity(self, channel_id, user_id):
+        """Snap the GamePass watch of a ticket back to fast polling when its seller interacts with it"""
+        watch = self.gamepass_watches.get(channel_id)
+        if not watch or watch['user'].id != user_id:
+            return
 
-        except Exception as e:
-            print(f"Error starting GamePass monitoring: {e}")
+        watch['interval'] = GAMEPASS_POLL_FAST
+        job = polling_scheduler.jobs.get(watch['job_key'])
+        if job and job.next_due - time.monotonic() > GAMEPASS_POLL_FAST:
+            polling_scheduler.reschedule(watch['job_key'], GAMEPASS_POLL_FAST)
 
-    async def _monitor_gamepass_creation(self, channel, user, username, experience_id, items_list, expected_price, initial_ids):
-        """Monitor for new GamePass creation and price changes"""
-        try:
-            from roblox_gamepasslink import GamePassLink
+    def _finish_gamepass_watch(self, channel_id):
+        """Forget a GamePass watch, keeping its cost and latency figures"""
+        watch = self.gamepass_watches.pop(channel_id, None)
+        if not watch:
+            return
 
-            client = GamePassLink()
+        stats = self.finished_watch_stats
+        stats['watches'] += 1
+        stats['checks'] += watch['checks']
+        stats['detections'] += len(watch['detections'])
+        stats['detection_latency'] += sum(watch['detections'])
+
+        average = sum(watch['detections']) / len(watch['detections']) if watch['detections'] else 0.0
+        print(f"GamePass watch {channel_id} finished: {watch['checks']} checks, "
+              f"{len(watch['detections'])} changes, average detection latency {average:.1f}s")
+
+    def get_watch_stats(self):
+        """Average detection latency against request cost, per active watch and for finished ones"""
+        active = {}
+        for channel_id, watch in self.gamepass_watches.items():
+            detections = watch['detections']
+            active[channel_id] = {
+                'checks': watch['checks'],
+                'interval': watch['interval'],
+                'detections': len(detections),
+                'average_detection_latency': sum(detections) / len(detections) if detections else None
+            }
 
-            while True:
-                await asyncio.sleep(5)  # Check every 5 seconds
+        finished = self.finished_watch_stats
+        return {
+            'active': active,
+            'finished': {
+                'watches': finished['watches'],
+                'checks_per_watch': finished['checks'] / finished['watches'] if finished['watches'] else 0.0,
+                'average_detection_latency': (finished['detection_latency'] / finished['detections']
+                                              if finished['detections'] else None)
+            }
+        }
 
-                try:
-                    current_gamepasses = client.get_game_passes(experience_id)
-                    current_ids = [gp.get('id') for gp in current_gamepasses if gp.get('id')]
+    async def _check_gamepass_creation(self, watch):
+        """Look for a new GamePass in the experience"""
+        from roblox_gamepasslink import GamePassLink
 
-                    # Check for new GamePass
-                    new_gamepasses = [gp_id for gp_id in current_ids if gp_id not in initial_ids]
+        client = GamePassLink()
+        channel = watch['channel']
+        user = watch['user']
+        experience_id = watch['experience_id']
 
-                    if new_gamepasses:
-                        # Found new GamePass, get its details
-                        new_gamepass_id = new_gamepasses[0]  # Take the first new one
+        current_gamepasses = await client.get_game_passes(experience_id)
+        current_ids = [gp.get('id') for gp in current_gamepasses if gp.get('id')]
 
-                        # Find the GamePass details
-                        new_gamepass = None
-                        for gp in current_gamepasses:
-                            if gp.get('id') == new_gamepass_id:
-                                new_gamepass = gp
-                                break
+        # Check for new GamePass
+        new_gamepasses = [gp_id for gp_id in current_ids if gp_id not in watch['initial_ids']]
+        if not new_gamepasses:
+            return False
 
-                        if new_gamepass:
-                            gamepass_name = new_gamepass.get('name', 'Unknown')
-                            gamepass_price = new_gamepass.get('price')
+        # Found new GamePass, get its details
+        new_gamepass_id = new_gamepasses[0]  # Take the first new one
 
-                            # Send creation success embed with price modification link
-                            success_embed = await self.create_gamepass_success_embed(
-                                user, gamepass_name, gamepass_price or 0, new_gamepass_id, experience_id
-                            )
-                            await channel.send(embed=success_embed)
+        # Find the GamePass details
+        new_gamepass = None
+        for gp in current_gamepasses:
+            if gp.get('id') == new_gamepass_id:
+                new_gamepass = gp
+                break
 
-                            # Start price monitoring for this GamePass immediately
-                            await self._monitor_gamepass_price(
-                                channel, user, username, new_gamepass_id, expected_price, items_list
-                            )
+        if not new_gamepass:
+            return False
 
-                            # Stop monitoring for new GamePass creation
-                            break
+        gamepass_name = new_gamepass.get('name', 'Unknown')
+        gamepass_price = new_gamepass.get('price')
 
-                except Exception as e:
-                    print(f"Error in GamePass monitoring: {e}")
-                    await asyncio.sleep(10)  # Wait longer on error
+        # Send creation success embed with price modification link
+        success_embed = await self.create_gamepass_success_embed(
+            user, gamepass_name, gamepass_price or 0, new_gamepass_id, experience_id
+        )
+        await channel.send(embed=success_embed)
 
-        except asyncio.CancelledError:
-            # Task was cancelled, clean up
-            pass
-        except Exception as e:
-            print(f"Error in GamePass creation monitoring: {e}")
+        # Get the experience to monitor the price in
+        from roblox_sync import RobloxClient
 
-    async def _monitor_gamepass_price(self, channel, user, username, gamepass_id, expected_price, items_list):
-        """Monitor GamePass price changes"""
-        try:
-            from roblox_gamepasslink import GamePassLink
-            from roblox_sync import RobloxClient
+        roblox_client = RobloxClient()
+        user_id = await roblox_client.get_user_id_by_username(watch['username'])
+        if not user_id:
+            print(f"Could not find user ID for {watch['username']}")
+            return True
+
+        # Cached per Roblox user, repeat monitors don't repaginate
+        experience = await roblox_client.get_primary_experience(user_id)
+        if not experience:
+            print(f"No experiences found for {watch['username']}")
+            return True
+
+        # Switch to price monitoring for this GamePass
+        watch['gamepass_id'] = new_gamepass_id
+        watch['price_experience_id'] = experience.get('id')
+        self._note_gamepass_change(watch)
+        return False
+
+    async def _check_gamepass_price(self, watch):
+        """Check the price of the detected GamePass"""
+        from roblox_gamepasslink import GamePassLink
+
+        channel = watch['channel']
+        user = watch['user']
+        username = watch['username']
+        gamepass_id = watch['gamepass_id']
+        expected_price = watch['expected_price']
+        items_list = watch['items_list']
+
+        if watch['price_confirmed']:
+            # Calculate total robux for transaction (pre-tax)
+            total_robux_pretax = self.get_quote(items_list, channel.id).total_robux
+
+            # Disable ticket settings buttons
+            await self.disable_ticket_settings_buttons(channel)
+
+            # Send transaction pending embed (ping outside)
+            pending_embed = await self.create_transaction_pending_embed(
+                user, username, gamepass_id, items_list, total_robux_pretax, channel.id
+            )
 
-            gamepass_client = GamePassLink()
-            roblox_client = RobloxClient()
+            # Create accept button view
+            accept_view = AcceptTransactionView(self, channel, user)
 
-            # Get the user ID and experience ID for monitoring
-            user_id = roblox_client.get_user_id_by_username(username)
-            if not user_id:
-                print(f"Could not find user ID for {username}")
-                return
+            await channel.send(
+                content="<@&1300798850788757564>",
+                embed=pending_embed,
+                view=accept_view
+            )
 
-            experiences = roblox_client.get_user_experiences(user_id)
-            if not experiences:
-                print(f"No experiences found for {username}")
-                return
+            # Stop monitoring, transaction is ready
+            watch['finished'] = True
+            self._save_gamepass_watch(watch, 0)
+            return True
 
-            experience_id = experiences[0].get('id')
+        # Get all GamePass from the experience
+        all_gamepasses = await GamePassLink().get_game_passes(watch['price_experience_id'])
 
-            last_notified_price = None  # Track the last price we sent an error for
+        # Find our specific GamePass
+        target_gamepass = None
+        for gp in all_gamepasses:
+            if gp.get('id') == gamepass_id:
+                target_gamepass = gp
+                break
 
-            while True:
-                await asyncio.sleep(5)  # Check every 5 seconds
+        if not target_gamepass:
+            print(f"GamePass {gamepass_id} not found in experience {watch['price_experience_id']}")
+            return False
 
-                try:
-                    # Get all GamePass from the experience
-                    all_gamepasses = gamepass_client.get_game_passes(experience_id)
-
-                    # Find our specific GamePass
-                    target_gamepass = None
-                    for gp in all_gamepasses:
-                        if gp.get('id') == gamepass_id:
-                            target_gamepass = gp
-                            break
-
-                    if target_gamepass:
-                        current_price = target_gamepass.get('price')
-
-                        if current_price is not None and current_price != 0:  # Price was set
-                            if current_price == expected_price:
-                                # Price is correct! Send transaction pending
-
-                                # Wait 3 seconds first
-                                await asyncio.sleep(3)
-
-                                # Calculate total robux for transaction (pre-tax)
-                                total_value = sum(item['value'] * item['quantity'] for item in items_list)
-                                total_millions = total_value / 1_000_000
-                                robux_rate = self.calculate_robux_rate(total_millions)
-                                total_robux_pretax = int(total_millions * robux_rate)
-
-                                # Disable ticket settings buttons
-                                await self.disable_ticket_settings_buttons(channel)
-
-                                # Send transaction pending embed (ping outside)
-                                pending_embed = await self.create_transaction_pending_embed(
-                                    user, username, gamepass_id, items_list, total_robux_pretax
-                                )
-
-                                # Create accept button view
-                                accept_view = AcceptTransactionView(self, channel, user)
-
-                                await channel.send(
-                                    content="<@&1300798850788757564>",
-                                    embed=pending_embed,
-                                    view=accept_view
-                                )
-
-                                # Stop monitoring, transaction is ready
-                                break
-                            else:
-                                # Price is incorrect, only send error if price changed
-                                if last_notified_price != current_price:
-                                    error_embed = await self.create_price_error_embed(
-                                        user, expected_price, current_price
-                                    )
-                                    await channel.send(
-                                        content=user.mention,
-                                        embed=error_embed
-                                    )
-                                    last_notified_price = current_price
-                                # Continue monitoring for price changes
-                    else:
-                        print(f"GamePass {gamepass_id} not found in experience {experience_id}")
+        current_price = target_gamepass.get('price')
+        if current_price is None or current_price == 0:  # Price not set yet
+            return False
 
-                except Exception as e:
-                    print(f"Error in GamePass price monitoring: {e}")
-                    await asyncio.sleep(10)  # Wait longer on error
+        if current_price == expected_price:
+            # Price is correct! Send transaction pending 3 seconds from now
+            watch['price_confirmed'] = True
+            self._note_gamepass_change(watch, 3)
+            return 3
 
-        except asyncio.CancelledError:
-            # Task was cancelled, clean up
-            pass
-        except Exception as e:
-            print(f"Error in GamePass price monitoring: {e}")
+        # Price is incorrect, only send error if price changed
+        if watch['last_notified_price'] != current_price:
+            error_embed = await self.create_price_error_embed(
+                user, expected_price, current_price
+            )
+            await channel.send(
+                content=user.mention,
+                embed=error_embed
+            )
+            watch['last_notified_price'] = current_price
+            self._note_gamepass_change(watch)
+        # Continue monitoring for price changes
+        return False
 
 class TicketPanelView(discord.ui.View):
     def __init__(self, ticket_system):
@@ -1419,19 +1683,20 @@ class TicketPanelView(discord.ui.View):
         self.ticket_system.data['active_tickets'][user_id] = ticket_channel.id
         self.ticket_system.save_data()
 
-        # Save initial ticket state with creator info
+        # Send options embed in ticket channel
+        options_embed = await self.ticket_system.create_ticket_options_embed(interaction.user)
+        view = TicketOptionsView(self.ticket_system, interaction.user.id)
+        control_message = await ticket_channel.send(embed=options_embed, view=view)
+
+        # Save initial ticket state with creator info, every later step edits the control message
         self.ticket_system.save_ticket_state(ticket_channel.id, interaction.user.id, {
             'channel_type': 'default',
             'current_step': 'options',
             'creator_username': interaction.user.name,
-            'creator_display_name': interaction.user.display_name
+            'creator_display_name': interaction.user.display_name,
+            'message_ids': {'control': control_message.id}
         })
 
-        # Send options embed in ticket channel
-        options_embed = await self.ticket_system.create_ticket_options_embed(interaction.user)
-        view = TicketOptionsView(self.ticket_system, interaction.user.id)
-        await ticket_channel.send(embed=options_embed, view=view)
-
         await interaction.followup.send(f"Your ticket has been created! {ticket_channel.mention}", ephemeral=True)
 
 class TicketOptionsView(discord.ui.View):
@@ -1489,83 +1754,6 @@ class WaitingPeriodView(discord.ui.View):
         self.roblox_username = roblox_username
         self.user_id = user_id
         self.end_timestamp = end_timestamp
-        self.countdown_task = None
-
-        # Start countdown if we have an end timestamp
-        if self.end_timestamp:
-            self.start_countdown_task()
-
-    def start_countdown_task(self):
-        """Start the countdown task that updates every second"""
-        if self.countdown_task:
-            self.countdown_task.cancel()
-        self.countdown_task = asyncio.create_task(self._countdown_loop())
-
-    async def _countdown_loop(self):
-        """Countdown loop that updates every second and saves state"""
-        import time
-
-        try:
-            while True:
-                current_time = int(time.time())
-                time_remaining = self.end_timestamp - current_time
-
-                # Save current state every second
-                if hasattr(self, '_last_channel'):
-                    self.ticket_system.save_ticket_state(self._last_channel.id, self.user.id, {
-                        'current_step': 'waiting_period',
-                        'items_list': self.items_list,
-                        'end_timestamp': self.end_timestamp,
-                        'total_robux': self.total_robux,
-                        'roblox_username': self.roblox_username,
-                        'user_id': self.user_id,
-                        'last_update': current_time
-                    })
-
-                if time_remaining <= 0:
-                    # Time is up! Convert to transaction ready
-                    if hasattr(self, '_last_message') and hasattr(self, '_last_channel'):
-                        # Create transaction ready embed
-                        transaction_embed = await self.ticket_system.create_group_transaction_embed(
-                            self.user, self.items_list, self.total_robux, self.roblox_username, self.user_id
-                        )
-
-                        # Create new view for transaction
-                        view = GroupTransactionView(
-                            self.ticket_system, self.user, self.items_list,
-                            self.total_robux, self.roblox_username
-                        )
-
-                        # Update message and ping support
-                        await self._last_message.edit(embed=transaction_embed, view=view)
-                        content = f"{self.user.mention} <@&1300798850788757564>"
-                        await self._last_channel.send(content=content)
-                    break
-
-                # Update embed with new countdown
-                if hasattr(self, '_last_message'):
-                    try:
-                        updated_embed = await self.ticket_system.create_waiting_period_embed(
-                            self.roblox_username, self.end_timestamp
-                        )
-                        await self._last_message.edit(embed=updated_embed, view=self)
-                    except discord.NotFound:
-                        # Message was deleted
-                        break
-                    except Exception as e:
-                        print(f"Error updating countdown: {e}")
-
-                await asyncio.sleep(1)  # Update every second
-
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            print(f"Error in countdown loop: {e}")
-
-    def set_message_reference(self, message, channel):
-        """Set reference to the message and channel for updates"""
-        self._last_message = message
-        self._last_channel = channel
 
     @discord.ui.button(label='Confirm', style=discord.ButtonStyle.success, emoji='<:ConfirmLOGO:1410970202191171797>', custom_id='confirm_waiting_period_persistent')
     async def confirm_waiting(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -1575,7 +1763,7 @@ class WaitingPeriodView(discord.ui.View):
 
         # Create the group transaction embed
         transaction_embed = await self.ticket_system.create_group_transaction_embed(
-            self.user, self.items_list, self.total_robux, self.roblox_username, self.user_id
+            self.user, self.items_list, self.total_robux, self.roblox_username, self.user_id, interaction.channel.id
         )
 
         view = GroupTransactionView(
@@ -1583,6 +1771,9 @@ class WaitingPeriodView(discord.ui.View):
             self.total_robux, self.roblox_username
         )
 
+        # Confirmed early, the deadline no longer needs to fire
+        timer_wheel.cancel(f"waiting_period_{interaction.channel.id}")
+
         content = f"{self.user.mention} <@&1300798850788757564>"
         await interaction.response.edit_message(embed=transaction_embed, view=view)
         await interaction.followup.send(content=content)
@@ -1718,7 +1909,7 @@ class GroupTransactionView(discord.ui.View):
             await interaction.response.send_message("No items found in this ticket!", ephemeral=True)
             return
 
-        info_embed = await self.ticket_system.create_sell_info_embed(items_list)
+        info_embed = await self.ticket_system.create_sell_info_embed(items_list, interaction.channel.id)
         await interaction.response.send_message(embed=info_embed, ephemeral=True)
 
 class RefuseReasonModal(discord.ui.Modal):
@@ -1740,22 +1931,14 @@ class RefuseReasonModal(discord.ui.Modal):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
+        # Ticket system, state and creator of this channel from the bot registry
+        context = get_registry(interaction.client).ticket_context(interaction.channel.id)
+
         # Get user from ticket state if self.user is None (persistent view issue)
         target_user = self.user
-        if target_user is None:
-            # Try to get user from ticket state
-            state = None
-            # Find ticket system instance from any view in the channel
+        if target_user is None and context:
             try:
-                # Get the ticket system from the bot (assuming it's stored there)
-                ticket_system = None
-                for view in interaction.client._connection._view_store._views.values():
-                    if hasattr(view, 'ticket_system'):
-                        ticket_system = view.ticket_system
-                        break
-
-                if ticket_system:
-                    target_user = await ticket_system.get_ticket_creator(interaction.channel.id)
+                target_user = await context.creator()
             except Exception as e:
                 print(f"Error getting user from state: {e}")
 
@@ -1790,20 +1973,14 @@ class RefuseReasonModal(discord.ui.Modal):
                 await interaction.followup.send(embed=success_embed, ephemeral=True)
             else:
                 # Get username from state for better error message
-                ticket_system = None
-                for view in interaction.client._connection._view_store._views.values():
-                    if hasattr(view, 'ticket_system'):
-                        ticket_system = view.ticket_system
-                        break
-
                 error_embed = discord.Embed(
                     title="<:ErrorLOGO:1387810170155040888> Error",
                     description="Could not find user to send DM. Transaction was refused. Channel will be deleted.",
                     color=0xff0000
                 )
 
-                if ticket_system:
-                    state = ticket_system.get_ticket_state(interaction.channel.id)
+                if context:
+                    state = context.state
                     creator_username = state.get('creator_username') if state else None
                     if creator_username:
                         error_embed.description = f"Could not find user to send DM (Username: {creator_username}). Transaction was refused. Channel will be deleted."
@@ -1948,42 +2125,38 @@ def setup_trading_ticket_system(bot):
     async def restore_persistent_views():
         await bot.wait_until_ready()
         try:
-            # Create a copy of the dictionary to avoid "dictionary changed size during iteration" error
-            ticket_states_copy = dict(ticket_system.data.get('ticket_states', {}))
-            for channel_id_str, state in ticket_states_copy.items():
-                try:
-                    channel_id = int(channel_id_str)
-                    channel = bot.get_channel(channel_id)
-                    if channel:
-                        user_id = state.get('user_id')
-                        result = await ticket_system.restore_ticket_view(channel, user_id)
-                        if result:
-                            embed, view = result
-                            # Find the last message in the channel and edit it
-                            async for message in channel.history(limit=10):
-                                if message.author == bot.user and message.embeds:
-                                    try:
-                                        await message.edit(embed=embed, view=view)
-                                        print(f"Restored view for channel {channel_id}")
-                                        break
-                                    except discord.NotFound:
-                                        # Message was deleted, skip
-                                        continue
-                                    except Exception as e:
-                                        print(f"Error editing message in channel {channel_id}: {e}")
-                                        continue
-                    else:
-                        # Channel doesn't exist anymore, clean up state
-                        ticket_system.remove_ticket_state(channel_id)
-                        print(f"Cleaned up state for non-existent channel {channel_id}")
-                except Exception as e:
-                    print(f"Error restoring view for channel {channel_id_str}: {e}")
+            await ticket_system.restore_all_ticket_views()
         except Exception as e:
             print(f"Error in restore_persistent_views: {e}")
 
     # Run the restoration in the background
     bot.loop.create_task(restore_persistent_views())
 
+    # Catalog updates reprice the lists still being edited
+    catalog_events.subscribe('trading_ticket_system', ticket_system.apply_catalog_diff)
+
+    # Long-lived deadlines (2-week group waiting periods) fire from the timer wheel
+    timer_wheel.register('waiting_period_end', ticket_system._on_waiting_period_end)
+
+    async def start_timer_wheel():
+        # Timers overdue after a restart fire on the first tick, their channels must be in the cache by then
+        await bot.wait_until_ready()
+        timer_wheel.start()
+
+    bot.loop.create_task(start_timer_wheel())
+
+    # Seller activity in a ticket brings its GamePass watch back to fast polling
+    async def on_ticket_message(message):
+        if not message.author.bot:
+            ticket_system.on_ticket_activity(message.channel.id, message.author.id)
+
+    async def on_ticket_interaction(interaction):
+        if interaction.channel_id:
+            ticket_system.on_ticket_activity(interaction.channel_id, interaction.user.id)
+
+    bot.add_listener(on_ticket_message, 'on_message')
+    bot.add_listener(on_ticket_interaction, 'on_interaction')
+
     @bot.tree.command(name="trading_ticket", description="Create a trading ticket panel")
     @app_commands.describe(channel="Channel where to send the ticket panel (optional)")
     async def trading_ticket(interaction: discord.Interaction, channel: discord.TextChannel = None):